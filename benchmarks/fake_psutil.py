@@ -0,0 +1,129 @@
+"""
+Stand-in for the parts of psutil used by the process lookups.
+
+The process table is synthetic, so the benchmarks run the same on every
+platform and the numbers do not depend on what happens to be running.
+"""
+import contextlib
+import os
+import random
+import sys
+from typing import NamedTuple
+
+TARGET_NAME = "studentmain.exe"
+# Built with the host's separator, the lookups split paths with os.path
+ROOT = os.path.abspath(os.sep)
+TARGET_PATH = os.path.join(ROOT, "Program Files", "Mythware", TARGET_NAME)
+
+COMMON_NAMES = ("svchost.exe", "RuntimeBroker.exe", "conhost.exe", "chrome.exe", "explorer.exe", "dllhost.exe")
+
+
+class FakeProcessInfo(NamedTuple):
+    name: str
+    create_time: float
+    exe: str
+    denied: bool
+
+
+class FakeProcessTable:
+    def __init__(self, size, access_denied_rate=0.0, target_count=1, seed=0):
+        """
+        :param size: number of processes
+        :param access_denied_rate: fraction of processes whose attributes raise AccessDenied
+        :param target_count: number of processes named TARGET_NAME, they are never denied
+        :param seed: seed of the table layout
+        """
+        rng = random.Random(seed)
+        pids = rng.sample(range(4, size * 8 + 4, 4), size)
+
+        self.processes = {}
+        for index, pid in enumerate(pids):
+            if index < target_count:
+                name, exe, denied = TARGET_NAME, TARGET_PATH, False
+            elif index % 3:
+                name = COMMON_NAMES[index % len(COMMON_NAMES)]
+                exe, denied = os.path.join(ROOT, "Windows", "System32", name), rng.random() < access_denied_rate
+            else:
+                name = f"app{index}.exe"
+                exe, denied = os.path.join(ROOT, "Apps", name), rng.random() < access_denied_rate
+            self.processes[pid] = FakeProcessInfo(name, 1_700_000_000.0 + index, exe, denied)
+
+        self.target_pids = tuple(pid for pid, info in self.processes.items() if info.name == TARGET_NAME)
+        self.denied_pids = tuple(pid for pid, info in self.processes.items() if info.denied)
+
+
+class Error(Exception):
+    pass
+
+
+class NoSuchProcess(Error):
+    def __init__(self, pid, name=None, msg=None):
+        super().__init__(msg or f"process no longer exists (pid={pid})")
+        self.pid = pid
+
+
+class ZombieProcess(NoSuchProcess):
+    pass
+
+
+class AccessDenied(Error):
+    def __init__(self, pid=None, name=None, msg=None):
+        super().__init__(msg or f"access denied (pid={pid})")
+        self.pid = pid
+
+
+class Process:
+    table = None
+
+    def __init__(self, pid):
+        info = self.table.processes.get(pid)
+        if info is None:
+            raise NoSuchProcess(pid)
+        self.pid = pid
+        self.info = info
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def _check(self):
+        if self.info.denied:
+            raise AccessDenied(self.pid)
+
+    def name(self):
+        # psutil can still read the name of protected processes on Windows
+        return self.info.name
+
+    def create_time(self):
+        self._check()
+        return self.info.create_time
+
+    def exe(self):
+        self._check()
+        return self.info.exe
+
+    def status(self):
+        self._check()
+        return "running"
+
+
+def pids():
+    return list(Process.table.processes)
+
+
+def pid_exists(pid):
+    return pid in Process.table.processes
+
+
+def set_table(table):
+    Process.table = table
+
+
+def install():
+    """
+    Register this module as psutil, before pjip is imported.
+
+    :return: the fake psutil module
+    """
+    module = sys.modules[__name__]
+    sys.modules["psutil"] = module
+    return module
@@ -0,0 +1,218 @@
+"""
+Benchmarks of the PJIPLogic process lookups against synthetic process tables.
+
+psutil is replaced by benchmarks.fake_psutil, so this runs anywhere:
+
+    python -m benchmarks.process_lookup                  # compare with baselines.json
+    python -m benchmarks.process_lookup --save-baseline  # record new baselines
+    python -m benchmarks.process_lookup --sizes 1000 --denied 0,0.5 --json
+
+A benchmark regresses when its ops/sec falls below the baseline by more than
+--tolerance, the exit status is then 1. Baselines are machine specific,
+record them again on the machine that runs the comparison.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks import fake_psutil
+
+fake_psutil.install()
+
+from pjip.config import build_config  # noqa: E402
+from pjip.core.backends import create_platform_backends  # noqa: E402
+from pjip.core.enums import PidStatus  # noqa: E402
+from pjip.core.logic import PJIPLogic  # noqa: E402
+from pjip.core.snapshot import ProcessSnapshotService  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_DENIED_RATES = (0.0, 0.2)
+
+
+def create_logic(max_staleness=0.4):
+    """PJIPLogic on the in-memory platform backends"""
+    logic = PJIPLogic(build_config, create_platform_backends("fake"))
+    logic.process_snapshot = ProcessSnapshotService(max_staleness)
+    return logic
+
+
+def create_cases(table):
+    """
+    :return: list of (name, callable, expected result)
+    """
+    logic = create_logic()
+    fresh_logic = create_logic(max_staleness=0)
+    target_pids = table.target_pids
+    target_pid = target_pids[0]
+    missing_pid = 3
+
+    def cold_snapshot():
+        return len(ProcessSnapshotService().refresh())
+
+    cases = [
+        ("snapshot_cold_build", cold_snapshot, len(table.processes)),
+        ("get_process_state_hit", lambda: logic.get_process_state(fake_psutil.TARGET_NAME), True),
+        ("get_process_state_miss", lambda: logic.get_process_state("missing.exe"), False),
+        ("get_process_state_refresh", lambda: fresh_logic.get_process_state(fake_psutil.TARGET_NAME), True),
+        ("get_pid_from_process_name", lambda: logic.get_pid_from_process_name(fake_psutil.TARGET_NAME),
+         target_pids),
+        ("get_pid_from_process_name_refresh",
+         lambda: fresh_logic.get_pid_from_process_name(fake_psutil.TARGET_NAME), target_pids),
+        ("get_pids_by_path", lambda: logic.get_pids_by_path(fake_psutil.TARGET_PATH), target_pids),
+        ("pid_exists_advanced", lambda: PJIPLogic.pid_exists_advanced(target_pid), PidStatus.EXISTS),
+        ("pid_exists_advanced_missing", lambda: PJIPLogic.pid_exists_advanced(missing_pid), PidStatus.NOT_EXISTS),
+    ]
+    if table.denied_pids:
+        denied_pid = table.denied_pids[0]
+        cases.append(("pid_exists_advanced_denied", lambda: PJIPLogic.pid_exists_advanced(denied_pid),
+                      PidStatus.ACCESS_DENIED))
+    return cases
+
+
+def check_case(name, fn, expected):
+    """
+    A case that returns the wrong result would time a different code path, e.g. an immediate miss.
+
+    :raise AssertionError: fn does not return expected
+    """
+    result = fn()
+    assert result == expected, f"{name} returned {result!r}, expected {expected!r}"
+
+
+def measure(fn, min_time):
+    """
+    :return: (ops/sec, peak traced bytes per op, bytes still allocated afterwards per op)
+    """
+    # Warm up the snapshot and calibrate the number of calls
+    fn()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    ops = number / elapsed
+
+    # Allocations are measured on a separate, shorter run as tracemalloc slows every call down
+    number = max(1, min(number, 1000))
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(number):
+            fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return ops, (peak - baseline) / number, (current - baseline) / number
+
+
+def run(sizes, denied_rates, min_time):
+    results = {}
+    for size in sizes:
+        for denied in denied_rates:
+            table = fake_psutil.FakeProcessTable(size, access_denied_rate=denied)
+            fake_psutil.set_table(table)
+
+            for name, fn, expected in create_cases(table):
+                key = f"{name}[size={size},denied={denied:g}]"
+                check_case(key, fn, expected)
+                ops, peak_bytes, retained = measure(fn, min_time)
+                results[key] = {
+                    "ops_per_sec": ops,
+                    "peak_bytes_per_op": peak_bytes,
+                    "retained_bytes_per_op": retained,
+                }
+    return results
+
+
+def compare(results, baselines, tolerance):
+    """
+    :return: list of (key, ops/sec, baseline ops/sec) that regressed
+    """
+    regressions = []
+    for key, result in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+        if result["ops_per_sec"] < baseline["ops_per_sec"] * (1 - tolerance):
+            regressions.append((key, result["ops_per_sec"], baseline["ops_per_sec"]))
+    return regressions
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def save_baselines(path, results):
+    data = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def print_table(results, baselines):
+    print(f"{'benchmark':<62} {'ops/sec':>14} {'baseline':>14} {'peak B/op':>10} {'kept B/op':>10}")
+    for key, result in results.items():
+        baseline = baselines.get(key)
+        baseline_ops = f"{baseline['ops_per_sec']:>14,.0f}" if baseline else f"{'-':>14}"
+        print(f"{key:<62} {result['ops_per_sec']:>14,.0f} {baseline_ops} "
+              f"{result['peak_bytes_per_op']:>10,.0f} {result['retained_bytes_per_op']:>10,.1f}")
+
+
+def parse_list(value, cast):
+    return tuple(cast(item) for item in value.split(",") if item)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=lambda v: parse_list(v, int), default=DEFAULT_SIZES,
+                        help="comma separated process table sizes")
+    parser.add_argument("--denied", type=lambda v: parse_list(v, float), default=DEFAULT_DENIED_RATES,
+                        help="comma separated AccessDenied rates")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per benchmark")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baselines")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed ops/sec drop before failing")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.denied, args.min_time)
+
+    if args.save_baseline:
+        save_baselines(args.baseline, results)
+
+    baselines = load_baselines(args.baseline)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results, baselines)
+
+    if args.save_baseline:
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance)
+    for key, ops, baseline_ops in regressions:
+        print(f"REGRESSION {key}: {ops:,.0f} ops/sec, baseline {baseline_ops:,.0f}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,73 @@
+import os
 import sys
 
-from PySide6.QtWidgets import QApplication
+from pjip.core import startup_profile
 
-from pjip.core import logic, service
-from pjip.config.runtime_status import RuntimeStatus
-from pjip.adapter import AdapterManager
-from pjip.gui import MainWindow
-from pjip.config import build_config
+# Started before the other imports so their time is part of the report
+startup_profile.start_from_argv(sys.argv)
+
+with startup_profile.phase("imports"):
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from pjip.core import logic, service
+    from pjip.core.cache import get_cache_dir
+    from pjip.core.log import LogService
+    from pjip.core.runtime import AsyncRuntime
+    from pjip.core.startup import StartupOrchestrator
+    from pjip.config.runtime_status import RuntimeStatus
+    from pjip.adapter import AdapterManager
+    from pjip.gui import MainWindow, apply_theme
+    from pjip.config import build_config
 
 
 class PJIPMain:
     def __init__(self):
-        self.app = QApplication(sys.argv)
+        phase = startup_profile.phase
+
+        with phase("log_service"):
+            self.log_service = LogService(
+                log_dir=os.path.join(get_cache_dir(build_config.PROJECT_NAME_ABBREVIATION), "logs")
+            )
+            self.log_service.start()
+
+        # Probes independent of each other run while the window is built,
+        # only the admin check has to finish first, it may relaunch the programme
+        self.startup = StartupOrchestrator()
+
+        with phase("logic"):
+            self.logic = logic.PJIPLogic(build_config, startup=self.startup)
+        with phase("runtime_status"):
+            self.runtime_status = RuntimeStatus(self.logic, self.startup)
 
-        self.logic = logic.PJIPLogic(build_config)
-        self.runtime_status = RuntimeStatus(self.logic)
-        self.gui = MainWindow()
-        self.adapters = AdapterManager(self.logic, self.gui, self.runtime_status)
-        self.gui.adapter_signal_connect(self.adapters)
+        with phase("qt_application"):
+            self.app = QApplication(sys.argv)
+            apply_theme(self.app)
 
-        self.gui.show()
+        with phase("main_window"):
+            self.gui = MainWindow()
+        with phase("adapters"):
+            # One event loop for the services and the I/O bound adapters
+            self.runtime = AsyncRuntime()
+            self.runtime.start()
+            self.adapters = AdapterManager(self.logic, self.gui, self.runtime_status, self.runtime)
+            self.gui.adapter_signal_connect(self.adapters)
 
-        self.runtime_status.ui_launched(self.gui)
+        with phase("show"):
+            self.gui.show()
+
+            self.runtime_status.ui_launched(self.gui)
 
         # self.logic.after_ui_launched(self.gui.winId())
 
-        self.services = service.ServiceManager(self.logic, self.runtime_status)
+        with phase("services"):
+            self.services = service.ServiceManager(self.logic, self.runtime_status, self.runtime)
+
+        self.startup.shutdown()
+
+        if startup_profile.get_profiler() is not None:
+            # The first turn of the event loop paints the window
+            QTimer.singleShot(0, self.finish_startup_profile)
 
         self.gui.close_event.connect(self.handle_close_event)
 
@@ -33,9 +75,17 @@ class PJIPMain:
 
         sys.exit(self.app.exec())
 
+    def finish_startup_profile(self):
+        profiler = startup_profile.get_profiler()
+        profiler.write_report()
+        if profiler.exit_after:
+            self.gui.close()
+
     def handle_close_event(self):
         self.adapters.quit_all()
         self.services.stop_all()
+        self.runtime.stop()
+        self.log_service.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+import sys
+
+from pjip.cli import main
+
+sys.exit(main())
@@ -1,7 +1,11 @@
+import logging
+
 from PySide6.QtGui import QGuiApplication
 
 from pjip.config import build_config
 
+logger = logging.getLogger(__name__)
+
 
 class StartStudentmainAdapter:
     def __init__(self, logic):
@@ -18,10 +22,11 @@ class SuspendStudentmainAdapter:
         self.logic = logic
 
     def start(self):
-        pids = self.logic.get_pid_from_process_name(build_config.E_CLASSROOM_PROGRAM_NAME)
+        pids = self.logic.get_studentmain_pids()
 
         if pids is None:
-            print(f'{build_config.E_CLASSROOM_PROGRAM_NAME} not found')
+            logger.info(f'{build_config.E_CLASSROOM_PROGRAM_NAME} not found')
+            return
 
         for pid in pids:
             suspend_state = self.logic.is_suspended(pid)
@@ -1,11 +1,14 @@
 # adapter.py
 # from threading import Thread
+import logging
 from typing import Iterable
 
-from PySide6.QtCore import QObject, Signal, QThreadPool
+from PySide6.QtCore import QObject, Signal
 
 from pjip.config import build_config
-from pjip.core.enums import PidStatus
+from pjip.core.enums import PidStatus, TaskPriority
+from pjip.core.log import get_ring_buffer, set_log_level
+from pjip.core.metrics import get_registry
 from .action import SuspendStudentmainAdapter, StartStudentmainAdapter, CleanIFEODebuggersAdapter, \
     CopyToClipboardAdapter
 from .dispatcher import TaskDispatcher
@@ -13,55 +16,62 @@ from .dispatcher import TaskDispatcher
 from .polling import MonitorAdapter, SuspendMonitorAdapter, GetStudentmainPasswordAdapter, UpdateAdapter, \
     RunTaskmgrAdapter
 from .polling_manager import PollingManager
-from .runner import TerminatePIDTask
+from .runner import TerminatePIDTask, TerminateProcessTask
+
+logger = logging.getLogger(__name__)
 
 
 class AdapterManager(QObject):
     ui_change = Signal(str, object)
 
-    def __init__(self, logic, gui, runtime_status):
+    QUIT_TIMEOUT = 3  # second
+
+    def __init__(self, logic, gui, runtime_status, runtime):
+        """
+        :param runtime: AsyncRuntime of the coroutine adapters
+        """
         super().__init__()
         self.on_demand_objects = {}
         self.logic = logic
         self.gui = gui
         self.runtime_status = runtime_status
+        self.runtime = runtime
 
         self.polling = PollingManager()
         self.dispatcher = TaskDispatcher()
+        self.async_adapters = []
 
         # WILL BE DELETED IN NEXT VERSION
         # self.lifelong_adapters = []
         # self.lifelong_objects = {}
 
+        self.monitor_adapter = self.suspend_monitor_adapter = None
         self.terminate_pid_adapter = self.terminate_process_adapter = self.start_adapter = None
         self.suspend_studentmain_adapter = self.run_taskmgr_adapter = self.update_adapter = None
         self.clean_ifeo_debuggers_adapter = None
 
-        self.init_threadpools()
         self.init_workers()
         self.connect_signals()
         self.start_all()
 
-    def init_threadpools(self):
-        self.terminate_threadpool = QThreadPool()
-        self.terminate_threadpool.setMaxThreadCount(2)
-
     def init_workers(self):
-        self.polling.add(MonitorAdapter(self.logic))
-        self.polling.add(SuspendMonitorAdapter(self.logic))
+        self.monitor_adapter = MonitorAdapter(self.logic)
+        self.polling.add(self.monitor_adapter)
+        self.suspend_monitor_adapter = SuspendMonitorAdapter(self.logic)
+        self.polling.add(self.suspend_monitor_adapter)
         self.polling.add(GetStudentmainPasswordAdapter(self.logic, self.runtime_status))
         # self.lifelong_adapters.append(DatabaseAdapter(logic, 2000))
         # self.lifelong_adapters.append(NetworkAdapter(logic, 5000))
 
-        self.update_adapter = UpdateAdapter(self.logic)
-        self.polling.add(self.update_adapter)
+        self.update_adapter = UpdateAdapter(self.logic, self.runtime)
+        self.async_adapters.append(self.update_adapter)
 
         self.terminate_pid_adapter = TerminatePIDAdapter(self.logic, self.runtime_status.pid, self.dispatcher)
 
-        self.terminate_process_adapter = TerminateProcessAdapter(self.logic, self.runtime_status.current_process_name,
+        self.terminate_process_adapter = TerminateProcessAdapter(self.logic, self.runtime_status,
                                                                  self.terminate_pid_adapter)
 
-        self.run_taskmgr_adapter = RunTaskmgrAdapter(self.logic)
+        self.run_taskmgr_adapter = RunTaskmgrAdapter(self.logic, self.runtime)
 
         self.suspend_studentmain_adapter = SuspendStudentmainAdapter(self.logic)
         self.start_adapter = StartStudentmainAdapter(self.logic)
@@ -85,23 +95,34 @@ class AdapterManager(QObject):
 
         # self.lifelong_objects[self.run_taskmgr_adapter] = thread
 
-        self.polling.add(self.run_taskmgr_adapter)
+        self.async_adapters.append(self.run_taskmgr_adapter)
 
         # thread.start()
 
     def connect_signals(self):
-        for adapter in self.polling.adapters:
+        metrics = get_registry()
+        for adapter in self.polling.adapters + self.async_adapters:
             adapter.change.connect(
                 lambda result, w=adapter:
                 self.ui_change.emit(type(w).__name__, result)
             )
+            adapter.change.connect(
+                lambda *_, name=f'{type(adapter).__name__}.change':
+                metrics.count_signal(name)
+            )
 
     def start_all(self):
+        self.logic.process_events.start()
         self.polling.start()
+        for adapter in self.async_adapters:
+            adapter.start()
 
     def stop_all(self):
         """Stop all adapters and safely exit the thread"""
         self.polling.stop()
+        for adapter in self.async_adapters:
+            adapter.stop()
+        self.logic.process_events.stop()
         # WILL BE DELETED IN NEXT VERSION
         # for adapter, thread in self.lifelong_objects.items():
         #     adapter.deleteLater()
@@ -113,27 +134,36 @@ class AdapterManager(QObject):
     def ui_launched(self):
         pass
 
-    def wait_for_pools(self):
-        self.terminate_threadpool.waitForDone()
-
     def quit_all(self):
         self.stop_all()
-        self.wait_for_pools()
+        # Queued tasks are dropped, running ones finish their current step
+        self.dispatcher.cancel_all()
+        # Called on the GUI thread, a task stuck in an OS call must not hang the exit
+        if not self.dispatcher.wait(self.QUIT_TIMEOUT):
+            logger.warning(f'Tasks still running on exit: {", ".join(self.dispatcher.running_tasks())}')
+
+    def burst_monitors(self):
+        """Poll studentmain at the fast interval for a while after a user action"""
+        self.monitor_adapter.trigger_burst.emit()
+        self.suspend_monitor_adapter.trigger_burst.emit()
 
     def terminate_studentmain(self):
         self.terminate_process_adapter.run_async(build_config.E_CLASSROOM_PROGRAM_NAME)
+        self.burst_monitors()
 
     def start_studentmain(self):
         self.start_adapter.start()
+        self.burst_monitors()
 
     def suspend_resume_studentmain(self):
         self.suspend_studentmain_adapter.start()
+        self.burst_monitors()
 
     def run_taskmgr(self):
-        print('Topmost taskmgr triggered')
+        logger.info('Topmost taskmgr triggered')
 
         if self.run_taskmgr_adapter.is_running():
-            print("taskmgr adapter already running")
+            logger.info("taskmgr adapter already running")
             return
 
         self.run_taskmgr_adapter.trigger_run.emit()
@@ -146,20 +176,36 @@ class AdapterManager(QObject):
 
     def clean_ifeo_debuggers(self):
         self.clean_ifeo_debuggers_adapter.start()
-        print('ifeo cleaned')
+        logger.info('ifeo cleaned')
 
     def get_update(self):
+        """
+        :return: False when another update task is running
+        """
         if self.update_adapter.is_running():
-            print("update adapter already running")
-            return
+            logger.info("update adapter already running")
+            return False
 
         self.update_adapter.trigger_run.emit()
+        return True
+
+    def download_update(self):
+        """
+        :return: False when another update task is running
+        """
+        if self.update_adapter.is_running():
+            logger.info("update adapter already running")
+            return False
+
+        self.update_adapter.trigger_download.emit()
+        return True
 
     def get_current_version(self):
         return self.logic.get_current_version()
 
     def terminate_custom_process(self, process_info):
         self.terminate_custom_process_adapter.trigger_run.emit(process_info)
+        self.burst_monitors()
 
     def copy_studentmain_password_to_clipboard(self):
         self.copy_to_clipboard(self.runtime_status.studentmain_password)
@@ -167,6 +213,33 @@ class AdapterManager(QObject):
     def copy_to_clipboard(self, content):
         self.copy_to_clipboard_adapter.copy_to_clipboard(content)
 
+    @staticmethod
+    def get_log_records(since=0):
+        """
+        :param since: sequence number of the last record already seen
+        :return: list of (sequence, LogRecord) newer than since
+        """
+        ring_buffer = get_ring_buffer()
+        if ring_buffer is None:
+            return []
+        return ring_buffer.records_since(since)
+
+    @staticmethod
+    def set_log_level(level):
+        set_log_level(level)
+
+    @staticmethod
+    def get_metrics():
+        return get_registry().snapshot()
+
+    @staticmethod
+    def export_metrics(path):
+        get_registry().export(path)
+
+    @staticmethod
+    def reset_metrics():
+        get_registry().reset()
+
 
 class TerminateCustomProcessAdapter(QObject):
     change = Signal(object)
@@ -186,17 +259,16 @@ class TerminateCustomProcessAdapter(QObject):
         self.trigger_run.connect(self.run_task)
 
     def run_task(self, process_info: str):
+        """
+        :return: TaskHandle of the termination, None when refused
+        """
         if self.is_valid_pid(process_info):
             process_pid = int(process_info)
             if self.pid_exists(process_pid):
-                self.terminate_pid(process_pid)
-            else:
-                process_name = self.handle_process_name(process_info)
-                self.terminate_process(process_name)
+                return self.terminate_pid(process_pid)
 
-        else:
-            process_name = self.handle_process_name(process_info)
-            self.terminate_process(process_name)
+        process_name = self.handle_process_name(process_info)
+        return self.terminate_process(process_name)
 
     def is_valid_pid(self, s: str) -> bool:
         if not s.isdigit():
@@ -211,10 +283,10 @@ class TerminateCustomProcessAdapter(QObject):
         return self.logic.pid_exists(pid) == PidStatus.EXISTS
 
     def terminate_pid(self, pid):
-        self.terminate_pid_adapter.run_async(pid)
+        return self.terminate_pid_adapter.run_async(pid)
 
     def terminate_process(self, process_name: str):
-        self.terminate_process_adapter.run_async(process_name)
+        return self.terminate_process_adapter.run_async(process_name)
 
     @staticmethod
     def handle_process_name(process_name: str) -> str:
@@ -252,18 +324,27 @@ class TerminatePIDAdapter(QObject):
     #     self.dispatcher.submit(task, priority=10)
 
     def run_async(self, pids):
+        """
+        :return: TaskHandle of the termination, None when there is nothing to terminate
+        """
         valid_pids = self.format_pids(pids)
         other_pids = self.split_current_pid(valid_pids)
-        if other_pids:
-            task = TerminatePIDTask(self.logic, other_pids)
-            self.dispatcher.submit(task)
-
+        if not other_pids:
+            return None
+        task = TerminatePIDTask(self.logic, other_pids)
+        # Repeated clicks on the same targets while pending run once
+        return self.dispatcher.submit(task, TaskPriority.HIGH, key=('terminate_pids', frozenset(other_pids)))
 
     def run_sync(self, pids):
         valid_pids = self.format_pids(pids)
         other_pids = self.split_current_pid(valid_pids)
-        if other_pids:
-            TerminatePIDTask(self.logic, other_pids).run()
+        if not other_pids:
+            return None
+        try:
+            return TerminatePIDTask(self.logic, other_pids).run()
+        except RuntimeError as err:
+            logger.error(f'Cannot terminate {other_pids}: {err}')
+            return None
 
     @staticmethod
     def format_pids(pids: int | Iterable[int]):
@@ -275,7 +356,7 @@ class TerminatePIDAdapter(QObject):
         """Check if pids contains current_pid and return the rest."""
         if self.current_pid in pids:
             self.change.emit('Cannot terminate the current process(form pid)')
-            print('Cannot terminate the current process(form pid)')
+            logger.warning('Cannot terminate the current process(form pid)')
         other_pids = [pid for pid in pids if pid != self.current_pid]
         return other_pids
 
@@ -284,23 +365,30 @@ class TerminateProcessAdapter(QObject):
     """Terminate process, rely on PID adapter"""
     change = Signal(str)
 
-    def __init__(self, logic, current_process_name, pid_adapter: TerminatePIDAdapter, /):
+    def __init__(self, logic, runtime_status, pid_adapter: TerminatePIDAdapter, /):
         super().__init__()
         self.logic = logic
         self.pid_adapter = pid_adapter
-        self.current_process_name = current_process_name
+        self.runtime_status = runtime_status
+
+    @property
+    def current_process_name(self):
+        # Read on first use, the startup probe may still be running when the adapter is built
+        return self.runtime_status.current_process_name
 
     def run_async(self, process_name):
+        """
+        :return: TaskHandle of the termination, None when refused
+        """
         if process_name == self.current_process_name:
             self.change.emit('Cannot terminate the current process')
-            print('Cannot terminate the current process')
-            return
+            logger.warning('Cannot terminate the current process')
+            return None
 
-        pids = self.logic.get_pid_from_process_name(process_name)
-        if pids:
-            self.pid_adapter.run_async(pids)
-        else:
-            print(f'Invalid pids: {pids}')
+        # The process table is scanned by the task, once per pending name
+        task = TerminateProcessTask(self.logic, process_name, self.pid_adapter.current_pid)
+        return self.pid_adapter.dispatcher.submit(task, TaskPriority.HIGH,
+                                                  key=('terminate_name', process_name.lower()))
 
     def run_sync(self, process_name):
         if process_name == self.current_process_name:
@@ -308,4 +396,4 @@ class TerminateProcessAdapter(QObject):
             return
 
         pids = self.logic.get_pid_from_process_name(process_name)
-        self.pid_adapter.run_sync(pids)
+        return self.pid_adapter.run_sync(pids or ())
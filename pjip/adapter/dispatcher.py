@@ -1,36 +1,96 @@
+import logging
+import threading
+from collections import deque
+
 from PySide6.QtCore import QObject, QThreadPool, Signal
 
+from pjip.core.enums import TaskPriority, TaskState
+from pjip.core.metrics import get_registry
+from pjip.core.task import TaskHandle, TaskCancelled, TaskRejected
+
+logger = logging.getLogger(__name__)
+
 
 class TaskDispatcher(QObject):
+    """
+    Scheduler of one-shot tasks on a thread pool.
+
+    Queued tasks wait in one FIFO lane per TaskPriority, a higher lane is
+    always served first. A task submitted with a key that is still queued or
+    running is not queued again, the handle of the pending task is returned.
+    At most max_queued tasks wait. When the queue is full the oldest task of
+    the lowest lane below the new task's priority is dropped, if there is
+    none the new task is rejected.
+
+    Every submission returns a TaskHandle, a Future of what run() returns.
+    A runnable that has a cancel_token or progress_callback attribute
+    receives the CancellationToken and the progress setter of its handle.
+    """
     task_error = Signal(Exception)
     task_finished = Signal(object)
     task_return = Signal(object)
     task_middle = Signal(object)
     task_external_action = Signal(object)
 
-    def __init__(self, max_threads=4):
+    def __init__(self, max_threads=4, max_queued=32):
         super().__init__()
+        self.max_threads = max_threads
+        self.max_queued = max_queued
+
         self.pool = QThreadPool()
         self.pool.setMaxThreadCount(max_threads)
 
-        self.daemon_pool = QThreadPool()
-        self.daemon_pool.setMaxThreadCount(max_threads)
+        self.lanes = {priority: deque() for priority in TaskPriority}
+        self.pending = {}
+        self.running = set()
+
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
 
-    def submit(self, runnable, priority=0, daemon=False):
+    def submit(self, runnable, priority=TaskPriority.NORMAL, key=None) -> TaskHandle:
         """
-        submit a qrunner task
-        :param runnable:  QRunnable
-        :param priority:  int (higher = more important)
-        :param daemon: Whether run in daemon pool
-        :return:
+        Submit a task.
+
+        :param runnable: object with a run() method, usually a QRunnable
+        :param priority: TaskPriority
+        :param key: hashable identity of the work, None never deduplicates
+        :return: TaskHandle, the pending one when deduplicated
         """
-        if daemon:
-            self.daemon_pool.start(runnable, priority)
-        else:
-            self.pool.start(runnable, priority)
+        priority = TaskPriority(priority)
+        metrics = get_registry()
+
+        with self._lock:
+            pending = self.pending.get(key) if key is not None else None
+            if pending is not None and not pending.done():
+                metrics.count_signal('TaskDispatcher.deduplicated')
+                logger.debug(f'Task {key} already pending')
+                return pending
 
-    def injected_submit(self, runnable, priority=0, daemon=False):
-        pool = self.daemon_pool if daemon else self.pool
+            handle = TaskHandle(runnable, self.cancel, priority, key)
+            if hasattr(runnable, 'cancel_token'):
+                runnable.cancel_token = handle.token
+            if hasattr(runnable, 'progress_callback'):
+                runnable.progress_callback = handle.set_progress
+
+            dropped = None
+            if len(self.running) < self.max_threads:
+                self._start(handle)
+            elif self.queued_count() < self.max_queued or (dropped := self._drop_below(priority)):
+                self.lanes[priority].append(handle)
+            else:
+                metrics.count_error('TaskDispatcher.submit')
+                logger.warning(f'Task queue full, {type(runnable).__name__} rejected')
+                handle.finish_error(TaskRejected('Task queue full'))
+                return handle
+
+            if key is not None:
+                self.pending[key] = handle
+
+        if dropped is not None:
+            dropped.finish_error(TaskRejected('Dropped from the full task queue'))
+        return handle
+
+    def injected_submit(self, runnable, priority=TaskPriority.NORMAL, key=None) -> TaskHandle:
         runnable.finished_callback = lambda v: self.task_finished.emit(v)
         runnable.error_callback = lambda e: self.task_error.emit(e)
 
@@ -43,7 +103,116 @@ class TaskDispatcher(QObject):
         if hasattr(runnable, "external_callback"):
             runnable.external_callback = lambda v: self.task_external_action.emit(v)
 
-        pool.start(runnable, priority)
+        return self.submit(runnable, priority, key)
+
+    def queued_count(self):
+        return sum(len(lane) for lane in self.lanes.values())
+
+    def _drop_below(self, priority):
+        """
+        Drop the oldest queued task with a lower priority, called with the lock held.
+
+        :return: handle of the dropped task, None when there is none
+        """
+        for lane_priority in TaskPriority:
+            if lane_priority >= priority:
+                break
+            lane = self.lanes[lane_priority]
+            if lane:
+                dropped = lane.popleft()
+                self._forget(dropped)
+                get_registry().count_signal('TaskDispatcher.dropped')
+                logger.warning(f'Task queue full, {type(dropped.task).__name__} dropped')
+                return dropped
+        return None
+
+    def _start(self, handle):
+        handle.set_running()
+        self.running.add(handle)
+        self.pool.start(lambda: self._run(handle))
 
-    def wait(self):
-        self.pool.waitForDone()
+    def _run(self, handle):
+        result = error = None
+        try:
+            handle.token.raise_if_cancelled()
+            result = handle.task.run()
+        except TaskCancelled:
+            handle.token.cancel()
+        except Exception as err:
+            logger.error(f'Error occurred in {type(handle.task).__name__}: {err}')
+            error = err
+
+        # Completed before the bookkeeping, wait() returns only after every handle is done
+        if handle.token.cancelled:
+            handle.finish_cancelled()
+        elif error is not None:
+            handle.finish_error(error)
+        else:
+            handle.finish(result)
+        self._task_done(handle)
+
+    def _task_done(self, handle):
+        with self._lock:
+            self.running.discard(handle)
+            self._forget(handle)
+
+            for priority in reversed(TaskPriority):
+                lane = self.lanes[priority]
+                if lane:
+                    self._start(lane.popleft())
+                    break
+
+            if not self.running:
+                self._idle.notify_all()
+
+    def _forget(self, handle):
+        if handle.key is not None and self.pending.get(handle.key) is handle:
+            del self.pending[handle.key]
+
+    def cancel(self, handle):
+        """
+        Remove a queued task, or ask a running one to stop.
+
+        :return: False when the task already finished
+        """
+        with self._lock:
+            if handle.state is TaskState.QUEUED and handle in self.lanes[handle.priority]:
+                self.lanes[handle.priority].remove(handle)
+                self._forget(handle)
+            elif handle.state is TaskState.RUNNING:
+                handle.token.cancel()
+                get_registry().count_signal('TaskDispatcher.cancelled')
+                return True
+            else:
+                return False
+
+        get_registry().count_signal('TaskDispatcher.cancelled')
+        return handle.finish_cancelled()
+
+    def cancel_key(self, key):
+        with self._lock:
+            handle = self.pending.get(key)
+        return handle is not None and handle.cancel()
+
+    def running_tasks(self) -> list:
+        """
+        :return: class names of the running tasks
+        """
+        with self._lock:
+            return [type(handle.task).__name__ for handle in self.running]
+
+    def cancel_all(self):
+        with self._lock:
+            handles = [handle for lane in self.lanes.values() for handle in lane]
+            handles.extend(self.running)
+        for handle in handles:
+            handle.cancel()
+
+    def wait(self, timeout=None):
+        """
+        Wait until no task is queued or running.
+
+        :return: whether the dispatcher became idle in time
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self.running, timeout)
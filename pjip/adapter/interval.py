@@ -0,0 +1,53 @@
+import time
+
+
+class AdaptiveInterval:
+    """
+    Polling interval policy.
+
+    The interval grows geometrically from min_interval to max_interval while
+    nothing changes, and stays at burst_interval for burst_duration after a
+    state change or a user action.
+    """
+
+    def __init__(self, min_interval, max_interval, factor=2.0, burst_interval=None, burst_duration=3000):
+        """
+        :param min_interval: lower bound of the interval (millisecond)
+        :param max_interval: upper bound of the interval (millisecond)
+        :param factor: backoff multiplier applied after every unchanged poll
+        :param burst_interval: interval during a burst (millisecond), defaults to min_interval
+        :param burst_duration: how long a burst lasts (millisecond)
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Require 0 < min_interval <= max_interval")
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.burst_interval = burst_interval or min_interval
+        self.burst_duration = burst_duration / 1000
+
+        self.current = min_interval
+        self.burst_until = 0.0
+
+    def burst(self):
+        self.burst_until = time.monotonic() + self.burst_duration
+        self.current = self.min_interval
+
+    def in_burst(self):
+        return time.monotonic() < self.burst_until
+
+    def next_interval(self, changed) -> int:
+        """
+        :param changed: whether the last poll observed a change
+        :return: interval until the next poll (millisecond)
+        """
+        if changed:
+            self.burst()
+
+        if self.in_burst():
+            return self.burst_interval
+
+        interval = self.current
+        self.current = min(self.max_interval, int(self.current * self.factor))
+        return interval
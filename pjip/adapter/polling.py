@@ -1,7 +1,15 @@
+import asyncio
+import logging
+import threading
+
 from PySide6.QtCore import QObject, Signal, QTimer
 
 from pjip.config import build_config
-from pjip.core.enums import SuspendState
+from pjip.core.enums import SuspendState, UpdateState
+from pjip.core.metrics import get_registry, timed_method
+from .interval import AdaptiveInterval
+
+logger = logging.getLogger(__name__)
 
 
 class BaseAdapterInterface:
@@ -15,67 +23,168 @@ class BaseAdapterInterface:
         raise NotImplementedError("Subclasses must implement run_task()")
 
 
-class MonitorAdapter(QObject, BaseAdapterInterface):
-    change = Signal(bool)
+class AsyncAdapter(QObject, BaseAdapterInterface):
+    """
+    Adapter whose jobs are coroutines on the AsyncRuntime.
 
-    def __init__(self, logic):
+    The adapter stays in the thread that created it, its signals are emitted
+    from the runtime thread and reach Qt receivers as queued calls.
+    """
+
+    def __init__(self, runtime):
+        """
+        :param runtime: AsyncRuntime
+        """
         super().__init__()
-        self.logic = logic
+        self.runtime = runtime
+        self.job = None
+
+    def spawn(self, coro):
+        """
+        Run coro as the job of the adapter.
+
+        :return: concurrent Future of the job
+        """
+        self.job = self.runtime.submit(coro)
+        self.job.add_done_callback(self.log_job_error)
+        return self.job
+
+    def log_job_error(self, job):
+        if not job.cancelled() and job.exception() is not None:
+            logger.error(f'Error occurred in {type(self).__name__}: {job.exception()}')
+
+    def stop(self):
+        if self.job is not None:
+            self.job.cancel()
+
+    def is_running(self):
+        return self.job is not None and not self.job.done()
+
+
+class AdaptivePollingAdapter(QObject, BaseAdapterInterface):
+    """
+    Polling adapter whose timer follows an AdaptiveInterval policy.
+
+    Subclasses call reschedule() at the end of run_task() with whether the
+    poll observed a change. trigger_burst switches to the fast interval after
+    a user action.
+    """
+    trigger_burst = Signal()
+
+    MIN_INTERVAL = 500
+    MAX_INTERVAL = 4000
+
+    def __init__(self, min_interval=None, max_interval=None):
+        """
+        :param min_interval: lower bound of the polling interval (millisecond)
+        :param max_interval: upper bound of the polling interval (millisecond)
+        """
+        super().__init__()
+        self.interval = AdaptiveInterval(min_interval or self.MIN_INTERVAL, max_interval or self.MAX_INTERVAL)
         self.timer = QTimer(self)
-        self.timer.setInterval(500)
+        self.timer.setInterval(self.interval.min_interval)
         self.timer.timeout.connect(self.run_task)
+        self.trigger_burst.connect(self.burst)
+
+    def reschedule(self, changed):
+        self.timer.setInterval(self.interval.next_interval(changed))
+
+    def burst(self):
+        self.interval.burst()
+        if self.timer.isActive():
+            self.reschedule(False)
+
+
+class MonitorAdapter(AdaptivePollingAdapter):
+    change = Signal(bool)
+    process_event = Signal(object)
+
+    # Safety net only, starts and exits arrive as process events
+    MIN_INTERVAL = 500
+    MAX_INTERVAL = 8000
+
+    def __init__(self, logic, min_interval=None, max_interval=None):
+        super().__init__(min_interval, max_interval)
+        self.logic = logic
+        self.process_event.connect(self.on_process_event)
+        self.subscription = None
         self.last_result = None
 
     def start(self):
+        self.subscription = self.logic.process_events.subscribe(self.process_event.emit,
+                                                                build_config.E_CLASSROOM_PROGRAM_NAME)
         self.timer.start()
-        # QTimer.singleShot(0, self.check_state)
+        QTimer.singleShot(0, self.run_task)
 
     def stop(self):
         self.timer.stop()
+        if self.subscription is not None:
+            self.logic.process_events.unsubscribe(self.subscription)
+            self.subscription = None
 
+    def on_process_event(self, event):
+        self.run_task()
+
+    @timed_method
     def run_task(self):
         state = self.check_state()
-        if state is not self.last_result:
+        changed = state is not self.last_result
+        if changed:
             self.last_result = state
             self.change.emit(state)
+        self.reschedule(changed)
 
     def check_state(self):
         return self.logic.get_process_state(build_config.E_CLASSROOM_PROGRAM_NAME)
 
 
-class SuspendMonitorAdapter(QObject, BaseAdapterInterface):
+class SuspendMonitorAdapter(AdaptivePollingAdapter):
     change = Signal(SuspendState)
+    process_event = Signal(object)
 
-    def __init__(self, logic):
-        super().__init__()
+    # Suspend/resume has no lifecycle event, so this keeps polling
+    MIN_INTERVAL = 250
+    MAX_INTERVAL = 2000
+
+    def __init__(self, logic, min_interval=None, max_interval=None):
+        super().__init__(min_interval, max_interval)
         self.logic = logic
-        self.timer = QTimer(self)
-        self.timer.setInterval(500)
-        self.timer.timeout.connect(self.run_task)
+        self.process_event.connect(self.on_process_event)
+        self.subscription = None
         self.last_result = None
 
     def start(self):
+        self.subscription = self.logic.process_events.subscribe(self.process_event.emit,
+                                                                build_config.E_CLASSROOM_PROGRAM_NAME)
         self.timer.start()
         # QTimer.singleShot(0, self.check_state)
 
     def stop(self):
         self.timer.stop()
+        if self.subscription is not None:
+            self.logic.process_events.unsubscribe(self.subscription)
+            self.subscription = None
 
+    def on_process_event(self, event):
+        self.run_task()
+
+    @timed_method
     def run_task(self):
         state = self.check_state()
-        if state is not self.last_result:
+        changed = state is not self.last_result
+        if changed:
             self.last_result = state
             self.change.emit(state)
+        self.reschedule(changed)
 
     def check_state(self):
         """
         :return: Studentmain suspend state
         """
-        pids = self.logic.get_pid_from_process_name(build_config.E_CLASSROOM_PROGRAM_NAME)
+        # Matched by the installed path, another process named studentmain is not taken for it
+        pids = self.logic.get_studentmain_pids()
         if pids is None:
             return SuspendState.NOT_FOUND
-        # Same logic as the earlier method, may cause bug
-        # If a process's name is studentmain, but it's not the real one, this can suspend the wrong process
         pid = pids[0]
         if self.logic.is_suspended(pid):
             return SuspendState.SUSPENDED
@@ -83,15 +192,15 @@ class SuspendMonitorAdapter(QObject, BaseAdapterInterface):
             return SuspendState.RUNNING
 
 
-class GetStudentmainPasswordAdapter(QObject, BaseAdapterInterface):
+class GetStudentmainPasswordAdapter(AdaptivePollingAdapter):
     change = Signal(SuspendState)
 
-    def __init__(self, logic, runtime_status):
-        super().__init__()
+    MIN_INTERVAL = 5000
+    MAX_INTERVAL = 60000
+
+    def __init__(self, logic, runtime_status, min_interval=None, max_interval=None):
+        super().__init__(min_interval, max_interval)
         self.logic = logic
-        self.timer = QTimer(self)
-        self.timer.setInterval(30000)
-        self.timer.timeout.connect(self.run_task)
         self.last_result = None
         self.runtime_status = runtime_status
 
@@ -102,12 +211,15 @@ class GetStudentmainPasswordAdapter(QObject, BaseAdapterInterface):
     def stop(self):
         self.timer.stop()
 
+    @timed_method
     def run_task(self):
         state = self.get_studentmain_password()
-        if state != self.last_result:
+        changed = state != self.last_result
+        if changed:
             self.last_result = state
             self.runtime_status.update_studentmain_password(state)
             self.change.emit(state)
+        self.reschedule(changed)
 
     def get_studentmain_password(self):
         """
@@ -116,78 +228,105 @@ class GetStudentmainPasswordAdapter(QObject, BaseAdapterInterface):
         return self.logic.decode_studentmain_password()
 
 
-class UpdateAdapter(QObject, BaseAdapterInterface):
+class UpdateAdapter(AsyncAdapter):
     change = Signal(object)
     trigger_run = Signal()
+    trigger_download = Signal()
 
-    def __init__(self, logic):
-        super().__init__()
-        self.running = None
+    def __init__(self, logic, runtime):
+        super().__init__(runtime)
         self.logic = logic
+        self.cancel_event = threading.Event()
+        self.last_step = None
 
     def start(self):
-        self.running = False
-        self.trigger_run.connect(self.run_task)
+        self.trigger_run.connect(self.check_now)
+        self.trigger_download.connect(self.download)
 
+        # The startup check is served from the release cache when it is recent
         self.run_task()
 
     def stop(self):
-        self.running = False
+        self.cancel_event.set()
+        super().stop()
 
-    def run_task(self):
+    def check_now(self):
+        """User requested check, revalidate the cached release (usually a 304)"""
+        self.run_task(force=True)
+
+    def run_task(self, force=False):
         if self.is_running():
-            print('another getting update is running, exit')
+            logger.info('another getting update is running, exit')
             return
-        self.running = True
-        state, content = self.logic.check_update()
+        self.spawn(self.check_update(force))
 
+    async def check_update(self, force):
+        with get_registry().timed('UpdateAdapter.run_task'):
+            state, content = await self.runtime.run_blocking(self.logic.check_update, force)
         self.change.emit((state, content))
-        self.stop()
 
-    def is_running(self):
-        return self.running
+    def download(self):
+        if self.is_running():
+            logger.info('another update task is running, exit')
+            # The page already shows the download, let it reset
+            self.change.emit((UpdateState.DOWNLOAD_FAILED, 'busy'))
+            return
+        self.last_step = None
+        self.spawn(self.download_update())
+
+    async def download_update(self):
+        try:
+            with get_registry().timed('UpdateAdapter.download'):
+                path = await self.runtime.run_blocking(self.logic.download_update,
+                                                       self.report_progress, self.cancel_event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            logger.error(f'Update download failed: {err}')
+            self.change.emit((UpdateState.DOWNLOAD_FAILED, str(err)))
+        else:
+            self.change.emit((UpdateState.DOWNLOADED, path))
+
+    def report_progress(self, done, total):
+        # One signal per percent (per MiB if the size is unknown) instead of one per chunk
+        step = done * 100 // total if total else done >> 20
+        if step == self.last_step:
+            return
+        self.last_step = step
+        self.change.emit((UpdateState.DOWNLOADING, (done, total)))
+
 
+class RunTaskmgrAdapter(AsyncAdapter):
+    """
+    Start the task manager and put it on top once its window exists.
 
-class RunTaskmgrAdapter(QObject):
+    The job awaits the process start event followed by the window.
+    """
     trigger_run = Signal()
     change = Signal()
 
-    def __init__(self, logic):
-        super().__init__()
-        self.running = None
-        self.cnt = None
-        self.timer = None
+    TIMEOUT = 3  # second
+
+    def __init__(self, logic, runtime):
+        super().__init__(runtime)
         self.logic = logic
 
     def start(self):
-        self.running = False
-        self.cnt = 0
-        self.timer = QTimer(self)
-
-        self.timer.setInterval(100)
-        self.timer.timeout.connect(self.is_taskmgr_alive)
-
         self.trigger_run.connect(self.run_task)
 
     def run_task(self):
-        self.cnt = 0
-        self.running = True
-        self.logic.start_file("taskmgr")
-        print("adapter.start called")
-        self.timer.start()
-
-    def is_taskmgr_alive(self):
-        self.cnt += 1
-        if self.logic.get_process_state('taskmgr.exe'):
-            self.logic.top_taskmgr()
-            self.stop()
-        if self.cnt >= 30:  # 3s time out
-            print("Find taskmgr Time out")
-            self.stop()
-
-    def stop(self):
-        self.running = False
-        self.timer.stop()
-
-    def is_running(self):
-        return self.running
+        self.spawn(self.run_taskmgr())
+
+    async def run_taskmgr(self):
+        with get_registry().timed('RunTaskmgrAdapter.run_task'):
+            await self.runtime.run_blocking(self.logic.start_file, "taskmgr")
+            logger.debug("adapter.start called")
+            try:
+                # Cancelling the job cancels the wait as well
+                hwnd = await asyncio.wrap_future(self.logic.wait_for_taskmgr(self.TIMEOUT))
+            except TimeoutError:
+                logger.warning("Find taskmgr Time out")
+                return
+
+            await self.runtime.run_blocking(self.logic.top_taskmgr, hwnd)
+        self.change.emit()
@@ -2,35 +2,44 @@ from PySide6.QtCore import QThread
 
 
 class PollingManager: # QObject
+    """
+    Run all polling adapters on one scheduler thread.
+
+    The adapters' QTimers share the event loop of that thread, so Qt's timer
+    heap schedules every periodic job. Blocking jobs (network, waits) are
+    coroutines on the AsyncRuntime instead.
+    """
+
     def __init__(self):
         # super().__init__()
         self.adapters = []
-        self.threads = []
+        self.scheduler_thread = None
 
     def add(self, adapter):
         self.adapters.append(adapter)
 
     def start(self):
+        self.scheduler_thread = QThread()
+        self.scheduler_thread.setObjectName("PollingScheduler")
+
         for adapter in self.adapters:
-            thread = QThread()
-            adapter.moveToThread(thread)
+            adapter.moveToThread(self.scheduler_thread)
+            self.scheduler_thread.started.connect(adapter.start)
 
-            thread.started.connect(adapter.start)
-            self.threads.append((adapter, thread))
-            # self.lifelong_objects[adapter] = thread
-            # self.threads[adapter] = thread
-            thread.start()
+        self.scheduler_thread.start()
 
     def stop(self):
-        for adapter, thread in self.threads:
+        for adapter in self.adapters:
             adapter.deleteLater()
             adapter.stop()
-            thread.quit()
-            thread.wait()
-            thread.deleteLater()
+
+        if self.scheduler_thread is not None:
+            self.scheduler_thread.quit()
+            self.scheduler_thread.wait()
+            self.scheduler_thread.deleteLater()
 
     def get_adapter(self, cls):
         for a in self.adapters:
             if isinstance(a, cls):
                 return a
-        return None
\ No newline at end of file
+        return None
@@ -1,7 +1,15 @@
+import logging
+
 from PySide6.QtCore import QRunnable
 
+from pjip.core.metrics import get_registry, timed_method
+
+logger = logging.getLogger(__name__)
+
 
 class BaseRunnable(QRunnable):
+    """Run fn(*args), the result is returned to the dispatcher and so to the TaskHandle"""
+
     def __init__(self, fn, *args, callback=None, error_callback=None):
         super().__init__()
         self.fn = fn
@@ -12,11 +20,13 @@ class BaseRunnable(QRunnable):
     def run(self):
         try:
             result = self.fn(*self.args)
-            if self.callback:
-                self.callback(result)
         except Exception as e:
             if self.error_callback:
                 self.error_callback(e)
+            raise
+        if self.callback:
+            self.callback(result)
+        return result
 
 
 class AdvanceRunnable(QRunnable):
@@ -34,11 +44,14 @@ class AdvanceRunnable(QRunnable):
     def run(self):
         try:
             result = self.fn(*self.args)
-            if self.callback:
-                self.callback(result)
         except Exception as err:
             if self.error_callback:
                 self.error_callback(err)
+            raise
+        else:
+            if self.callback:
+                self.callback(result)
+            return result
         finally:
             if self.finished_callback:
                 self.finished_callback(None)
@@ -59,16 +72,55 @@ class TerminatePIDTask(QRunnable):
         super().__init__()
         self.logic = logic
         self.pids = pids
+        self.cancel_token = None
+        self.progress_callback = None
+
+    def resolve_pids(self):
+        return self.pids
 
+    @timed_method
     def run(self):
-        if not self.pids:
-            print("PID not found")
-            return
-        for pid in self.pids:
+        """
+        :return: {"terminated": [pid, ...], "errors": {pid: message}}
+        :raise RuntimeError: no process could be terminated
+        :raise TaskCancelled: cancelled before every PID was handled
+        """
+        pids = self.resolve_pids()
+        if not pids:
+            logger.warning("PID not found")
+            return {"terminated": [], "errors": {}}
+
+        terminated = []
+        errors = {}
+        for index, pid in enumerate(pids):
+            if self.cancel_token is not None:
+                self.cancel_token.raise_if_cancelled()
             try:
                 self.logic.terminate_process(pid)
+                terminated.append(pid)
             except RuntimeError as err:
-                print(f"Error occurred in terminate pid task: {err}")
+                get_registry().count_error(f'{type(self).__name__}.run')
+                logger.error(f"Error occurred in terminate pid task: {err}")
+                errors[pid] = str(err)
+            if self.progress_callback:
+                self.progress_callback((index + 1) / len(pids))
+
+        if not terminated:
+            raise RuntimeError("; ".join(errors.values()))
+        return {"terminated": terminated, "errors": errors}
+
+
+class TerminateProcessTask(TerminatePIDTask):
+    """Look up the PIDs of a process name on the worker thread, then terminate them"""
+
+    def __init__(self, logic, process_name, exclude_pid=None):
+        super().__init__(logic, ())
+        self.process_name = process_name
+        self.exclude_pid = exclude_pid
+
+    def resolve_pids(self):
+        pids = self.logic.get_pid_from_process_name(self.process_name) or ()
+        return [pid for pid in pids if pid != self.exclude_pid]
 
 
 class TerminatePIDTaskAdvance(AdvanceRunnable):
@@ -83,7 +135,7 @@ class TerminatePIDTaskAdvance(AdvanceRunnable):
 
     def run(self):
         if not self.pids:
-            print("PID not found")
+            logger.warning("PID not found")
             return
         for pid in self.pids:
             try:
@@ -94,6 +146,8 @@ class TerminatePIDTaskAdvance(AdvanceRunnable):
                 self.finished_callback(None)
 
 class TaskmgrRunner(AdvanceRunnable):
+    TIMEOUT = 3  # second
+
     def __init__(self, logic):
         super().__init__(fn=self.run_task)
         self.logic = logic
@@ -101,17 +155,17 @@ class TaskmgrRunner(AdvanceRunnable):
         self.external_callback = None
 
     def run_task(self):
-        for i in range(30):
-            if self.middle_callback:
-                self.middle_callback(i)
+        waiter = self.logic.wait_for_taskmgr(self.TIMEOUT)
+        if self.middle_callback:
+            self.middle_callback("waiting")
 
-            if self.logic.get_process_state("taskmgr.exe"):
-                if self.external_callback:
-                    self.external_callback("top_taskmgr")
-                return "success"
-
-            # time.sleep(0.1)
+        try:
+            waiter.result()
+        except TimeoutError:
+            return "timeout"
 
-        return "timeout"
+        if self.external_callback:
+            self.external_callback("top_taskmgr")
+        return "success"
 
 
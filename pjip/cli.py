@@ -0,0 +1,185 @@
+"""
+Command line interface, ``python -m pjip <command>``.
+
+Drives PJIPLogic directly and prints one JSON document to stdout. Qt, the
+adapters and the services are never imported, log messages go to stderr.
+"""
+import argparse
+import json
+import logging
+import sys
+from enum import Enum
+
+from pjip.config import build_config
+from pjip.core.enums import UpdateState
+from pjip.core.log import LOG_FORMAT
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+
+
+def create_logic(args):
+    from pjip.core.backends import create_platform_backends
+    from pjip.core.logic import PJIPLogic
+
+    # A scripted call must not pop up an UAC prompt and relaunch itself. Hotfixes
+    # are collected by get_system_info() only, for system-info --hotfixes
+    return PJIPLogic(build_config, create_platform_backends(args.backend), elevate=False,
+                     collect_system_info=False)
+
+
+def process_name_arg(name):
+    return name if name.lower().endswith(".exe") else name + ".exe"
+
+
+def command_version(logic, args):
+    return True, {"version": logic.get_current_version()}
+
+
+def command_status(logic, args):
+    pids = logic.get_pid_from_process_name(args.name) or ()
+    return True, {
+        "name": args.name,
+        "running": bool(pids),
+        "pids": list(pids),
+        "suspended": {str(pid): logic.is_suspended(pid) for pid in pids},
+    }
+
+
+def command_terminate(logic, args):
+    current_pid = logic.get_current_pid()
+    pids = list(args.pids)
+    for name in args.name:
+        pids.extend(logic.get_pid_from_process_name(name) or ())
+
+    results = {}
+    for pid in pids:
+        if pid == current_pid:
+            results[pid] = "Cannot terminate the current process"
+            continue
+        try:
+            logic.terminate_process(pid)
+        except RuntimeError as err:
+            results[pid] = str(err)
+        else:
+            results[pid] = None
+
+    succeeded = bool(pids) and not any(results.values())
+    return succeeded, {"terminated": [pid for pid, err in results.items() if err is None],
+                       "errors": {pid: err for pid, err in results.items() if err is not None}}
+
+
+def command_suspend(logic, args):
+    results = {pid: logic.suspend_process(pid) for pid in args.pids}
+    return all(results.values()), {"suspended": results}
+
+
+def command_resume(logic, args):
+    results = {pid: logic.resume_process(pid) for pid in args.pids}
+    return all(results.values()), {"resumed": results}
+
+
+def command_check_update(logic, args):
+    state, value = logic.check_update(args.force)
+    return state is not UpdateState.ERROR, {
+        "state": state,
+        "current_version": logic.get_current_version(),
+        "value": value,
+    }
+
+
+def command_system_info(logic, args):
+    if args.hotfixes:
+        info = logic.get_system_info(args.timeout)
+    else:
+        info = logic.get_base_system_info()
+    return True, {"system_info": info}
+
+
+def command_password(logic, args):
+    password = logic.decode_studentmain_password()
+    return password is not None, {"password": password}
+
+
+def command_clean_ifeo(logic, args):
+    return True, {"result": logic.clean_ifeo_debuggers()}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m pjip", description=build_config.FULL_VERSION)
+    parser.add_argument("--backend", choices=("windows", "posix", "fake"), default=None,
+                        help="platform backends, default: the running system")
+    parser.add_argument("--indent", type=int, default=None, help="indent the JSON output")
+    parser.add_argument("--log-level", default="WARNING",
+                        choices=("DEBUG", "INFO", "WARNING", "ERROR"), help="level of the log on stderr")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("version", help="current version")
+    command.set_defaults(handler=command_version)
+
+    command = commands.add_parser("status", help="whether a process is running")
+    command.add_argument("name", nargs="?", type=process_name_arg, default=build_config.E_CLASSROOM_PROGRAM_NAME)
+    command.set_defaults(handler=command_status)
+
+    command = commands.add_parser("terminate", help="terminate processes by PID or name")
+    command.add_argument("pids", nargs="*", type=int, metavar="PID")
+    command.add_argument("-n", "--name", action="append", type=process_name_arg, default=[],
+                         help="process name, may be repeated")
+    command.set_defaults(handler=command_terminate)
+
+    command = commands.add_parser("suspend", help="suspend processes")
+    command.add_argument("pids", nargs="+", type=int, metavar="PID")
+    command.set_defaults(handler=command_suspend)
+
+    command = commands.add_parser("resume", help="resume processes")
+    command.add_argument("pids", nargs="+", type=int, metavar="PID")
+    command.set_defaults(handler=command_resume)
+
+    command = commands.add_parser("check-update", help="compare with the latest release")
+    command.add_argument("--force", action="store_true", help="revalidate the cached release")
+    command.set_defaults(handler=command_check_update)
+
+    command = commands.add_parser("system-info", help="system information")
+    command.add_argument("--hotfixes", action="store_true", help="include installed hotfixes")
+    command.add_argument("--timeout", type=float, default=None, help="seconds to wait for hotfixes")
+    command.set_defaults(handler=command_system_info)
+
+    command = commands.add_parser("password", help="decode the studentmain password")
+    command.set_defaults(handler=command_password)
+
+    command = commands.add_parser("clean-ifeo", help="remove IFEO debuggers")
+    command.set_defaults(handler=command_clean_ifeo)
+
+    return parser
+
+
+def json_default(value):
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+
+def main(argv=None):
+    """
+    :param argv: arguments without the programme name, None uses sys.argv
+    :return: exit code
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level, stream=sys.stderr, format=LOG_FORMAT)
+
+    try:
+        logic = create_logic(args)
+        succeeded, result = args.handler(logic, args)
+    except Exception as err:
+        logger.debug("Command failed", exc_info=True)
+        succeeded, result = False, {"error": str(err)}
+
+    result = dict(command=args.command, ok=succeeded, **result)
+    json.dump(result, sys.stdout, indent=args.indent, default=json_default, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return EXIT_OK if succeeded else EXIT_FAILED
@@ -28,7 +28,12 @@ FULL_VERSION = f"{PROJECT_NAME} v{VERSION}"
 
 # UPDATE_URL = "https://api.github.com/repos/Errorsia/PJIV-pre/releases/latest"
 UPDATE_URL = "https://api.github.com/repos/Errorsia/PJIP/releases/latest"
-UPDATE_URLS = tuple(UPDATE_URL)
+# Release endpoints queried concurrently, the first valid answer wins.
+# Mirrors returning the same release JSON as the GitHub API can be appended here.
+UPDATE_URLS = (UPDATE_URL,)
+
+# Release asset downloaded by "Download update", first matching file name ending wins
+UPDATE_ASSET_SUFFIXES = (".zip", ".exe")
 
 E_CLASSROOM_NAME = 'studentmain'
 E_CLASSROOM_PROGRAM_NAME = E_CLASSROOM_NAME + '.exe'
@@ -36,5 +41,8 @@ E_CLASSROOM_PROGRAM_NAME = E_CLASSROOM_NAME + '.exe'
 STUDENTMAIN_NAME = 'studentmain'
 IS_E_CLASSROOM_STUDENTMAIN = STUDENTMAIN_NAME.lower() == E_CLASSROOM_NAME.lower()
 
+# Seconds a shared process table snapshot may be reused by pollers and lookups
+PROCESS_SNAPSHOT_MAX_STALENESS = 0.4
+
 # CODE_NAME = ''
 NICKNAME = PROJECT_NAME_ABBREVIATION
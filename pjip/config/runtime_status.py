@@ -1,8 +1,20 @@
+import logging
+
+from pjip.core.startup import run_probe, probe_result
+
+logger = logging.getLogger(__name__)
+
+
 class RuntimeStatus:
-    def __init__(self, logic):
+    def __init__(self, logic, startup=None):
+        """
+        :param logic: PJIPLogic
+        :param startup: StartupOrchestrator running the slow probes, None runs them now
+        """
         self.logic = logic
+        self.startup = startup
         self.pid = None
-        self.current_process_name = None
+        self.current_process_name_probe = None
         self.argv = None
         self.gui = None
         self.window_handle = None
@@ -15,20 +27,41 @@ class RuntimeStatus:
 
     def get_current_pid(self):
         self.pid = self.logic.get_current_pid()
-        print(f'PID: {self.pid}')
+        logger.info(f'PID: {self.pid}')
 
     def get_current_process_name(self):
-        self.current_process_name = self.logic.get_current_process_name()
-        print(self.current_process_name)
+        self.current_process_name_probe = run_probe(self.startup, "current_process_name",
+                                                    self.read_current_process_name)
+
+    def read_current_process_name(self):
+        name = self.logic.get_current_process_name()
+        logger.info(f'Process name: {name}')
+        return name
+
+    @property
+    def current_process_name(self):
+        return probe_result(self.current_process_name_probe, "current_process_name")
 
     def get_argv(self):
         self.argv = self.logic.get_argv()
-        print(self.argv)
+        logger.info(f'Argv: {self.argv}')
 
     def get_studentmain_info(self):
-        self.studentmain_directory = self.logic.studentmain_directory
-        self.studentmain_path = self.logic.studentmain_path
-        print(self.studentmain_path)
+        # Resolved by the logic, possibly still running as a startup probe
+        if self.logic.studentmain_probe is None:
+            logger.info(f'Studentmain path: {self.studentmain_path}')
+            return
+        self.logic.studentmain_probe.add_done_callback(
+            lambda _: logger.info(f'Studentmain path: {self.studentmain_path}')
+        )
+
+    @property
+    def studentmain_directory(self):
+        return self.logic.studentmain_directory
+
+    @property
+    def studentmain_path(self):
+        return self.logic.studentmain_path
 
     def ui_launched(self, gui):
         self.gui = gui
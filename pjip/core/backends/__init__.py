@@ -0,0 +1,26 @@
+import os
+
+from .base import ProcessBackend, RegistryBackend, WindowBackend, ElevationBackend, SystemBackend, \
+    PlatformBackends, REG_BINARY, REG_SZ
+
+
+def create_platform_backends(name=None) -> PlatformBackends:
+    """
+    :param name: "windows", "posix" or "fake", None picks the backends of the running system
+    :return: PlatformBackends
+    """
+    if name is None:
+        name = "windows" if os.name == "nt" else "posix"
+
+    # Each module is only imported when selected, windows needs winreg
+    match name:
+        case "windows":
+            from .windows import create_backends
+        case "posix":
+            from .posix import create_backends
+        case "fake":
+            from .fake import create_backends
+        case _:
+            raise ValueError(f"Unknown platform backends: {name}")
+
+    return create_backends()
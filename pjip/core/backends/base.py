@@ -0,0 +1,142 @@
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+import psutil
+
+# Registry value types, same numbers as the winreg constants
+REG_SZ = 1
+REG_BINARY = 3
+
+
+class ProcessBackend(ABC):
+    """Process control. Suspend and resume go through psutil on every platform"""
+
+    @abstractmethod
+    def terminate(self, pid: int, exit_code=1):
+        """
+        :raise RuntimeError: the process cannot be opened or terminated
+        """
+        raise NotImplementedError("Subclasses must implement terminate()")
+
+    @abstractmethod
+    def native_terminate(self, pid: int, exit_code=1):
+        """
+        Terminate through the lowest level API of the platform.
+
+        :raise RuntimeError: the process cannot be opened or terminated
+        """
+        raise NotImplementedError("Subclasses must implement native_terminate()")
+
+    @abstractmethod
+    def start_file(self, path):
+        raise NotImplementedError("Subclasses must implement start_file()")
+
+    def is_suspended(self, pid: int) -> bool:
+        try:
+            return psutil.Process(pid).status() == psutil.STATUS_STOPPED
+        except psutil.NoSuchProcess:
+            return False
+
+    def suspend(self, pid: int):
+        """
+        :raise psutil.NoSuchProcess: the process does not exist
+        :raise PermissionError: the process cannot be suspended
+        """
+        psutil.Process(pid).suspend()
+
+    def resume(self, pid: int):
+        """
+        :raise psutil.NoSuchProcess: the process does not exist
+        :raise PermissionError: the process cannot be resumed
+        """
+        psutil.Process(pid).resume()
+
+
+class RegistryBackend(ABC):
+    @abstractmethod
+    def read(self, key_path, value_name):
+        """
+        Read a value below HKEY_LOCAL_MACHINE, trying the 32-bit and 64-bit views.
+
+        :return: (value, value type) if found, otherwise None
+        """
+        raise NotImplementedError("Subclasses must implement read()")
+
+    @abstractmethod
+    def clean_ifeo_debuggers(self):
+        """
+        Delete the Image File Execution Options keys that set a debugger.
+
+        :return: True if every such key was deleted, None if IFEO cannot be opened
+        """
+        raise NotImplementedError("Subclasses must implement clean_ifeo_debuggers()")
+
+
+class WindowBackend(ABC):
+    @abstractmethod
+    def find_window(self, class_name=None, window_name=None):
+        """
+        :return: window handle
+        :raise RuntimeError: window not found
+        """
+        raise NotImplementedError("Subclasses must implement find_window()")
+
+    @abstractmethod
+    def set_top_most(self, hwnd):
+        raise NotImplementedError("Subclasses must implement set_top_most()")
+
+    @abstractmethod
+    def set_display_affinity(self, hwnd, affinity):
+        raise NotImplementedError("Subclasses must implement set_display_affinity()")
+
+    def set_taskmgr_top_most(self, hwnd, use_menu=False):
+        """
+        :param hwnd: task manager window handle
+        :param use_menu: switch on the "Always on top" menu item of the Windows 10 task manager
+        """
+        self.set_top_most(hwnd)
+
+
+class ElevationBackend(ABC):
+    @abstractmethod
+    def is_admin(self) -> bool:
+        raise NotImplementedError("Subclasses must implement is_admin()")
+
+    @abstractmethod
+    def elevate(self) -> bool:
+        """
+        Start this program again with administrator privilege.
+
+        :return: True if the elevated instance was started
+        """
+        raise NotImplementedError("Subclasses must implement elevate()")
+
+
+class SystemBackend(ABC):
+    @abstractmethod
+    def base_info(self) -> dict:
+        """
+        :return: dictionary with system, release, version, major, minor, build,
+            platform, service_pack and architecture
+        """
+        raise NotImplementedError("Subclasses must implement base_info()")
+
+    @abstractmethod
+    def hotfixes(self) -> list:
+        """
+        :return: list of {"kb", "date", "result"} dictionaries
+        """
+        raise NotImplementedError("Subclasses must implement hotfixes()")
+
+    @abstractmethod
+    def hotfix_history_count(self) -> int:
+        raise NotImplementedError("Subclasses must implement hotfix_history_count()")
+
+
+class PlatformBackends(NamedTuple):
+    name: str
+    process: ProcessBackend
+    registry: RegistryBackend
+    window: WindowBackend
+    elevation: ElevationBackend
+    system: SystemBackend
@@ -0,0 +1,134 @@
+from .base import ProcessBackend, RegistryBackend, WindowBackend, ElevationBackend, SystemBackend, PlatformBackends
+
+
+class FakeProcessBackend(ProcessBackend):
+    """
+    Records process operations instead of performing them.
+
+    Suspension is tracked in memory, so is_suspended() answers for the PIDs
+    suspended through this backend.
+    """
+
+    def __init__(self, protected_pids=()):
+        """
+        :param protected_pids: PIDs whose termination fails with RuntimeError
+        """
+        self.protected_pids = set(protected_pids)
+        self.terminated = []
+        self.suspended = set()
+        self.started_files = []
+
+    def terminate(self, pid: int, exit_code=1):
+        if pid in self.protected_pids:
+            raise RuntimeError("OpenProcess failed, error=5")
+        self.terminated.append(pid)
+
+    def native_terminate(self, pid: int, exit_code=1):
+        self.terminate(pid, exit_code)
+        return True
+
+    def start_file(self, path):
+        self.started_files.append(path)
+
+    def is_suspended(self, pid: int):
+        return pid in self.suspended
+
+    def suspend(self, pid: int):
+        self.suspended.add(pid)
+
+    def resume(self, pid: int):
+        self.suspended.discard(pid)
+
+
+class FakeRegistryBackend(RegistryBackend):
+    def __init__(self, values=None, ifeo_debuggers=()):
+        """
+        :param values: mapping of (key_path, value_name) -> (value, value type)
+        :param ifeo_debuggers: image names with an IFEO debugger
+        """
+        self.values = dict(values or {})
+        self.ifeo_debuggers = set(ifeo_debuggers)
+
+    def read(self, key_path, value_name):
+        return self.values.get((key_path, value_name))
+
+    def clean_ifeo_debuggers(self):
+        self.ifeo_debuggers.clear()
+        return True
+
+
+class FakeWindowBackend(WindowBackend):
+    def __init__(self, windows=None):
+        """
+        :param windows: mapping of (class name, window name) -> hwnd
+        """
+        self.windows = dict(windows or {})
+        self.top_most = set()
+        self.display_affinity = {}
+
+    def find_window(self, class_name=None, window_name=None):
+        if not class_name and not window_name:
+            raise ValueError("Must provide class_name or window_name")
+        for (window_class, name), hwnd in self.windows.items():
+            if class_name in (None, window_class) and window_name in (None, name):
+                return hwnd
+        raise RuntimeError("Window not found")
+
+    def set_top_most(self, hwnd):
+        self.top_most.add(hwnd)
+
+    def set_display_affinity(self, hwnd, affinity):
+        self.display_affinity[hwnd] = affinity
+
+
+class FakeElevationBackend(ElevationBackend):
+    def __init__(self, admin=True):
+        self.admin = admin
+        self.elevation_requests = 0
+
+    def is_admin(self):
+        return self.admin
+
+    def elevate(self):
+        self.elevation_requests += 1
+        return False
+
+
+class FakeSystemBackend(SystemBackend):
+    def __init__(self, info=None, hotfixes=()):
+        self.info = info or {
+            "system": "Windows",
+            "release": "10",
+            "version": "10.0.19045",
+            "major": 10,
+            "minor": 0,
+            "build": 19045,
+            "platform": 2,
+            "service_pack": "",
+            "architecture": ("64bit", "WindowsPE"),
+        }
+        self.hotfix_list = list(hotfixes)
+
+    def base_info(self):
+        return dict(self.info)
+
+    def hotfixes(self):
+        return list(self.hotfix_list)
+
+    def hotfix_history_count(self):
+        return len(self.hotfix_list)
+
+
+def create_backends(**kwargs):
+    """
+    :param kwargs: replacements of the default fakes, e.g. registry=FakeRegistryBackend(values)
+    """
+    backends = PlatformBackends(
+        name="fake",
+        process=FakeProcessBackend(),
+        registry=FakeRegistryBackend(),
+        window=FakeWindowBackend(),
+        elevation=FakeElevationBackend(),
+        system=FakeSystemBackend(),
+    )
+    return backends._replace(**kwargs)
@@ -0,0 +1,106 @@
+import logging
+import os
+import platform
+import re
+import shutil
+import signal
+import subprocess
+
+import psutil
+
+from .base import ProcessBackend, RegistryBackend, WindowBackend, ElevationBackend, SystemBackend, PlatformBackends
+
+logger = logging.getLogger(__name__)
+
+
+class PosixProcessBackend(ProcessBackend):
+    """psutil backend, reads /proc on Linux"""
+
+    def terminate(self, pid: int, exit_code=1):
+        try:
+            psutil.Process(pid).kill()
+        except psutil.NoSuchProcess as err:
+            raise RuntimeError(f"Process {pid} not found") from err
+        except psutil.AccessDenied as err:
+            raise RuntimeError(f"Access denied to process {pid}") from err
+
+    def native_terminate(self, pid: int, exit_code=1):
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError as err:
+            raise RuntimeError(f"kill failed: {err}") from err
+        return True
+
+    def start_file(self, path):
+        executable = shutil.which(path)
+        if executable is not None:
+            subprocess.Popen([executable], start_new_session=True)
+        else:
+            subprocess.Popen(["xdg-open", path], start_new_session=True)
+
+
+class PosixRegistryBackend(RegistryBackend):
+    """There is no registry, every value is missing"""
+
+    def read(self, key_path, value_name):
+        return None
+
+    def clean_ifeo_debuggers(self):
+        return True
+
+
+class PosixWindowBackend(WindowBackend):
+    """Window management is not available, only lookups fail"""
+
+    def find_window(self, class_name=None, window_name=None):
+        if not class_name and not window_name:
+            raise ValueError("Must provide class_name or window_name")
+        raise RuntimeError("Window not found")
+
+    def set_top_most(self, hwnd):
+        pass
+
+    def set_display_affinity(self, hwnd, affinity):
+        pass
+
+
+class PosixElevationBackend(ElevationBackend):
+    def is_admin(self):
+        return os.geteuid() == 0
+
+    def elevate(self):
+        return False
+
+
+class PosixSystemBackend(SystemBackend):
+    def base_info(self):
+        numbers = [int(n) for n in re.findall(r"\d+", platform.release())[:3]]
+        major, minor, build = (numbers + [0, 0, 0])[:3]
+        return {
+            "system": platform.system(),
+            "release": platform.release(),
+            "version": platform.version(),
+            "major": major,
+            "minor": minor,
+            "build": build,
+            "platform": os.name,
+            "service_pack": "",
+            "architecture": platform.architecture(),
+        }
+
+    def hotfixes(self):
+        return []
+
+    def hotfix_history_count(self):
+        return 0
+
+
+def create_backends():
+    return PlatformBackends(
+        name="posix",
+        process=PosixProcessBackend(),
+        registry=PosixRegistryBackend(),
+        window=PosixWindowBackend(),
+        elevation=PosixElevationBackend(),
+        system=PosixSystemBackend(),
+    )
@@ -0,0 +1,300 @@
+import ctypes
+import ctypes.wintypes as wintypes
+import logging
+import os
+import platform
+import re
+import sys
+import winreg
+
+from .base import ProcessBackend, RegistryBackend, WindowBackend, ElevationBackend, SystemBackend, PlatformBackends
+
+logger = logging.getLogger(__name__)
+
+
+class WindowsProcessBackend(ProcessBackend):
+    def __init__(self):
+        self.native_terminator = None
+
+    def terminate(self, pid: int, exit_code=1):
+        import pywintypes
+        import win32api
+        import win32con
+
+        h_process = None
+        try:
+            # noinspection PyUnresolvedReferences
+            h_process = win32api.OpenProcess(win32con.PROCESS_TERMINATE, False, pid)
+        except pywintypes.error as err: # type: ignore
+            logger.warning(err)
+        except Exception as err:
+            logger.error(err)
+
+        logger.debug(f'Value of h_process: {h_process}')
+        if not h_process:
+            # noinspection PyUnresolvedReferences
+            logger.error(f"OpenProcess failed, error={win32api.GetLastError()}")
+
+            # noinspection PyUnresolvedReferences
+            raise RuntimeError(f"OpenProcess failed, error={win32api.GetLastError()}")
+        else:
+            # noinspection PyUnresolvedReferences
+            win32api.TerminateProcess(h_process, exit_code)
+
+    def native_terminate(self, pid: int, exit_code=1):
+        if self.native_terminator is None:
+            self.native_terminator = NativeTerminator()
+        return self.native_terminator.terminate(pid, exit_code)
+
+    def start_file(self, path):
+        os.startfile(path)
+
+
+class WindowsRegistryBackend(RegistryBackend):
+    def read(self, key_path, value_name):
+        access_flags = [
+            winreg.KEY_READ | winreg.KEY_WOW64_32KEY,
+            winreg.KEY_READ | winreg.KEY_WOW64_64KEY,
+        ]
+
+        for flags in access_flags:
+            try:
+                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path, 0, flags) as key:
+                    value, reg_type = winreg.QueryValueEx(key, value_name)
+                    return value, reg_type
+            except FileNotFoundError:
+                continue
+            except OSError:
+                continue
+
+        return None
+
+    def clean_ifeo_debuggers(self):
+        success_flag = True
+        base_path = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion\Image File Execution Options"
+
+        try:
+            base_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, base_path, 0, winreg.KEY_ALL_ACCESS)
+        except PermissionError:
+            logger.warning("Permission denied")
+            return
+        except Exception as err:
+            logger.warning(f"Cannot open IFEO key: {err}")
+            return
+
+        try:
+            index = 0
+            while True:
+                try:
+                    subkey_name = winreg.EnumKey(base_key, index)
+                    index += 1
+                except OSError:
+                    break  # No subkey
+
+                subkey_path = base_path + "\\" + subkey_name
+
+                try:
+                    subkey = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, subkey_path, 0, winreg.KEY_ALL_ACCESS)
+                except PermissionError:
+                    continue
+                except FileNotFoundError:
+                    continue
+
+                try:
+                    winreg.QueryValueEx(subkey, "debugger")
+                except FileNotFoundError:
+                    winreg.CloseKey(subkey)
+                    continue
+                else:
+                    # Find debugger, delete subkey
+                    winreg.CloseKey(subkey)
+                    try:
+                        winreg.DeleteKey(winreg.HKEY_LOCAL_MACHINE, subkey_path)
+                        logger.info(f"{subkey_name} has been deleted")
+                    except Exception as err:
+                        success_flag = False
+                        logger.warning(f"{subkey_name} cannot be deleted: {err}")
+
+        finally:
+            winreg.CloseKey(base_key)
+
+        return success_flag
+
+
+class WindowsWindowBackend(WindowBackend):
+    def find_window(self, class_name=None, window_name=None):
+        if not class_name and not window_name:
+            raise ValueError("Must provide class_name or window_name")
+
+        # noinspection PyPackageRequirements
+        import win32gui
+
+        hwnd = win32gui.FindWindow(class_name, window_name)
+        if hwnd == 0:
+            raise RuntimeError("Window not found")
+        return hwnd
+
+    def set_top_most(self, hwnd):
+        import win32con
+        # noinspection PyPackageRequirements
+        import win32gui
+
+        win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST,
+                              0, 0, 0, 0,
+                              win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+
+    def set_display_affinity(self, hwnd, affinity):
+        ctypes.windll.user32.SetWindowDisplayAffinity(int(hwnd), affinity)
+
+    def set_taskmgr_top_most(self, hwnd, use_menu=False):
+        if not use_menu:
+            self.set_top_most(hwnd)
+            return
+
+        import pywintypes
+        import win32con
+        # noinspection PyPackageRequirements
+        import win32gui
+        import win32gui_struct
+
+        try:
+            hm = win32gui.GetMenu(hwnd)
+            mii, _ = win32gui_struct.EmptyMENUITEMINFO()
+            win32gui.GetMenuItemInfo(hm, 0x7704, False, mii)
+            if list(win32gui_struct.UnpackMENUITEMINFO(mii))[1] == 0:
+                win32gui.PostMessage(hwnd, win32con.WM_COMMAND, 0x7704, 0)
+        except PermissionError as err:
+            logger.error(f'An error occurred: {err}')
+        except pywintypes.error as err:  # type: ignore
+            logger.error(f'An error occurred: {err}')
+            self.set_top_most(hwnd)
+
+
+class WindowsElevationBackend(ElevationBackend):
+    def is_admin(self):
+        """Checking whether programme has administrator privilege"""
+        authority = ctypes.windll.shell32.IsUserAnAdmin()
+        return bool(authority)
+
+    def elevate(self):
+        """
+        Try to rerun script as admin
+        Uses ShellExecuteW with "runas"
+        :return: True if elevation succeeded, False otherwise
+        """
+        result = ctypes.windll.shell32.ShellExecuteW(
+            None, 'runas', sys.executable, ' '.join(sys.argv), None, 1
+        )
+        return result > 32
+
+
+class WindowsSystemBackend(SystemBackend):
+    def base_info(self):
+        win_ver = sys.getwindowsversion()
+        system_info = {
+            "system": platform.system(),  # Windows
+            "release": platform.release(),  # Major (e.g. 10, 11)
+            "version": platform.version(),  # build version
+            "major": win_ver.major,  # major version
+            "minor": win_ver.minor,  # minor version
+            "build": win_ver.build,  # build version
+            "platform": win_ver.platform,  # platform ID
+            "service_pack": win_ver.service_pack,
+            "architecture": platform.architecture(),  # (64bit, 32bit)
+        }
+        return system_info
+
+    def hotfixes(self):
+        """
+        Retrieve installed Windows hotfixes using the Update API.
+
+        Searches update history, extracts KB identifiers, install dates, and result codes.
+        :return: list of dictionaries with hotfix details
+        """
+        import win32com.client
+
+        update_session = win32com.client.Dispatch("Microsoft.Update.Session")
+        update_searcher = update_session.CreateUpdateSearcher()
+        history_count = update_searcher.GetTotalHistoryCount()
+        history = update_searcher.QueryHistory(0, history_count)
+
+        hotfixes = []
+        for entry in history:
+            match = re.search(r"(KB\d+)", entry.Title)
+            if match:
+                hotfixes.append({
+                    "kb": match.group(1),
+                    "date": str(entry.Date),
+                    "result": entry.ResultCode
+                })
+        return hotfixes
+
+    def hotfix_history_count(self):
+        """Number of entries in the Windows Update history, cheap compared to querying it"""
+        import win32com.client
+
+        update_session = win32com.client.Dispatch("Microsoft.Update.Session")
+        return update_session.CreateUpdateSearcher().GetTotalHistoryCount()
+
+
+class NativeTerminator:
+    PROCESS_TERMINATE = 0x0001
+    NTSTATUS = wintypes.LONG
+
+    def __init__(self):
+        self.ntdll = ctypes.WinDLL("ntdll")
+        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+        self.NtTerminateProcess = self.ntdll.NtTerminateProcess
+        self.NtTerminateProcess.argtypes = [wintypes.HANDLE, self.NTSTATUS]
+        self.NtTerminateProcess.restype = self.NTSTATUS
+
+        self.RtlNtStatusToDosError = self.ntdll.RtlNtStatusToDosError
+        self.RtlNtStatusToDosError.argtypes = [self.NTSTATUS]
+        self.RtlNtStatusToDosError.restype = wintypes.DWORD
+
+        self.OpenProcess = self.kernel32.OpenProcess
+        self.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self.OpenProcess.restype = wintypes.HANDLE
+
+        self.CloseHandle = self.kernel32.CloseHandle
+        self.CloseHandle.argtypes = [wintypes.HANDLE]
+        self.CloseHandle.restype = wintypes.BOOL
+
+    @staticmethod
+    def win_error():
+        err = ctypes.get_last_error()
+        msg = ctypes.FormatError(err)
+        return err, msg
+
+    def terminate(self, pid, exit_code = 1):
+        h_process = self.OpenProcess(self.PROCESS_TERMINATE, False, pid)
+        if not h_process:
+            err, msg = self.win_error()
+            raise RuntimeError(f"OpenProcess failed: {err} ({msg})")
+
+        status = self.NtTerminateProcess(h_process, exit_code)
+
+        self.CloseHandle(h_process)
+
+        if status != 0:
+            win32_err = self.RtlNtStatusToDosError(status)
+            raise RuntimeError(
+                f"NtTerminateProcess failed: NTSTATUS=0x{status:08X}, "
+                f"Win32Error={win32_err}"
+            )
+        else:
+            logger.debug(f"NTSTATUS = 0x{status:08X}")
+
+        return True
+
+
+def create_backends():
+    return PlatformBackends(
+        name="windows",
+        process=WindowsProcessBackend(),
+        registry=WindowsRegistryBackend(),
+        window=WindowsWindowBackend(),
+        elevation=WindowsElevationBackend(),
+        system=WindowsSystemBackend(),
+    )
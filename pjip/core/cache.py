@@ -0,0 +1,50 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_dir(app_name):
+    """
+    Per-user cache directory of the application.
+
+    %LOCALAPPDATA%\\<app_name> on Windows, $XDG_CACHE_HOME/<app_name> elsewhere.
+    """
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, app_name)
+
+
+class JsonCache:
+    """A single JSON document on disk, written atomically"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """
+        :return: cached data, or None if missing or unreadable
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, data):
+        """
+        :return: whether the data was written
+        """
+        tmp_path = self.path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, self.path)
+        except OSError as err:
+            logger.warning(f'Cannot write cache {self.path}: {err}')
+            return False
+        return True
@@ -0,0 +1,220 @@
+import hashlib
+import logging
+import os
+import random
+import threading
+
+from pjip.core.cache import JsonCache
+
+logger = logging.getLogger(__name__)
+
+
+def select_release_asset(release, suffixes):
+    """
+    :param release: release metadata of the GitHub API
+    :param suffixes: accepted file name endings, in order of preference
+    :return: asset dictionary, or None if the release has no matching asset
+    """
+    assets = release.get("assets") or []
+    for suffix in suffixes:
+        for asset in assets:
+            if asset.get("name", "").lower().endswith(suffix.lower()):
+                return asset
+    return None
+
+
+def parse_sha256_digest(digest):
+    """
+    :param digest: asset digest of the GitHub API, e.g. "sha256:<hex>"
+    :return: lower-case hex digest, or None if it is not a SHA-256 digest
+    """
+    if not digest:
+        return None
+    algorithm, _, value = digest.partition(":")
+    if algorithm.lower() != "sha256" or len(value) != 64:
+        return None
+    return value.lower()
+
+
+class ReleaseDownloader:
+    """
+    Streaming, resumable download of release assets.
+
+    Data is written to <name>.part in chunks. After an interruption the
+    download resumes with an HTTP Range request from the bytes already on
+    disk, and the finished file is checked against its SHA-256 digest before
+    it is renamed into place.
+
+    <name>.part.json records the url, size and validator (ETag or
+    Last-Modified) of the asset the part file belongs to. A part file of
+    another asset, e.g. an older release of the same name, is discarded,
+    and If-Range makes the server send the whole file if it changed.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, download_dir, timeout=(3, 15), retries=3, backoff=1, max_backoff=16, user_agent=None):
+        """
+        :param download_dir: directory the assets are stored in
+        :param timeout: (connect timeout, read timeout) in seconds
+        :param retries: resumes after the first attempt
+        :param backoff: base delay of the exponential backoff (second)
+        :param max_backoff: upper bound of a single backoff delay (second)
+        :param user_agent: User-Agent header sent with every request
+        """
+        self.download_dir = download_dir
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.user_agent = user_agent
+        self.session = None
+
+    def download(self, url, file_name, sha256=None, size=None, progress_callback=None, cancel_event=None):
+        """
+        :param url: asset url
+        :param file_name: name of the file in download_dir
+        :param sha256: expected hex digest, the file is not verified if None
+        :param size: expected size in bytes, if known, else the Content-Length is required without sha256
+        :param progress_callback: callable(done_bytes, total_bytes or None)
+        :param cancel_event: threading.Event that aborts the download when set
+        :return: path of the downloaded file
+        :raise RuntimeError: download failed, was cancelled or did not match the digest
+        """
+        import requests
+
+        cancel_event = cancel_event or threading.Event()
+        path = os.path.join(self.download_dir, os.path.basename(file_name))
+        part_path = path + ".part"
+        part_info = JsonCache(part_path + ".json")
+        os.makedirs(self.download_dir, exist_ok=True)
+
+        if sha256 and os.path.exists(path) and self.file_sha256(path) == sha256:
+            return path
+
+        self.discard_stale_part(part_path, part_info, url, size)
+
+        attempt = 0
+        while True:
+            try:
+                total = self.fetch(url, part_path, part_info, size, progress_callback, cancel_event)
+                expected = size if size is not None else total
+                if expected is None:
+                    if sha256:
+                        break
+                    # A truncated body could not be told from a complete one
+                    self.remove_part(part_path, part_info)
+                    raise RuntimeError("Download size unknown and no digest to verify the file")
+                if os.path.getsize(part_path) >= expected:
+                    break
+                error = RuntimeError("Connection closed before the download completed")
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as err:
+                error = err
+
+            if attempt >= self.retries:
+                raise RuntimeError(f"Download failed: {error}")
+
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            logger.info(f'Download interrupted, resume in {delay:.2f}s')
+            if cancel_event.wait(delay):
+                raise RuntimeError("Download cancelled")
+            attempt += 1
+
+        if sha256 and self.file_sha256(part_path) != sha256:
+            self.remove_part(part_path, part_info)
+            raise RuntimeError("Downloaded file does not match its SHA-256 digest")
+
+        os.replace(part_path, path)
+        self.remove_part(part_path, part_info)
+        return path
+
+    def discard_stale_part(self, part_path, part_info, url, size):
+        """Remove a part file that was not written for url and size"""
+        if not os.path.exists(part_path):
+            return
+        stored = part_info.load()
+        if stored and stored.get("url") == url and stored.get("size") == size:
+            return
+        logger.info(f'Discarding {part_path}, it belongs to another download')
+        self.remove_part(part_path, part_info)
+
+    @staticmethod
+    def remove_part(part_path, part_info):
+        for file_path in (part_path, part_info.path):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    def fetch(self, url, part_path, part_info, size, progress_callback, cancel_event):
+        """
+        :return: full size of the file announced by the server, None when unknown
+        """
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if size is not None and offset > size:
+            offset = 0
+
+        headers = {"Accept": "application/octet-stream"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            stored = part_info.load() or {}
+            etag = stored.get("etag")
+            # If-Range only accepts a strong ETag
+            validator = etag if etag and not etag.startswith("W/") else stored.get("last_modified")
+            if validator:
+                # A changed file is sent whole (200) instead of the range
+                headers["If-Range"] = validator
+
+        with self.get_session().get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416 and size is not None and offset == size:
+                # Everything is on disk already
+                return size
+            if response.status_code == 206 and offset:
+                mode = "ab"
+            elif response.status_code == 200:
+                # The server ignored the range or the file changed, start over
+                offset, mode = 0, "wb"
+                part_info.save({
+                    "url": url,
+                    "size": size,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                })
+            else:
+                raise RuntimeError(f"Download failed with HTTP {response.status_code}")
+
+            length = response.headers.get("Content-Length")
+            total = offset + int(length) if length is not None else size
+            done = offset
+
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(self.CHUNK_SIZE):
+                    if cancel_event.is_set():
+                        raise RuntimeError("Download cancelled")
+                    f.write(chunk)
+                    done += len(chunk)
+                    if progress_callback:
+                        progress_callback(done, total)
+
+        return total
+
+    def file_sha256(self, path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get_session(self):
+        if self.session is None:
+            import requests
+
+            self.session = requests.Session()
+            if self.user_agent:
+                self.session.headers["User-Agent"] = self.user_agent
+        return self.session
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
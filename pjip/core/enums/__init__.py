@@ -1 +1,2 @@
-from .status import PJIPGeneralStatus, SuspendState, UpdateState, PidStatus
\ No newline at end of file
+from .status import PJIPGeneralStatus, SuspendState, UpdateState, PidStatus, ProcessEventKind, TaskPriority, \
+    TaskState
@@ -1,4 +1,4 @@
-from enum import Enum, auto
+from enum import Enum, IntEnum, auto
 
 
 class PJIPGeneralStatus(Enum):
@@ -19,6 +19,9 @@ class UpdateState(Enum):
     IS_LATEST = 2
     NOT_FOUND = 3
     ERROR = 4
+    DOWNLOADING = 5
+    DOWNLOADED = 6
+    DOWNLOAD_FAILED = 7
 
 
 class PidStatus(Enum):
@@ -31,3 +34,23 @@ class PidStatus(Enum):
     ZOMBIE = auto()
     STOPPED = auto()
     UNKNOWN = auto()
+
+
+class ProcessEventKind(Enum):
+    STARTED = auto()
+    EXITED = auto()
+
+
+class TaskPriority(IntEnum):
+    """Dispatcher lanes, a higher lane is always served first"""
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+
+class TaskState(Enum):
+    QUEUED = auto()
+    RUNNING = auto()
+    FINISHED = auto()
+    CANCELLED = auto()
+    REJECTED = auto()
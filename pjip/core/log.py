@@ -0,0 +1,129 @@
+import collections
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LOGGER_NAME = "pjip"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(threadName)s %(name)s: %(message)s"
+
+_ring_buffer = None
+_service = None
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keep the latest records in memory for the log viewer.
+
+    deque.append() with a maxlen is atomic, so emitting takes no lock and
+    never blocks the GUI or polling threads.
+    """
+
+    def __init__(self, capacity=2000, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = collections.deque(maxlen=capacity)
+        self._sequence = itertools.count(1)
+
+    def handle(self, record):
+        # logging.Handler.handle() would serialise emitters on the handler lock
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        self.records.append((next(self._sequence), record))
+
+    def records_since(self, sequence=0):
+        """
+        :param sequence: sequence number of the last record already seen
+        :return: list of (sequence, LogRecord) newer than sequence
+        """
+        return [item for item in self.records.copy() if item[0] > sequence]
+
+
+class LogService:
+    """
+    Logging of the whole application.
+
+    Records of the "pjip" logger go to an in-memory ring buffer and, through
+    a queue drained by a background thread, to a rotating log file and the
+    console. Callers never wait for disk or console I/O.
+    """
+
+    def __init__(self, log_dir=None, level=logging.INFO, capacity=2000):
+        """
+        :param log_dir: directory of pjip.log, None disables file output
+        :param level: level of the "pjip" logger
+        :param capacity: number of records kept in memory
+        """
+        self.log_dir = log_dir
+        self.level = level
+        self.ring_buffer = RingBufferHandler(capacity)
+        self.queue = queue.SimpleQueue()
+        self.listener = None
+
+    def start(self):
+        global _ring_buffer, _service
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = []
+
+        if self.log_dir:
+            try:
+                os.makedirs(self.log_dir, exist_ok=True)
+                file_handler = logging.handlers.RotatingFileHandler(
+                    os.path.join(self.log_dir, "pjip.log"), maxBytes=1024 * 1024, backupCount=3, encoding="utf-8"
+                )
+                file_handler.setFormatter(formatter)
+                handlers.append(file_handler)
+            except OSError as err:
+                if sys.stderr is not None:
+                    sys.stderr.write(f"Cannot open log file: {err}\n")
+
+        # No console under the frozen pythonw build
+        if sys.stderr is not None:
+            console_handler = logging.StreamHandler(sys.stderr)
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
+
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.setLevel(self.level)
+        logger.propagate = False
+        logger.addHandler(self.ring_buffer)
+        logger.addHandler(logging.handlers.QueueHandler(self.queue))
+
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+        _ring_buffer = self.ring_buffer
+        _service = self
+
+    def stop(self):
+        """Flush queued records to the file and console"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def set_level(self, level):
+        self.level = level
+        logging.getLogger(LOGGER_NAME).setLevel(level)
+
+
+def get_ring_buffer():
+    """
+    :return: RingBufferHandler of the running LogService, None before it started
+    """
+    return _ring_buffer
+
+
+def set_log_level(level):
+    """
+    Set the level of the running LogService, a no-op before it started.
+
+    :param level: logging level
+    """
+    if _service is not None:
+        _service.set_level(level)
@@ -1,60 +1,129 @@
-import ctypes
-import ctypes.wintypes as wintypes
+import logging
 import os
-import platform
-import re
-import subprocess
 import sys
 import time
-import winreg
 
 import psutil
-import pywintypes
-import requests
-import win32api
-import win32com.client
-import win32con
-# noinspection PyPackageRequirements
-import win32gui
-import win32gui_struct
-import win32process
-from packaging import version
 
+# requests and packaging are imported where they are used: update checks are
+# not needed before the first window is shown. Platform specific operations,
+# pywin32 included, go through pjip.core.backends
+
+from pjip.core.backends import create_platform_backends, REG_BINARY
+from pjip.core.cache import JsonCache, get_cache_dir
+from pjip.core.download import ReleaseDownloader, parse_sha256_digest, select_release_asset
 from pjip.core.enums import UpdateState
 from pjip.core.enums import PidStatus
+from pjip.core.process_events import create_process_event_source
+from pjip.core.snapshot import ProcessSnapshotService
+from pjip.core.startup import run_probe, probe_result
+from pjip.core.startup_profile import phase
+from pjip.core.system_info import SystemInfoCollector
+from pjip.core.task import chain
+from pjip.core.update import UpdateChecker
+from pjip.core.waiters import wait_for_process, wait_for_window
+
+logger = logging.getLogger(__name__)
 
 
 class PJIPLogic:
-    def __init__(self, config):
+    def __init__(self, config, backends=None, elevate=True, startup=None, collect_system_info=True):
+        """
+        :param config: build config module
+        :param backends: PlatformBackends, None uses the Windows backends and exits on other systems
+        :param elevate: relaunch as admin and exit when not running as admin
+        :param startup: StartupOrchestrator running the probes after the admin check, None runs them on first use
+        :param collect_system_info: start collecting hotfixes now, else only when get_system_info() is called
+        """
+        self.backends = backends
+        self.elevate = elevate
+        self.startup = startup
+        self.collect_system_info = collect_system_info
         self.authority_admin = None
-        self.system_info = None
-        self.studentmain_directory = None
-        self.studentmain_path = None
+        self.system_info_probe = None
+        self.studentmain_probe = None
         self.config = config
-
-        self.nt_terminate_process = None
+        self.cache_dir = get_cache_dir(config.PROJECT_NAME_ABBREVIATION)
+
+        self.process_snapshot = ProcessSnapshotService(config.PROCESS_SNAPSHOT_MAX_STALENESS)
+        self.process_events = create_process_event_source(self.process_snapshot)
+        self.update_checker = UpdateChecker(
+            config.UPDATE_URLS,
+            JsonCache(os.path.join(self.cache_dir, "latest_release.json")),
+            user_agent=f"{config.PROJECT_NAME_ABBREVIATION}/{config.VERSION}"
+        )
+        self.release_downloader = ReleaseDownloader(
+            os.path.join(self.cache_dir, "downloads"),
+            user_agent=f"{config.PROJECT_NAME_ABBREVIATION}/{config.VERSION}"
+        )
 
         self.preparation()
 
     def preparation(self):
-        self.check_operate_system()
-        self.authority_admin = self.is_admin()
-        if not self.authority_admin:
-            if self.privilege_escalation():
-                time.sleep(3)
-                sys.exit()
-            else:
-                print("Run without admin")
+        with phase("backends"):
+            if self.backends is None:
+                self.check_operate_system()
+                self.backends = create_platform_backends()
+
+        with phase("admin_check"):
+            self.authority_admin = self.is_admin()
+        if self.authority_admin:
+            logger.info('Run as admin')
+        elif self.elevate and self.privilege_escalation():
+            time.sleep(3)
+            sys.exit()
         else:
-            print('Run as admin')
+            logger.info("Run without admin")
+
+        if self.collect_system_info:
+            with phase("system_info"):
+                self.system_info_probe = run_probe(self.startup, "system_info", self.start_system_info_collector)
+
+        if self.startup is not None:
+            with phase("registry_read"):
+                self.studentmain_probe = run_probe(self.startup, "studentmain_location",
+                                                   self.read_studentmain_location)
+
+    def start_system_info_collector(self):
+        collector = SystemInfoCollector(
+            self.get_base_system_info(),
+            JsonCache(os.path.join(self.cache_dir, "system_info.json")),
+            self.get_hotfixes_winapi,
+            self.get_hotfix_history_count
+        )
+        collector.start()
+        return collector
 
-        self.system_info = self.get_system_info()
+    def read_studentmain_location(self):
+        """
+        :return: (install directory, studentmain.exe path), both None when not installed
+        """
         key_path = r"SOFTWARE\TopDomain\e-Learning Class Standard\1.00"
         value_name = "TargetDirectory"
-        self.studentmain_directory = self.read_registry_value(key_path, value_name)
-        self.studentmain_path = os.path.join(self.studentmain_directory, "studentmain.exe")
-
-        self.nt_terminate_process = NativeTerminator()
+        directory = self.read_registry_value(key_path, value_name)
+        if not directory:
+            return None, None
+        return directory, os.path.join(directory, "studentmain.exe")
+
+    @property
+    def system_info_collector(self):
+        if self.system_info_probe is None:
+            self.system_info_probe = run_probe(None, "system_info", self.start_system_info_collector)
+        return probe_result(self.system_info_probe, "system_info")
+
+    @property
+    def studentmain_location(self):
+        if self.studentmain_probe is None:
+            self.studentmain_probe = run_probe(None, "studentmain_location", self.read_studentmain_location)
+        return probe_result(self.studentmain_probe, "studentmain_location")
+
+    @property
+    def studentmain_directory(self):
+        return self.studentmain_location[0]
+
+    @property
+    def studentmain_path(self):
+        return self.studentmain_location[1]
 
     @staticmethod
     def check_operate_system():
@@ -62,28 +131,42 @@ class PJIPLogic:
         if os.name != 'nt':
             sys.exit('UNSUPPORTED SYSTEMS')
 
-    @staticmethod
-    def is_admin():
+    def is_admin(self):
         """Checking whether programme has administrator privilege"""
+        return self.backends.elevation.is_admin()
 
-        authority = ctypes.windll.shell32.IsUserAnAdmin()
-        return bool(authority)
-
-    @staticmethod
-    def privilege_escalation():
+    def privilege_escalation(self):
         """
         Try to rerun script as admin
-        Uses ShellExecuteW with "runas"
         :return: True if elevation succeeded, False otherwise
         """
-        result = ctypes.windll.shell32.ShellExecuteW(
-            None, 'runas', sys.executable, ' '.join(sys.argv), None, 1
-        )
-        return result > 32
+        return self.backends.elevation.elevate()
+
+    @property
+    def system_info(self):
+        """
+        System information, see get_system_info().
+
+        Hotfixes are None until the background collection publishes them,
+        without a collection only the base information is returned.
+        """
+        if self.system_info_probe is None:
+            return self.get_base_system_info()
+        return self.system_info_collector.info
 
-    def get_system_info(self):
+    def get_system_info(self, timeout=None):
         """
-        Collect system information in a dictionary.
+        System information including hotfixes, waiting for the background collection.
+
+        :param timeout: seconds to wait for hotfixes, None waits until they are collected
+        :return: dictionary with system details
+        """
+        self.system_info_collector.wait(timeout)
+        return self.system_info
+
+    def get_base_system_info(self):
+        """
+        Collect the system information that is cheap to read in a dictionary.
 
         system: OS name (Windows)
         release: OS release
@@ -94,51 +177,26 @@ class PJIPLogic:
         platform: platform ID
         service_pack: installed service pack
         architecture: system architecture (64bit, 32bit)
-        hotfixes: list of installed hotfixes
         :return: dictionary with system details
         """
+        return self.backends.system.base_info()
 
-        win_ver = sys.getwindowsversion()
-        system_info = {
-            "system": platform.system(),  # Windows
-            "release": platform.release(),  # Major (e.g. 10, 11)
-            "version": platform.version(),  # build version
-            "major": win_ver.major,  # major version
-            "minor": win_ver.minor,  # minor version
-            "build": win_ver.build,  # build version
-            "platform": win_ver.platform,  # platform ID
-            "service_pack": win_ver.service_pack,
-            "architecture": platform.architecture(),  # (64bit, 32bit)
-            "hotfixes": self.get_hotfixes_winapi()
-        }
-        return system_info
-
-    @staticmethod
-    def get_hotfixes_winapi():
+    def get_hotfixes_winapi(self):
         """
         Retrieve installed Windows hotfixes using the Update API.
 
-        Searches update history, extracts KB identifiers, install dates, and result codes.
         :return: list of dictionaries with hotfix details
         """
-        update_session = win32com.client.Dispatch("Microsoft.Update.Session")
-        update_searcher = update_session.CreateUpdateSearcher()
-        history_count = update_searcher.GetTotalHistoryCount()
-        history = update_searcher.QueryHistory(0, history_count)
+        return self.backends.system.hotfixes()
 
-        hotfixes = []
-        for entry in history:
-            match = re.search(r"(KB\d+)", entry.Title)
-            if match:
-                hotfixes.append({
-                    "kb": match.group(1),
-                    "date": entry.Date,
-                    "result": entry.ResultCode
-                })
-        return hotfixes
+    def get_hotfix_history_count(self):
+        """Number of entries in the Windows Update history, cheap compared to querying it"""
+        return self.backends.system.hotfix_history_count()
 
     @staticmethod
     def get_hotfixes_powershell():
+        import subprocess
+
         cmd = 'powershell "Get-HotFix | Select-Object -Property HotFixID, InstalledOn"'
         output = subprocess.check_output(cmd, shell=True).decode(errors="ignore")
         hotfixes = []
@@ -159,55 +217,14 @@ class PJIPLogic:
             return None
         return result[0]
 
-    @staticmethod
-    def read_registry(key_path, value_name):
+    def read_registry(self, key_path, value_name):
         """
         Read a registry value from HKEY_LOCAL_MACHINE.
 
         Tries both 32-bit and 64-bit views.
-        :return: value if found, otherwise None
+        :return: (value, value type) if found, otherwise None
         """
-        access_flags = [
-            winreg.KEY_READ | winreg.KEY_WOW64_32KEY,
-            winreg.KEY_READ | winreg.KEY_WOW64_64KEY,
-        ]
-
-        for flags in access_flags:
-            try:
-                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path, 0, flags) as key:
-                    value, reg_type = winreg.QueryValueEx(key, value_name)
-                    return value, reg_type
-            except FileNotFoundError:
-                continue
-            except OSError:
-                continue
-
-        return None
-
-    # WILL BE REMOVED IN THE NEXT VERSION
-    @staticmethod
-    def read_registry_value_old(key_path, value_name):
-        """
-        Read a registry value from HKEY_LOCAL_MACHINE.
-
-        Tries both 32-bit and 64-bit views.
-        :return: value if found, otherwise None
-        """
-        try:
-            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path, 0,
-                                winreg.KEY_READ | winreg.KEY_WOW64_32KEY) as key:
-                return winreg.QueryValueEx(key, value_name)[0]
-        except FileNotFoundError:
-            pass
-
-        try:
-            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path, 0,
-                                winreg.KEY_READ | winreg.KEY_WOW64_64KEY) as key:
-                return winreg.QueryValueEx(key, value_name)[0]
-        except FileNotFoundError:
-            pass
-
-        return None
+        return self.backends.registry.read(key_path, value_name)
 
     def after_ui_launched(self, hwnd):
         pass
@@ -227,12 +244,11 @@ class PJIPLogic:
 
     def set_window_display_affinity(self, hwnd):
         if self.system_info["major"] >= 10 and self.system_info["build"] >= 19041:
-            ctypes.windll.user32.SetWindowDisplayAffinity(int(hwnd), 0x11)
+            self.backends.window.set_display_affinity(hwnd, 0x11)
         else:
-            ctypes.windll.user32.SetWindowDisplayAffinity(int(hwnd), 0)
+            self.backends.window.set_display_affinity(hwnd, 0)
 
-    @staticmethod
-    def get_process_state(process_name='studentmain.exe'):
+    def get_process_state(self, process_name='studentmain.exe'):
         if not process_name.lower().endswith(".exe"):
             process_name += ".exe"
 
@@ -240,35 +256,26 @@ class PJIPLogic:
         #     if proc.info['name'] and proc.info['name'].lower() == process_name.lower():
         #         return True
 
-        process_iter = psutil.process_iter()
-        for proc in process_iter:
-            try:
-                if proc.name().lower() == process_name.lower():
-                    return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-
-        return False
+        return self.process_snapshot.has_name(process_name)
 
-    @staticmethod
-    def set_window_top_most(hwnd):
-        win32gui.SetWindowPos(hwnd, win32con.HWND_TOPMOST,
-                              0, 0, 0, 0,
-                              win32con.SWP_NOMOVE | win32con.SWP_NOSIZE)
+    def set_window_top_most(self, hwnd):
+        self.backends.window.set_top_most(hwnd)
 
     def start_studentmain(self):
-        if os.path.exists(self.studentmain_path):
+        if self.studentmain_path and os.path.exists(self.studentmain_path):
             try:
-                os.startfile(self.studentmain_path)
+                self.backends.process.start_file(self.studentmain_path)
                 return True
             except PermissionError as err:
-                print(f"permission error: {err}")
+                logger.warning(f"permission error: {err}")
             except Exception as err:
-                print(f"error: {err}")
+                logger.error(f"error: {err}")
         return False
 
     @staticmethod
     def taskkill(process_name):
+        import subprocess
+
         state = subprocess.run(['TASKKILL', '-F', '-IM', process_name, '-T']).returncode
 
         if state == 0:
@@ -284,8 +291,7 @@ class PJIPLogic:
         else:
             return False
 
-    @staticmethod
-    def get_pid_from_process_name(process_name):
+    def get_pid_from_process_name(self, process_name):
         """
         Get the PID(s) of a process by name.
         Returns a tuple of PIDs, or None if not found.
@@ -293,20 +299,14 @@ class PJIPLogic:
         if not process_name.lower().endswith(".exe"):
             process_name += ".exe"
 
-        target = process_name.lower()
-        pid_list = []
-
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                if proc.info['name'] and proc.info['name'].lower() == target:
-                    pid_list.append(proc.info['pid'])
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-
-        return tuple(pid_list) or None
+        return self.process_snapshot.pids_by_name(process_name) or None
 
     @staticmethod
     def get_pid_by_name(process_name):
+        import pywintypes
+        import win32api
+        import win32process
+
         pids = win32process.EnumProcesses()
         for pid in pids:
             try:
@@ -317,34 +317,36 @@ class PJIPLogic:
                     return pid
             except pywintypes.error as err:  # type: ignore
                 # Insufficient permissions, permission denied or the process has exited
-                print(f"pywintypes.error for PID {pid}: {err}")
+                logger.debug(f"pywintypes.error for PID {pid}: {err}")
                 continue
             except OSError as err:
-                print(f"OSError for PID {pid}: {err}")
+                logger.debug(f"OSError for PID {pid}: {err}")
                 continue
             except Exception as err:
-                print(f"Unexpected error for PID {pid}: {err}")
+                logger.debug(f"Unexpected error for PID {pid}: {err}")
                 continue
             return None
 
-    @staticmethod
-    def get_pids_by_path(target_path):
+    def get_pids_by_path(self, target_path):
         """
         Return all PIDs whose executable path matches target_path.
         Returns a tuple of PIDs, or None if no match.
         """
-        target_path = os.path.abspath(target_path).lower()
-        pid_list = []
+        return self.process_snapshot.pids_by_path(target_path) or None
 
-        for proc in psutil.process_iter(['pid', 'exe']):
-            try:
-                exe_path = proc.info['exe']
-                if exe_path and exe_path.lower() == target_path:
-                    pid_list.append(proc.info['pid'])
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+    def get_studentmain_pids(self):
+        """
+        PIDs of studentmain, matched by its installed path so that another
+        process of the same name is not taken for it. The name alone is only
+        used when the path is unknown.
 
-        return tuple(pid_list) or None
+        :return: tuple of PIDs, or None if not found
+        """
+        if not self.studentmain_path:
+            return self.get_pid_from_process_name(self.config.E_CLASSROOM_PROGRAM_NAME)
+
+        # A candidate whose path cannot be read may be the real one, one running from elsewhere is not
+        return self.process_snapshot.pids_by_path(self.studentmain_path, accept_unreadable=True) or None
 
     @staticmethod
     def pid_exists(pid: int) -> PidStatus:
@@ -370,152 +372,88 @@ class PJIPLogic:
         except OverflowError:
             return PidStatus.ERROR
 
-    @staticmethod
-    def terminate_process(pid: int, exit_code = 1):
-        h_process = None
-        try:
-            # noinspection PyUnresolvedReferences
-            h_process = win32api.OpenProcess(win32con.PROCESS_TERMINATE, False, pid)
-        except pywintypes.error as err: # type: ignore
-            print(err)
-        except Exception as err:
-            print(err)
-
-        print(f'Value of h_process: {h_process}')
-        if not h_process:
-            # noinspection PyUnresolvedReferences
-            print(f"OpenProcess failed, error={win32api.GetLastError()}")
-
-            # noinspection PyUnresolvedReferences
-            raise RuntimeError(f"OpenProcess failed, error={win32api.GetLastError()}")
-        else:
-            # noinspection PyUnresolvedReferences
-            win32api.TerminateProcess(h_process, exit_code)
-
-        # h_process = win32api.OpenProcess(win32con.PROCESS_TERMINATE | win32con.SYNCHRONIZE, False, pid)
-        # if not h_process:
-        #     raise Exception(f"OpenProcess failed, error={win32api.GetLastError()}")
-        #
-        # success = win32api.TerminateProcess(h_process, 1)
-        # if not success:
-        #     raise Exception(f"TerminateProcess failed, error={win32api.GetLastError()}")
-        #
-        # result = win32event.WaitForSingleObject(h_process, 5000)
-        # if result == win32event.WAIT_OBJECT_0:
-        #     exit_code = win32process.GetExitCodeProcess(h_process)
-        #     print(f"Process terminated with exit code {exit_code}")
-        # else:
-        #     print("Timeout waiting for process to terminate")
-
-    # # load kernel32.dll
-    # kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-    #
-    # # Define Function Prototype
-    # TerminateThread = kernel32.TerminateThread
-    # TerminateThread.argtypes = [wintypes.HANDLE, wintypes.DWORD]
-    # TerminateThread.restype = wintypes.BOOL
-    #
-    # TerminateProcess = kernel32.TerminateProcess
-    # TerminateProcess.argtypes = [wintypes.HANDLE, wintypes.UINT]
-    # TerminateProcess.restype = wintypes.BOOL
-    #
-    # PROCESS_TERMINATE = 0x0001
-    # OpenProcess = kernel32.OpenProcess
-    # OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
-    # OpenProcess.restype = wintypes.HANDLE
-    #
-    # pid = 1234
-    # hProcess = OpenProcess(PROCESS_TERMINATE, False, pid)
-    #
-    # if hProcess:
-    #     result = TerminateProcess(hProcess, 1)  # return code 1
-    #     print("TerminateProcess result:", result)
-    # else:
-    #     print("Failed to open process")
+    def terminate_process(self, pid: int, exit_code = 1):
+        """
+        :raise RuntimeError: the process cannot be opened or terminated
+        """
+        self.backends.process.terminate(pid, exit_code)
 
     def nt_terminate_process(self, pid: int):
         try:
-            self.nt_terminate_process.terminate(pid)
+            self.backends.process.native_terminate(pid)
         except RuntimeError as err:
-            print(err)
+            logger.error(err)
             return False
         else:
             return True
 
-    @staticmethod
-    def is_suspended(pid: int):
+    def is_suspended(self, pid: int):
         """
         whether the certain programme is suspended
         :param pid: pid of programme
         :return: whether the certain programme is suspended
         """
-        try:
-            p = psutil.Process(pid)
-            return p.status() == psutil.STATUS_STOPPED
-        except psutil.NoSuchProcess:
-            return False
+        return self.backends.process.is_suspended(pid)
 
-    @staticmethod
-    def suspend_process(pid: int):
+    def suspend_process(self, pid: int):
         try:
-            p = psutil.Process(pid)
-            p.suspend()
+            self.backends.process.suspend(pid)
             return True
         except psutil.NoSuchProcess:
-            print("Process not found")
+            logger.info("Process not found")
             return False
         except PermissionError:
-            print('Permission Error in suspending')
+            logger.warning('Permission Error in suspending')
             return False
 
-    @staticmethod
-    def resume_process(pid: int):
+    def resume_process(self, pid: int):
         try:
-            p = psutil.Process(pid)
-            p.resume()
+            self.backends.process.resume(pid)
             return True
         except psutil.NoSuchProcess:
-            print("Process not found")
+            logger.info("Process not found")
             return False
         except PermissionError:
-            print('Permission Error in resuming')
+            logger.warning('Permission Error in resuming')
             return False
 
     def get_current_version(self) -> str:
         """get current version in config"""
         return self.config.VERSION
 
-    def get_latest_version(self):
-        response = requests.get(self.config.UPDATE_URL, timeout=(2, 4)) # connect timeout, read timeout
-
-        if response.status_code == 200:
-            data = response.json()
-            tag = data.get("tag_name")  # Avoiding KeyError
-            if tag:
-                return tag.lstrip("v")
-            else:
-                return None
+    def get_latest_version(self, force=False):
+        """
+        :param force: revalidate the cached release with the server even if it is recent
+        """
+        data = self.update_checker.get_release(force)
 
+        tag = data.get("tag_name")  # Avoiding KeyError
+        if tag:
+            return tag.lstrip("v")
         else:
-            raise RuntimeError("Unable to obtain the latest version information")
+            return None
 
-    def check_update(self):
+    def check_update(self, force=False):
         """
         whether the latest version
 
+        :param force: revalidate the cached release with the server even if it is recent
         :return: Latest version string if update is available, else None.
         """
+        import requests
+        from packaging import version
+
         current_version = self.get_current_version()
         try:
-            latest_version = self.get_latest_version()
+            latest_version = self.get_latest_version(force)
         except RuntimeError as err:
-            print(f'Runtime error: {err}')
+            logger.error(f'Runtime error: {err}')
             return UpdateState.ERROR, str(err)
         except requests.exceptions.SSLError:
-            print('requests.exceptions.SSLError')
+            logger.error('requests.exceptions.SSLError')
             return UpdateState.ERROR, 'requests.exceptions.SSLError'
         except Exception as err:
-            print(f'An error occurred: {err}')
+            logger.error(f'An error occurred: {err}')
             return UpdateState.ERROR, str(err)
 
         if not latest_version:
@@ -524,114 +462,113 @@ class PJIPLogic:
         current = version.parse(current_version)
         latest = version.parse(latest_version)
 
-        print(f'latest version: {latest_version}')
+        logger.info(f'latest version: {latest_version}')
 
         if latest > current:
             return UpdateState.FIND_LATEST, latest_version
         else:
             return UpdateState.IS_LATEST, current_version
 
-    def top_taskmgr(self):
-        taskmgr_name_chs = {
-            "class_name": "TaskManagerWindow",
-            "window_name": "任务管理器",
-        }
-        taskmgr_name_list = [taskmgr_name_chs]
+    def download_update(self, progress_callback=None, cancel_event=None):
+        """
+        Download the asset of the latest release into the cache directory.
+
+        :param progress_callback: callable(done_bytes, total_bytes or None)
+        :param cancel_event: threading.Event that aborts the download when set
+        :return: path of the verified file
+        :raise RuntimeError: no asset, download failed or digest mismatch
+        """
+        release = self.update_checker.get_release()
+        asset = select_release_asset(release, self.config.UPDATE_ASSET_SUFFIXES)
+        if asset is None:
+            raise RuntimeError("The latest release has no downloadable asset")
+
+        sha256 = parse_sha256_digest(asset.get("digest"))
+        if sha256 is None:
+            logger.warning(f'No SHA-256 digest for {asset.get("name")}, the download is not verified')
+
+        return self.release_downloader.download(
+            asset["browser_download_url"],
+            asset["name"],
+            sha256=sha256,
+            size=asset.get("size"),
+            progress_callback=progress_callback,
+            cancel_event=cancel_event
+        )
 
-        hwnd = None
+    TASKMGR_WINDOWS = (
+        {"class_name": "TaskManagerWindow", "window_name": "任务管理器"},
+    )
 
-        for taskmgr_name in taskmgr_name_list:
+    def find_taskmgr_window(self):
+        """
+        :return: window handle of the task manager
+        :raise RuntimeError: the window was not found
+        """
+        for taskmgr_name in self.TASKMGR_WINDOWS:
             try:
                 hwnd = self.find_window(taskmgr_name.get("class_name"),
                                         taskmgr_name.get("window_name")
                                         )
-                if hwnd: break
+                if hwnd:
+                    return hwnd
             except RuntimeError:
                 continue
 
-        if hwnd is None:
-            raise ValueError('taskmgr not start')
+        raise RuntimeError('taskmgr window not found')
 
-        if self.system_info.get("major") == 10:
+    def top_taskmgr(self, hwnd=None):
+        """
+        :param hwnd: window handle of the task manager, None looks it up
+        """
+        if hwnd is None:
             try:
-                hm = win32gui.GetMenu(hwnd)
-                mii, _ = win32gui_struct.EmptyMENUITEMINFO()
-                win32gui.GetMenuItemInfo(hm, 0x7704, False, mii)
-                if list(win32gui_struct.UnpackMENUITEMINFO(mii))[1] == 0:
-                    win32gui.PostMessage(hwnd, win32con.WM_COMMAND, 0x7704, 0)
-            except PermissionError as err:
-                print('An error occurred:', err)
-            except pywintypes.error as err:  # type: ignore
-                print('An error occurred:', err)
-                self.set_window_top_most(hwnd)
+                hwnd = self.find_taskmgr_window()
+            except RuntimeError:
+                raise ValueError('taskmgr not start')
 
-        else:
-            self.set_window_top_most(hwnd)
+        # The Windows 10 task manager resets HWND_TOPMOST, switch on its own "Always on top" instead
+        self.backends.window.set_taskmgr_top_most(hwnd, use_menu=self.system_info.get("major") == 10)
 
-    @staticmethod
-    def find_window(class_name=None, window_name=None):
-        if not class_name and not window_name:
-            raise ValueError("Must provide class_name or window_name")
-        hwnd = win32gui.FindWindow(class_name, window_name)
-        if hwnd == 0:
-            raise RuntimeError("Window not found")
-        return hwnd
+    def wait_for_process(self, target, timeout=None):
+        """
+        :param target: process name or executable path
+        :param timeout: seconds to wait, None waits until cancelled
+        :return: TaskHandle of the PID, fails with TimeoutError
+        """
+        if not os.path.dirname(target) and not target.lower().endswith(".exe"):
+            target += ".exe"
+        return wait_for_process(self.process_events, self.process_snapshot, target, timeout)
 
-    @staticmethod
-    def start_file(file_name):
-        os.startfile(file_name)
+    def wait_for_window(self, class_name=None, window_name=None, timeout=None):
+        """
+        :return: TaskHandle of the window handle, fails with TimeoutError
+        """
+        return wait_for_window(lambda: self.find_window(class_name, window_name), timeout)
 
-    @staticmethod
-    def clean_ifeo_debuggers():
-        success_flag = True
-        base_path = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion\Image File Execution Options"
+    def wait_for_taskmgr(self, timeout=None):
+        """
+        Wait for the task manager process, then for its window.
 
-        try:
-            base_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, base_path, 0, winreg.KEY_ALL_ACCESS)
-        except PermissionError:
-            print("Permission denied")
-            return
-        except Exception as err:
-            print(f"Cannot open IFEO key: {err}")
-            return
+        :param timeout: seconds to wait for both, None waits until cancelled
+        :return: TaskHandle of the window handle, fails with TimeoutError
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
 
-        try:
-            index = 0
-            while True:
-                try:
-                    subkey_name = winreg.EnumKey(base_key, index)
-                    index += 1
-                except OSError:
-                    break  # No subkey
-
-                subkey_path = base_path + "\\" + subkey_name
-
-                try:
-                    subkey = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, subkey_path, 0, winreg.KEY_ALL_ACCESS)
-                except PermissionError:
-                    continue
-                except FileNotFoundError:
-                    continue
-
-                try:
-                    winreg.QueryValueEx(subkey, "debugger")
-                except FileNotFoundError:
-                    winreg.CloseKey(subkey)
-                    continue
-                else:
-                    # Find debugger, delete subkey
-                    winreg.CloseKey(subkey)
-                    try:
-                        winreg.DeleteKey(winreg.HKEY_LOCAL_MACHINE, subkey_path)
-                        print(f"{subkey_name} has been deleted")
-                    except Exception as err:
-                        success_flag = False
-                        print(f"{subkey_name} cannot be deleted: {err}")
+        def wait_window(pid):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            return wait_for_window(self.find_taskmgr_window, remaining)
 
-        finally:
-            winreg.CloseKey(base_key)
+        return chain(self.wait_for_process("taskmgr.exe", timeout), wait_window)
 
-        return success_flag
+    def find_window(self, class_name=None, window_name=None):
+        return self.backends.window.find_window(class_name, window_name)
+
+    def start_file(self, file_name):
+        self.backends.process.start_file(file_name)
+
+    def clean_ifeo_debuggers(self):
+        return self.backends.registry.clean_ifeo_debuggers()
 
     @staticmethod
     def decrypt_knock_value(data: bytes):
@@ -656,7 +593,7 @@ class PJIPLogic:
             return self.extract_utf16_segment(buf)
         except UnicodeDecodeError:
             # Return to the compatibility logic of Cpp
-            print('cpp like extract')
+            logger.debug('cpp like extract')
             pass
 
     @staticmethod
@@ -744,73 +681,24 @@ class PJIPLogic:
             )
 
             if data:
-                print("Read successfully:", len(data[0]), "bytes")
+                logger.debug(f"Read successfully: {len(data[0])} bytes")
 
-                if data[1] == winreg.REG_BINARY:
+                if data[1] == REG_BINARY:
                     buf = self.decrypt_knock_value(data[0])
-                    print("Decrypted buffer:", buf)
+                    # Never the content, the log is written to disk
+                    logger.debug(f"Decrypted buffer: {len(buf)} bytes")
 
                     dec = self.extract_utf16_ascii(buf)
-                    print("Final password:", dec)
+                    logger.debug(f"Password decoded: {len(dec) if dec else 0} characters")
                     return dec
                 else:
-                    print("Incorrect registry value type (expected REG_BINARY)")
+                    logger.warning("Incorrect registry value type (expected REG_BINARY)")
             else:
-                print("Value not found or invalid")
+                logger.warning("Value not found or invalid")
 
         return None
 
 
-class NativeTerminator:
-    PROCESS_TERMINATE = 0x0001
-    NTSTATUS = wintypes.LONG
-
-    def __init__(self):
-        self.ntdll = ctypes.WinDLL("ntdll")
-        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-
-        self.NtTerminateProcess = self.ntdll.NtTerminateProcess
-        self.NtTerminateProcess.argtypes = [wintypes.HANDLE, self.NTSTATUS]
-        self.NtTerminateProcess.restype = self.NTSTATUS
-
-        self.RtlNtStatusToDosError = self.ntdll.RtlNtStatusToDosError
-        self.RtlNtStatusToDosError.argtypes = [self.NTSTATUS]
-        self.RtlNtStatusToDosError.restype = wintypes.DWORD
-
-        self.OpenProcess = self.kernel32.OpenProcess
-        self.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
-        self.OpenProcess.restype = wintypes.HANDLE
-
-        self.CloseHandle = self.kernel32.CloseHandle
-        self.CloseHandle.argtypes = [wintypes.HANDLE]
-        self.CloseHandle.restype = wintypes.BOOL
-
-    @staticmethod
-    def win_error():
-        err = ctypes.get_last_error()
-        msg = ctypes.FormatError(err)
-        return err, msg
-
-    def terminate(self, pid, exit_code = 1):
-        h_process = self.OpenProcess(self.PROCESS_TERMINATE, False, pid)
-        if not h_process:
-            err, msg = self.win_error()
-            raise RuntimeError(f"OpenProcess failed: {err} ({msg})")
-
-        status = self.NtTerminateProcess(h_process, exit_code)
-
-        self.CloseHandle(h_process)
-
-        if status != 0:
-            win32_err = self.RtlNtStatusToDosError(status)
-            raise RuntimeError(
-                f"NtTerminateProcess failed: NTSTATUS=0x{status:08X}, "
-                f"Win32Error={win32_err}"
-            )
-        else:
-            print(f"NTSTATUS = 0x{status:08X}")
-
-        return True
 
 # self.floatwin.setText(
 #     f"窗口标题：{GetWindowText(hwnd)}\n窗口类名：{GetClassName(hwnd)}\n窗口位置：{str(GetWindowRect(hwnd))}\n窗口句柄：{int(hwnd)}\n窗口进程：{procname}")
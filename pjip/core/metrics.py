@@ -0,0 +1,204 @@
+import bisect
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds of the duration buckets (millisecond), the last bucket is unbounded
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Fixed-bucket duration histogram, cheap enough to update on every call"""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """
+        :param q: quantile between 0 and 1
+        :return: upper bound of the bucket holding the quantile, max for the unbounded bucket
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": {("+Inf" if index == len(self.buckets) else str(self.buckets[index])): count
+                        for index, count in enumerate(self.counts)},
+        }
+
+
+class Metric:
+    """Counters and the duration histogram of one adapter, runnable or service task"""
+
+    def __init__(self, name):
+        self.name = name
+        self.clear()
+
+    def clear(self):
+        self.calls = 0
+        self.errors = 0
+        self.signals = 0
+        self.duration = Histogram()
+        self.first_call = None
+        self.last_call = None
+
+    def record_call(self, started, duration_ms, failed):
+        self.calls += 1
+        if failed:
+            self.errors += 1
+        self.duration.observe(duration_ms)
+        if self.first_call is None:
+            self.first_call = started
+        self.last_call = started
+
+    def rate(self, now):
+        """
+        :return: calls per second since the first call
+        """
+        if self.first_call is None or now <= self.first_call:
+            return 0.0
+        return self.calls / (now - self.first_call)
+
+    def to_dict(self, now):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "signals": self.signals,
+            "rate": self.rate(now),
+            "last_call_age": now - self.last_call if self.last_call is not None else None,
+            "duration_ms": self.duration.to_dict(),
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of task metrics.
+
+    Adapters, runnables and services run on different threads, every update
+    takes a single short lock. Durations are measured with perf_counter and
+    stored in milliseconds.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.started = time.perf_counter()
+        self.started_wall = time.time()
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        metric = self.metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.metrics.setdefault(name, Metric(name))
+        return metric
+
+    @contextmanager
+    def timed(self, name):
+        """Measure the block as one call of name, an exception counts as an error"""
+        metric = self.get(name)
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield metric
+            failed = False
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                metric.record_call(started, duration_ms, failed)
+
+    def count_error(self, name):
+        metric = self.get(name)
+        with self._lock:
+            metric.errors += 1
+
+    def count_signal(self, name):
+        metric = self.get(name)
+        with self._lock:
+            metric.signals += 1
+
+    def snapshot(self):
+        """
+        :return: dictionary of all metrics, safe to serialise as JSON
+        """
+        now = time.perf_counter()
+        with self._lock:
+            metrics = {name: metric.to_dict(now) for name, metric in sorted(self.metrics.items())}
+        return {
+            "started_at": self.started_wall,
+            "uptime": now - self.started,
+            "metrics": metrics,
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def reset(self):
+        # Cleared in place, running timed() blocks still hold their Metric
+        with self._lock:
+            for metric in self.metrics.values():
+                metric.clear()
+            self.started = time.perf_counter()
+            self.started_wall = time.time()
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry():
+    """
+    :return: MetricsRegistry shared by the whole application
+    """
+    return _registry
+
+
+def timed_method(method):
+    """
+    Record every call of method under "<class name>.<method name>".
+
+    The class name is that of the instance, so subclasses sharing a method
+    are reported separately.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with get_registry().timed(f'{type(self).__name__}.{method.__name__}'):
+            return method(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,198 @@
+import logging
+import os
+import threading
+from typing import NamedTuple
+
+from pjip.core.enums import ProcessEventKind
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessEvent(NamedTuple):
+    kind: ProcessEventKind
+    pid: int
+    name: str | None
+    create_time: float | None = None
+
+
+class ProcessEventSource:
+    """
+    Base class of the process lifecycle event backends.
+
+    Subscribers are called from the backend thread with a ProcessEvent, so Qt
+    objects should subscribe with a signal's emit to get a queued call.
+    """
+
+    def __init__(self):
+        self._subscribers = ()
+        self._subscribers_lock = threading.Lock()
+
+    def start(self):
+        raise NotImplementedError("Subclasses must implement start()")
+
+    def stop(self):
+        raise NotImplementedError("Subclasses must implement stop()")
+
+    def subscribe(self, callback, process_name=None):
+        """
+        :param callback: callable receiving a ProcessEvent
+        :param process_name: only deliver events of this process (case-insensitive), None for all
+        :return: subscription handle for unsubscribe()
+        """
+        subscription = (callback, process_name.lower() if process_name else None)
+        with self._subscribers_lock:
+            self._subscribers += (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._subscribers_lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscription)
+
+    def publish(self, event: ProcessEvent):
+        lower_name = event.name.lower() if event.name else None
+
+        for callback, process_name in self._subscribers:
+            if process_name is not None and process_name != lower_name:
+                continue
+            try:
+                callback(event)
+            except Exception as err:
+                logger.error(f'Process event subscriber failed: {err}')
+
+
+class FakeProcessEventSource(ProcessEventSource):
+    """Events are only published by calling emit_started() / emit_exited(), for tests"""
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def emit_started(self, pid, name, create_time=None):
+        self.publish(ProcessEvent(ProcessEventKind.STARTED, pid, name, create_time))
+
+    def emit_exited(self, pid, name, create_time=None):
+        self.publish(ProcessEvent(ProcessEventKind.EXITED, pid, name, create_time))
+
+
+class SnapshotDiffEventSource(ProcessEventSource):
+    """
+    Portable backend: diff consecutive process snapshots.
+
+    Refreshing the shared snapshot service also keeps it warm for the pollers,
+    and the incremental index makes an unchanged refresh cheap.
+    """
+
+    def __init__(self, snapshot_service, interval=None):
+        """
+        :param snapshot_service: ProcessSnapshotService
+        :param interval: diff interval (millisecond), at least the service's max_staleness, None uses it
+        """
+        super().__init__()
+        self.snapshot_service = snapshot_service
+        # A shorter interval would refresh snapshots the pollers could still share
+        max_staleness = snapshot_service.max_staleness
+        self.interval = max(interval / 1000, max_staleness) if interval is not None else max_staleness
+        self.stop_flag = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_flag.clear()
+        self.thread = threading.Thread(target=self.run_task, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_flag.set()
+
+    def run_task(self):
+        self.run_diff_loop()
+
+    def run_diff_loop(self):
+        snapshot = self.snapshot_service.get(self.interval)
+        previous_entries = snapshot.entries
+        previous = set(previous_entries.values())
+
+        while not self.stop_flag.wait(self.interval):
+            entries = self.snapshot_service.get(self.interval).entries
+            # Renewed snapshots share the entries mapping when nothing changed
+            if entries is previous_entries:
+                continue
+
+            current = set(entries.values())
+            for entry in previous - current:
+                self.publish(ProcessEvent(ProcessEventKind.EXITED, entry.pid, entry.name, entry.create_time))
+            for entry in current - previous:
+                self.publish(ProcessEvent(ProcessEventKind.STARTED, entry.pid, entry.name, entry.create_time))
+
+            previous_entries, previous = entries, current
+
+
+class WmiEventSource(SnapshotDiffEventSource):
+    """
+    Windows backend: WMI process trace events (ETW based, needs admin).
+
+    Falls back to diffing snapshots when the trace cannot be subscribed.
+    """
+    QUERY = "SELECT * FROM Win32_ProcessTrace"
+    WBEM_E_TIMED_OUT = -2147209215  # 0x80043001
+
+    def __init__(self, snapshot_service, interval=None, timeout=500):
+        """
+        :param snapshot_service: ProcessSnapshotService
+        :param interval: diff interval of the fallback (millisecond)
+        :param timeout: how long a single wait for an event blocks (millisecond)
+        """
+        super().__init__(snapshot_service, interval)
+        self.timeout = timeout
+
+    def run_task(self):
+        import pythoncom
+        import pywintypes
+        import win32com.client
+
+        pythoncom.CoInitialize()
+        try:
+            try:
+                wmi = win32com.client.GetObject(r"winmgmts:\\.\root\cimv2")
+                watcher = wmi.ExecNotificationQuery(self.QUERY)
+            except pywintypes.com_error as err:  # type: ignore
+                logger.warning(f'WMI process trace unavailable, diffing snapshots instead: {err}')
+                self.run_diff_loop()
+                return
+
+            while not self.stop_flag.is_set():
+                try:
+                    event = watcher.NextEvent(self.timeout)
+                except pywintypes.com_error as err:  # type: ignore
+                    if self.is_timeout(err):
+                        continue
+                    logger.warning(f'WMI process trace failed, diffing snapshots instead: {err}')
+                    self.run_diff_loop()
+                    return
+
+                pid = int(event.ProcessID)
+                if event.Path_.Class == 'Win32_ProcessStartTrace':
+                    kind = ProcessEventKind.STARTED
+                    # The PID may still be indexed under the process that used it before
+                    self.snapshot_service.revalidate([pid])
+                else:
+                    kind = ProcessEventKind.EXITED
+                    self.snapshot_service.invalidate()
+
+                self.publish(ProcessEvent(kind, pid, event.ProcessName))
+        finally:
+            pythoncom.CoUninitialize()
+
+    def is_timeout(self, err):
+        if err.hresult == self.WBEM_E_TIMED_OUT:
+            return True
+        return bool(err.excepinfo) and err.excepinfo[5] == self.WBEM_E_TIMED_OUT
+
+
+def create_process_event_source(snapshot_service) -> ProcessEventSource:
+    if os.name == 'nt':
+        return WmiEventSource(snapshot_service)
+    return SnapshotDiffEventSource(snapshot_service)
@@ -0,0 +1,105 @@
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRuntime:
+    """
+    One asyncio event loop on a background thread, shared by the services and
+    the I/O bound adapters.
+
+    Coroutines are submitted from any thread and return a concurrent Future,
+    cancelling it cancels the coroutine. Blocking OS calls are awaited through
+    run_blocking(), which runs them on one bounded executor. Qt objects get
+    the results through their signals, an emit from the loop thread is a
+    queued call in the receiver's thread.
+    """
+
+    def __init__(self, max_workers=4):
+        """
+        :param max_workers: threads of the executor for blocking calls
+        """
+        self.max_workers = max_workers
+        self.loop = None
+        self.thread = None
+        self.executor = None
+        self.tasks = set()
+
+    def start(self):
+        if self.is_running():
+            return
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="runtime")
+        self.loop.set_default_executor(self.executor)
+
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self.run_loop, args=(ready,), name="AsyncRuntime", daemon=True)
+        self.thread.start()
+        ready.wait()
+
+    def run_loop(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def submit(self, coro) -> Future:
+        """
+        :param coro: coroutine to run on the loop
+        :return: concurrent Future of its result
+        :raise RuntimeError: the runtime is not running
+        """
+        if not self.is_running():
+            coro.close()
+            raise RuntimeError("The async runtime is not running")
+        return asyncio.run_coroutine_threadsafe(self.tracked(coro), self.loop)
+
+    async def tracked(self, coro):
+        task = asyncio.current_task()
+        self.tasks.add(task)
+        try:
+            return await coro
+        finally:
+            self.tasks.discard(task)
+
+    async def run_blocking(self, fn, *args, **kwargs):
+        """
+        Await a blocking call, run on the executor.
+
+        Cancelling the awaiting coroutine does not interrupt the call itself.
+        """
+        return await self.loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    def stop(self, timeout=2):
+        """
+        Cancel every coroutine, then stop the loop and the executor.
+
+        :param timeout: seconds to wait for the coroutines to unwind
+        """
+        if not self.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.cancel_all(), self.loop).result(timeout)
+        except Exception as err:
+            logger.warning(f'Async runtime did not stop cleanly: {err}')
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+        # Blocking calls still running are abandoned, they get no new work
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def cancel_all(self):
+        tasks = [task for task in self.tasks if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
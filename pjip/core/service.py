@@ -1,17 +1,25 @@
-import threading
+import asyncio
+import logging
 from abc import ABC, abstractmethod
 
-import pywintypes
+from pjip.core.metrics import get_registry
+
+logger = logging.getLogger(__name__)
 
 
 class ServiceManager:
-    def __init__(self, logic, runtime_status):
+    def __init__(self, logic, runtime_status, runtime):
+        """
+        :param logic: logic module
+        :param runtime_status: RuntimeStatus with the window handle
+        :param runtime: AsyncRuntime the services run on
+        """
         super().__init__()
         self.logic = logic
         self.runtime_status = runtime_status
+        self.runtime = runtime
         self.services = []
 
-        self.threads = {}
         self.hwnd = None
 
         self.init_hwnd()
@@ -21,21 +29,19 @@ class ServiceManager:
 
     def init_hwnd(self):
         self.hwnd = int(self.runtime_status.window_handle)
-        print(f'Hwnd: {self.hwnd}')
+        logger.info(f'Hwnd: {self.hwnd}')
 
     def init_services(self):
-        self.services.append(TopMostService(50, self.logic, self.hwnd))
-        self.services.append(HideService(1000, self.logic, self.hwnd))
+        self.services.append(TopMostService(50, self.logic, self.hwnd, self.runtime))
+        self.services.append(HideService(1000, self.logic, self.hwnd, self.runtime))
 
     def start_all(self):
         for service in self.services:
-            thread = threading.Thread(target=service.start, daemon=True)
-            self.threads[service] = thread
-            thread.start()
+            service.start()
 
     def stop_all(self):
         """Stop services and quit"""
-        for service, thread in self.threads.items():
+        for service in self.services:
             service.stop()
 
 
@@ -53,65 +59,72 @@ class BaseServiceInterface(ABC):
         raise NotImplementedError("Subclasses must implement run_task()")
 
 
-class TopMostService(BaseServiceInterface):
-    def __init__(self, interval, logic, hwnd):
+class PeriodicService(BaseServiceInterface):
+    """
+    Service calling run_task() every interval on the async runtime.
+
+    A blocking run_task() runs on the runtime's executor, a cheap one is
+    called inline on the loop to spare the two thread hops of every tick.
+    """
+    blocking = True
+
+    def __init__(self, interval, logic, hwnd, runtime):
         """
-        :param interval: millisecond
+        :param interval: run interval (millisecond)
         :param logic: logic module
         :param hwnd: hwnd of top window
+        :param runtime: AsyncRuntime
         """
         super().__init__()
 
-        self.stop_flag = threading.Event()
         self.interval = interval / 1000
         self.logic = logic
-
-        self.run = True
         self.hwnd = hwnd
+        self.runtime = runtime
+        self.future = None
 
     def start(self):
-        self.run_task()
+        self.future = self.runtime.submit(self.run())
 
     def stop(self):
-        self.stop_flag.set()
+        if self.future is not None:
+            self.future.cancel()
 
-    def run_task(self):
-        while not self.stop_flag.is_set():
+    async def run(self):
+        metrics = get_registry()
+        name = f'{type(self).__name__}.run_task'
+        while True:
             try:
-                self.logic.set_window_top_most(self.hwnd)
-            except pywintypes.error as err:  # type: ignore
-                print('pywintypes.error')
-                print(err)
+                with metrics.timed(name):
+                    if self.blocking:
+                        await self.runtime.run_blocking(self.run_task)
+                    else:
+                        self.run_task()
             except Exception as err:
-                print(err)
-            if self.stop_flag.wait(self.interval):
-                break
+                self.handle_error(err)
+            await asyncio.sleep(self.interval)
 
+    def handle_error(self, err):
+        logger.error(err)
 
-class HideService(BaseServiceInterface):
-    def __init__(self, interval, logic, hwnd):
-        """
-        :param interval: run interval (millisecond)
-        :param logic: logic module
-        :param hwnd: hwnd of top window
-        """
-        super().__init__()
 
-        self.stop_flag = threading.Event()
-        self.interval = interval / 1000
-        self.logic = logic
+class TopMostService(PeriodicService):
+    # The window belongs to the GUI thread, SetWindowPos from another thread
+    # waits until that thread pumps messages, so it must not run on the loop
+    blocking = True
 
-        self.run = True
-        self.hwnd = hwnd
+    def run_task(self):
+        self.logic.set_window_top_most(self.hwnd)
 
-    def start(self):
-        self.run_task()
+    def handle_error(self, err):
+        import pywintypes
+
+        if isinstance(err, pywintypes.error):  # type: ignore
+            logger.debug(f'pywintypes.error: {err}')
+        else:
+            logger.error(err)
 
-    def stop(self):
-        self.stop_flag.set()
 
+class HideService(PeriodicService):
     def run_task(self):
-        while not self.stop_flag.is_set():
-            self.logic.set_window_display_affinity(self.hwnd)
-            if self.stop_flag.wait(self.interval):
-                break
+        self.logic.set_window_display_affinity(self.hwnd)
@@ -0,0 +1,430 @@
+import functools
+import os
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import NamedTuple
+
+import psutil
+
+from pjip.core.metrics import get_registry
+
+
+class ProcessEntry(NamedTuple):
+    pid: int
+    create_time: float | None
+    name: str | None
+
+    @property
+    def key(self):
+        """(pid, create_time) identifies a process even after its PID is reused"""
+        return self.pid, self.create_time
+
+
+class ProcessSnapshot:
+    """
+    Immutable view of the process table at one point in time.
+
+    Process names are indexed in lower case once, so lookups do not have to
+    normalise every entry on every call.
+    """
+    __slots__ = ('timestamp', 'entries', 'pids_by_lower_name')
+
+    def __init__(self, timestamp, entries, pids_by_lower_name):
+        """
+        :param timestamp: time.monotonic() value when the table was read
+        :param entries: mapping of pid -> ProcessEntry
+        :param pids_by_lower_name: mapping of lower-cased name -> tuple of PIDs
+        """
+        object.__setattr__(self, 'timestamp', timestamp)
+        object.__setattr__(self, 'entries', self._read_only(entries))
+        object.__setattr__(self, 'pids_by_lower_name', self._read_only(pids_by_lower_name))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @staticmethod
+    def _read_only(mapping):
+        # Renewed snapshots share the mappings of the previous one
+        if isinstance(mapping, MappingProxyType):
+            return mapping
+        return MappingProxyType(mapping)
+
+    def __contains__(self, pid):
+        return pid in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def age(self):
+        return time.monotonic() - self.timestamp
+
+    def renewed(self, timestamp):
+        """Same table, observed again at timestamp"""
+        return ProcessSnapshot(timestamp, self.entries, self.pids_by_lower_name)
+
+    def pids_by_name(self, process_name) -> tuple:
+        """
+        :param process_name: process name, case-insensitive
+        :return: tuple of matching PIDs, empty if none
+        """
+        return self.pids_by_lower_name.get(process_name.lower(), ())
+
+    def has_name(self, process_name) -> bool:
+        return process_name.lower() in self.pids_by_lower_name
+
+
+class ProcessIndex:
+    """
+    Incrementally maintained name -> PID index.
+
+    Each update diffs the current PID list against the previous one and only
+    fetches attributes for PIDs that appeared, so the cost of a steady-state
+    refresh scales with process churn rather than with the size of the table.
+    A PID reused between two updates stays in the list, so updates also
+    recheck the create_time of a rotating slice of the known PIDs, at most
+    once per RECHECK_INTERVAL.
+    """
+    RECHECK_SLICE = 32
+    RECHECK_INTERVAL = 0.25  # second
+
+    def __init__(self):
+        self.entries = {}  # pid -> ProcessEntry
+        self.by_name = {}  # lower-cased name -> set of pids
+        self.snapshot = None
+        self._validated = {}  # pid -> snapshot timestamp of the last create_time check
+        self._recheck_queue = deque()
+        self._last_recheck = None
+
+    def update(self) -> ProcessSnapshot:
+        pids = set(psutil.pids())
+        known = self.entries.keys()
+
+        vanished = known - pids
+        appeared = pids - known
+
+        for pid in vanished:
+            self._remove(pid)
+
+        for pid in appeared:
+            entry = self.fetch_entry(pid)
+            if entry is not None:
+                self._add(entry)
+
+        reused = self._recheck_slice(appeared)
+        return self._publish(bool(vanished or appeared or reused))
+
+    def _recheck_slice(self, skip) -> bool:
+        """
+        Recheck the next RECHECK_SLICE known PIDs, the queue is refilled once it ran out.
+
+        :param skip: PIDs fetched by this update already
+        :return: True if a reused PID was found
+        """
+        now = time.monotonic()
+        if self._last_recheck is not None and now - self._last_recheck < self.RECHECK_INTERVAL:
+            return False
+        self._last_recheck = now
+
+        if not self._recheck_queue:
+            self._recheck_queue.extend(self.entries.keys())
+
+        changed = False
+        for _ in range(min(self.RECHECK_SLICE, len(self._recheck_queue))):
+            pid = self._recheck_queue.popleft()
+            if pid in skip or pid not in self.entries:
+                continue
+            changed |= self._recheck(pid)
+        return changed
+
+    def _recheck(self, pid) -> bool:
+        """
+        :return: True if the entry of pid changed
+        """
+        entry = self.entries.get(pid)
+        current = self.fetch_entry(pid)
+
+        if current is not None and entry is not None and current.key == entry.key:
+            return False
+        self._remove(pid)
+        if current is not None:
+            self._add(current)
+        return True
+
+    def revalidate(self, pids) -> bool:
+        """
+        Make sure the entries of pids still describe the same processes.
+
+        A PID that is reused between two updates stays in the PID list, so it is
+        detected by comparing create_time. Only entries that are actually
+        looked up are checked, at most once per snapshot.
+
+        :param pids: PIDs to check
+        :return: True if any entry changed and a new snapshot was published
+        """
+        timestamp = self.snapshot.timestamp
+        checked = []
+        changed = False
+
+        for pid in pids:
+            if self._validated.get(pid) == timestamp:
+                continue
+
+            changed |= self._recheck(pid)
+            checked.append(pid)
+
+        if changed:
+            timestamp = self._publish(True).timestamp
+        for pid in checked:
+            if pid in self.entries:
+                self._validated[pid] = timestamp
+        return changed
+
+    @staticmethod
+    def fetch_entry(pid) -> ProcessEntry | None:
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                try:
+                    name = proc.name()
+                except psutil.AccessDenied:
+                    name = None
+                try:
+                    create_time = proc.create_time()
+                except psutil.AccessDenied:
+                    create_time = None
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return None
+
+        return ProcessEntry(pid, create_time, name)
+
+    def _add(self, entry):
+        self.entries[entry.pid] = entry
+        if entry.name:
+            self.by_name.setdefault(entry.name.lower(), set()).add(entry.pid)
+
+    def _remove(self, pid):
+        entry = self.entries.pop(pid, None)
+        self._validated.pop(pid, None)
+        if entry is None or not entry.name:
+            return
+
+        lower_name = entry.name.lower()
+        pids = self.by_name.get(lower_name)
+        if pids is not None:
+            pids.discard(pid)
+            if not pids:
+                del self.by_name[lower_name]
+
+    def _publish(self, changed) -> ProcessSnapshot:
+        timestamp = time.monotonic()
+        if changed or self.snapshot is None:
+            self.snapshot = ProcessSnapshot(
+                timestamp,
+                dict(self.entries),
+                {name: tuple(sorted(pids)) for name, pids in self.by_name.items()}
+            )
+        else:
+            self.snapshot = self.snapshot.renewed(timestamp)
+        return self.snapshot
+
+
+def canonical_path(path):
+    """
+    Resolutions are cached by the identity of the file, a reinstall or a
+    re-pointed link gives the path a new one and resolves it again.
+
+    :param path: file path
+    :return: absolute path with links and short names resolved, case-folded on Windows
+    """
+    try:
+        stat = os.stat(path)
+        identity = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+    except (OSError, ValueError):
+        identity = None
+    return resolve_path(path, identity)
+
+
+@functools.lru_cache(maxsize=256)
+def resolve_path(path, identity):
+    """
+    :param path: file path
+    :param identity: stat of the file the path points to, part of the cache key only
+    """
+    return os.path.normcase(os.path.realpath(path))
+
+
+class ExecutablePathCache:
+    """
+    Canonical executable path per process, resolved once per (pid, create_time).
+
+    The key changes when a PID is reused, so a cached path never describes
+    another process. Entries of processes that are gone are pruned against
+    the next changed snapshot.
+    """
+
+    def __init__(self):
+        self.paths = {}  # (pid, create_time) -> canonical path or None
+        self._pruned_entries = None
+        self._lock = threading.Lock()
+
+    def path_of(self, entry: ProcessEntry) -> str | None:
+        """
+        :param entry: ProcessEntry of a snapshot
+        :return: canonical executable path, None when it cannot be read
+        """
+        # Without a create time a reused PID cannot be told apart, never cache it
+        if entry.create_time is None:
+            return self.resolve(entry.pid)
+
+        key = entry.key
+        try:
+            return self.paths[key]
+        except KeyError:
+            pass
+
+        path = self.resolve(entry.pid)
+        with self._lock:
+            self.paths[key] = path
+        return path
+
+    @staticmethod
+    def resolve(pid):
+        try:
+            exe_path = psutil.Process(pid).exe()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        return canonical_path(exe_path) if exe_path else None
+
+    def prune(self, snapshot: ProcessSnapshot):
+        """Forget the processes that are not in snapshot"""
+        entries = snapshot.entries
+        if entries is self._pruned_entries:
+            return
+        with self._lock:
+            live = {entry.key for entry in entries.values()}
+            self.paths = {key: path for key, path in self.paths.items() if key in live}
+            self._pruned_entries = entries
+
+
+class ProcessSnapshotService:
+    """
+    Refresh the process index at most once per max_staleness window and
+    share the resulting snapshot between every poller and lookup.
+    """
+
+    def __init__(self, max_staleness=0.4):
+        """
+        :param max_staleness: seconds a snapshot may be reused before it is refreshed
+        """
+        self.max_staleness = max_staleness
+        self.index = ProcessIndex()
+        self.exe_paths = ExecutablePathCache()
+        self._lock = threading.Lock()
+        self._invalidated = False
+
+    def get(self, max_staleness=None) -> ProcessSnapshot:
+        """
+        Return the current snapshot, refreshing it when older than max_staleness.
+
+        :param max_staleness: override of the service default (seconds), 0 forces a refresh
+        :return: ProcessSnapshot
+        """
+        if max_staleness is None:
+            max_staleness = self.max_staleness
+
+        snapshot = self.index.snapshot
+        if self._is_fresh(snapshot, max_staleness):
+            return snapshot
+
+        with self._lock:
+            # Another thread may have refreshed while we were waiting for the lock
+            snapshot = self.index.snapshot
+            if self._is_fresh(snapshot, max_staleness):
+                return snapshot
+
+            self._invalidated = False
+            with get_registry().timed('ProcessSnapshotService.refresh'):
+                return self.index.update()
+
+    def refresh(self) -> ProcessSnapshot:
+        return self.get(0)
+
+    def invalidate(self):
+        """Force the next get() to refresh, e.g. after a process start/exit event"""
+        self._invalidated = True
+
+    def pids_by_name(self, process_name, max_staleness=None) -> tuple:
+        """
+        PIDs of processes named process_name, checked against PID reuse.
+
+        :param process_name: process name, case-insensitive
+        :param max_staleness: see get()
+        :return: tuple of PIDs, empty if none
+        """
+        snapshot = self.get(max_staleness)
+        pids = snapshot.pids_by_name(process_name)
+        if not pids:
+            return pids
+
+        with self._lock:
+            if self.index.revalidate(pids):
+                return self.index.snapshot.pids_by_name(process_name)
+        return pids
+
+    def has_name(self, process_name, max_staleness=None) -> bool:
+        return bool(self.pids_by_name(process_name, max_staleness))
+
+    def exe_path(self, pid):
+        """
+        :param pid: PID of a running process, e.g. of a start event
+        :return: canonical executable path through the identity cache, None when gone or unreadable
+        """
+        entry = self.index.fetch_entry(pid)
+        if entry is None:
+            return None
+        return self.exe_paths.path_of(entry)
+
+    def revalidate(self, pids):
+        """
+        Recheck pids now, e.g. after a process start event, a reused PID is updated at once.
+
+        :param pids: PIDs to check
+        """
+        if self.index.snapshot is None:
+            self.get()
+        with self._lock:
+            self.index.revalidate(pids)
+
+    def pids_by_path(self, path, max_staleness=None, accept_unreadable=False) -> tuple:
+        """
+        PIDs of processes running the executable at path.
+
+        Only processes named like the file are candidates, their paths come
+        from the identity cache, so a steady-state lookup reads no process.
+
+        :param path: executable path, compared in canonical form
+        :param max_staleness: see get()
+        :param accept_unreadable: also return candidates whose path cannot be read
+        :return: tuple of PIDs, empty if none
+        """
+        target = canonical_path(path)
+        # The resolved file name is the one the process runs under
+        pids = self.pids_by_name(os.path.basename(target), max_staleness)
+        if not pids:
+            return pids
+
+        snapshot = self.index.snapshot
+        self.exe_paths.prune(snapshot)
+        matched = []
+        for pid in pids:
+            if pid not in snapshot:
+                continue
+            exe_path = self.exe_paths.path_of(snapshot.entries[pid])
+            if exe_path == target or (exe_path is None and accept_unreadable):
+                matched.append(pid)
+        return tuple(matched)
+
+    def _is_fresh(self, snapshot, max_staleness):
+        return not self._invalidated and snapshot is not None and snapshot.age() <= max_staleness
@@ -0,0 +1,88 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from pjip.core.metrics import get_registry
+from pjip.core.startup_profile import phase
+
+logger = logging.getLogger(__name__)
+
+
+class StartupOrchestrator:
+    """
+    Run independent startup probes on worker threads while the GUI is built.
+
+    Each probe is submitted once under a name and returns a Future. Callers
+    only block, through result(), at the point the value is needed. Errors
+    are raised there as well, as they would have been in a sequential start.
+    """
+
+    def __init__(self, max_workers=4):
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="startup")
+        self.futures = {}
+
+    def submit(self, name, fn, *args, **kwargs) -> Future:
+        """
+        :param name: probe name, reported as the metric "startup.<name>"
+        :param fn: callable run on a worker thread
+        :return: Future of the result of fn
+        """
+        future = self.executor.submit(run_timed, name, fn, *args, **kwargs)
+        self.futures[name] = future
+        return future
+
+    def result(self, name, timeout=None):
+        """
+        :param name: probe name
+        :param timeout: seconds to wait, None waits until the probe finished
+        :return: result of the probe
+        :raise TimeoutError: the probe did not finish in time
+        """
+        return probe_result(self.futures[name], name, timeout)
+
+    def wait_all(self, timeout=None):
+        """Wait for every probe, failed ones are logged"""
+        for name, future in list(self.futures.items()):
+            try:
+                future.result(timeout)
+            except Exception as err:
+                logger.error(f'Startup probe {name} failed: {err}')
+
+    def shutdown(self):
+        """Accept no more probes, the submitted ones still finish"""
+        self.executor.shutdown(wait=False)
+
+
+def run_timed(name, fn, *args, **kwargs):
+    with get_registry().timed(f"startup.{name}"):
+        return fn(*args, **kwargs)
+
+
+def run_probe(startup, name, fn, *args, **kwargs) -> Future:
+    """
+    Submit a probe to the orchestrator, or run it now without one.
+
+    :param startup: StartupOrchestrator or None
+    :return: Future of the result of fn
+    """
+    if startup is not None:
+        return startup.submit(name, fn, *args, **kwargs)
+
+    future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as err:
+        future.set_exception(err)
+    return future
+
+
+def probe_result(future, name, timeout=None):
+    """
+    :param future: Future returned by run_probe()
+    :param name: probe name, the time spent blocked is profiled as "wait_<name>"
+    :param timeout: seconds to wait, None waits until the probe finished
+    :return: result of the probe
+    """
+    if future.done():
+        return future.result()
+    with phase(f"wait_{name}"):
+        return future.result(timeout)
@@ -0,0 +1,259 @@
+"""
+Startup phase profiler, enabled with ``--profile-startup[=PATH]``.
+
+Records wall and CPU time per named phase and the time spent in every
+module import, then writes a JSON report. ``--profile-startup-cprofile=PATH``
+additionally dumps cProfile stats of the main thread and
+``--profile-startup-exit`` quits once the report is written.
+
+Phases are opened with phase(name), a no-op unless the profiler was started,
+nested phases are reported as "outer/inner".
+"""
+import contextlib
+import importlib._bootstrap
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+REPORT_FLAG = "--profile-startup"
+CPROFILE_FLAG = "--profile-startup-cprofile"
+EXIT_FLAG = "--profile-startup-exit"
+REPORT_FILE_NAME = "startup_profile.json"
+
+_profiler = None
+
+
+class StartupProfiler:
+    def __init__(self, report_path=None, cprofile_path=None, exit_after=False):
+        """
+        :param report_path: JSON report path, None writes it to the cache directory
+        :param cprofile_path: cProfile stats path, None does not run cProfile
+        :param exit_after: whether the application should quit after the report
+        """
+        self.report_path = report_path
+        self.cprofile_path = cprofile_path
+        self.exit_after = exit_after
+
+        self.phases = []
+        self.imports = []
+        self.cprofile = None
+        self.started_wall = self.started_cpu = None
+        self.stopped_wall = self.stopped_cpu = None
+
+        # Phases are also opened off the main thread, e.g. waits on startup probes
+        self._phase_state = threading.local()
+        self._import_state = threading.local()
+        self._original_find_and_load = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.started_wall = time.perf_counter()
+        self.started_cpu = time.process_time()
+
+        # Every module load goes through _find_and_load, also the submodules of
+        # "from package import module", which never reach builtins.__import__
+        self._original_find_and_load = importlib._bootstrap._find_and_load
+        importlib._bootstrap._find_and_load = self._timed_find_and_load
+
+        if self.cprofile_path:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def stop(self):
+        if self.stopped_wall is not None:
+            return
+        if self.cprofile is not None:
+            self.cprofile.disable()
+
+        self.stopped_wall = time.perf_counter()
+        self.stopped_cpu = time.process_time()
+
+        if importlib._bootstrap._find_and_load == self._timed_find_and_load:
+            importlib._bootstrap._find_and_load = self._original_find_and_load
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Time the block as one phase.
+
+        CPU time is the time of the whole process, background threads included.
+        """
+        stack = self.phase_stack()
+        stack.append(name)
+        path = "/".join(stack)
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            end_wall = time.perf_counter()
+            entry = {
+                "name": path,
+                "start_ms": (start_wall - self.started_wall) * 1000,
+                "wall_ms": (end_wall - start_wall) * 1000,
+                "cpu_ms": (time.process_time() - start_cpu) * 1000,
+                "thread": threading.current_thread().name,
+            }
+            with self._lock:
+                self.phases.append(entry)
+            stack.pop()
+
+    def phase_stack(self):
+        """
+        :return: stack of the phase names open in the current thread
+        """
+        stack = getattr(self._phase_state, "stack", None)
+        if stack is None:
+            stack = self._phase_state.stack = []
+        return stack
+
+    def _timed_find_and_load(self, name, import_):
+        if name in sys.modules:
+            return self._original_find_and_load(name, import_)
+
+        # Nested imports are charged to their own entry, self time excludes them
+        stack = getattr(self._import_state, "stack", None)
+        if stack is None:
+            stack = self._import_state.stack = []
+
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_find_and_load(name, import_)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+
+            with self._lock:
+                self.imports.append({
+                    "module": name,
+                    "cumulative_ms": elapsed * 1000,
+                    "self_ms": (elapsed - children) * 1000,
+                    "phase": "/".join(self.phase_stack()) or None,
+                    "thread": threading.current_thread().name,
+                })
+
+    def report(self):
+        """
+        :return: JSON serializable dictionary of the phases and imports
+        """
+        end_wall = self.stopped_wall if self.stopped_wall is not None else time.perf_counter()
+        end_cpu = self.stopped_cpu if self.stopped_cpu is not None else time.process_time()
+
+        with self._lock:
+            imports = sorted(self.imports, key=lambda entry: entry["self_ms"], reverse=True)
+            phases = sorted(self.phases, key=lambda entry: entry["start_ms"])
+
+        return {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "total": {
+                "wall_ms": (end_wall - self.started_wall) * 1000,
+                "cpu_ms": (end_cpu - self.started_cpu) * 1000,
+            },
+            "phases": phases,
+            "imports": {
+                "count": len(imports),
+                "self_ms": sum(entry["self_ms"] for entry in imports),
+                "modules": imports,
+            },
+        }
+
+    def write_report(self, default_dir=None):
+        """
+        Stop profiling and write the report, and the cProfile stats if enabled.
+
+        :param default_dir: directory of the report when no path was given
+        :return: path of the report
+        """
+        self.stop()
+
+        path = self.report_path
+        if path is None:
+            if default_dir is None:
+                from pjip.core.cache import get_cache_dir
+                from pjip.config import build_config
+                default_dir = get_cache_dir(build_config.PROJECT_NAME_ABBREVIATION)
+            path = os.path.join(default_dir, REPORT_FILE_NAME)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2)
+
+        if self.cprofile is not None:
+            self.cprofile.dump_stats(self.cprofile_path)
+
+        logger.info(f'Startup profile written to {path}')
+        return path
+
+
+def parse_profile_args(argv):
+    """
+    Take the profiler flags out of argv.
+
+    :param argv: command line arguments, programme name first
+    :return: (StartupProfiler or None, argv without the profiler flags)
+    """
+    enabled = exit_after = False
+    report_path = cprofile_path = None
+    remaining = []
+
+    for arg in argv:
+        flag, sep, value = arg.partition("=")
+        if flag == REPORT_FLAG:
+            enabled = True
+            report_path = value or None
+        elif flag == CPROFILE_FLAG and value:
+            enabled = True
+            cprofile_path = value
+        elif arg == EXIT_FLAG:
+            enabled = exit_after = True
+        else:
+            remaining.append(arg)
+
+    if not enabled:
+        return None, remaining
+    return StartupProfiler(report_path, cprofile_path, exit_after), remaining
+
+
+def start_from_argv(argv=None):
+    """
+    Start the profiler when argv contains a profiler flag, the flags are removed from argv in place.
+
+    :param argv: list of arguments, None uses sys.argv
+    :return: StartupProfiler or None
+    """
+    global _profiler
+
+    if argv is None:
+        argv = sys.argv
+    profiler, argv[:] = parse_profile_args(argv)
+    if profiler is not None:
+        profiler.start()
+        _profiler = profiler
+    return profiler
+
+
+def get_profiler():
+    return _profiler
+
+
+def phase(name):
+    """
+    :param name: phase name
+    :return: context manager timing the block, a no-op when not profiling
+    """
+    if _profiler is None or _profiler.stopped_wall is not None:
+        return contextlib.nullcontext()
+    return _profiler.phase(name)
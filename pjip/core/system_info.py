@@ -0,0 +1,98 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SystemInfoCollector:
+    """
+    Collect system information without blocking startup.
+
+    The version fields are available immediately. Hotfixes are taken from the
+    on-disk cache when the OS build matches, then checked on a background
+    thread and only queried again when the build or the update history count
+    changed.
+    """
+
+    def __init__(self, base_info, cache, hotfix_query, history_count_query):
+        """
+        :param base_info: dictionary of the cheap system fields (major, build, ...)
+        :param cache: JsonCache holding the hotfixes of the last run
+        :param hotfix_query: callable returning the list of hotfixes
+        :param history_count_query: callable returning the update history count
+        """
+        self.info = dict(base_info, hotfixes=None)
+        self.cache = cache
+        self.hotfix_query = hotfix_query
+        self.history_count_query = history_count_query
+
+        self.ready = threading.Event()
+        self.thread = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        cached = self.cache.load()
+        if self.is_same_build(cached):
+            self.publish(cached.get('hotfixes'))
+
+        self.thread = threading.Thread(target=self.run_task, args=(cached,), daemon=True)
+        self.thread.start()
+
+    def run_task(self, cached):
+        com_initialized = False
+        try:
+            if os.name == 'nt':
+                import pythoncom
+                pythoncom.CoInitialize()
+                com_initialized = True
+
+            history_count = self.history_count_query()
+            if self.is_same_build(cached) and cached.get('history_count') == history_count:
+                return
+
+            hotfixes = self.hotfix_query()
+            self.cache.save({
+                "version": self.info["version"],
+                "build": self.info["build"],
+                "history_count": history_count,
+                "hotfixes": hotfixes,
+            })
+            self.publish(hotfixes)
+        except Exception as err:
+            logger.warning(f'Failed to collect hotfixes: {err}')
+        finally:
+            # Waiters must not hang when the query failed
+            self.ready.set()
+            if com_initialized:
+                import pythoncom
+                pythoncom.CoUninitialize()
+
+    def is_same_build(self, cached):
+        return (isinstance(cached, dict)
+                and cached.get("version") == self.info["version"]
+                and cached.get("build") == self.info["build"])
+
+    def publish(self, hotfixes):
+        # Replace rather than mutate, readers always see a complete dictionary
+        self.info = dict(self.info, hotfixes=hotfixes)
+
+        with self._lock:
+            self.ready.set()
+            callbacks = list(self._callbacks)
+
+        for callback in callbacks:
+            callback(self.info)
+
+    def add_ready_callback(self, callback):
+        """Call callback(info) whenever hotfixes are published, now if already available"""
+        with self._lock:
+            self._callbacks.append(callback)
+            ready = self.ready.is_set() and self.info["hotfixes"] is not None
+
+        if ready:
+            callback(self.info)
+
+    def wait(self, timeout=None):
+        return self.ready.wait(timeout)
@@ -0,0 +1,217 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+
+from pjip.core.enums import TaskState
+
+logger = logging.getLogger(__name__)
+
+
+class TaskCancelled(Exception):
+    """Raised by a task that stopped because its token was cancelled"""
+
+
+class TaskRejected(RuntimeError):
+    """The task was not run, the queue was full"""
+
+
+class CancellationToken:
+    """Cooperative cancellation, tasks check it between steps"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+    def wait(self, timeout=None):
+        """Sleep for timeout seconds, wake up early when cancelled"""
+        return self._event.wait(timeout)
+
+
+class TaskHandle(Future):
+    """
+    Future of a submitted task, with cooperative cancellation and progress.
+
+    The Future stays pending while the task runs so that a task stopped
+    through its token can still end cancelled, state tells the actual
+    stage. Done and progress callbacks run on the thread that completes the
+    task, a Qt receiver should be reached through a signal.
+    """
+
+    def __init__(self, task=None, canceller=None, priority=None, key=None):
+        """
+        :param task: the submitted object, for logging
+        :param canceller: callable(handle) -> bool removing the task from its queue
+        :param priority: TaskPriority of the task
+        :param key: deduplication key of the task
+        """
+        super().__init__()
+        self.task = task
+        self.canceller = canceller
+        self.priority = priority
+        self.key = key
+        self.token = CancellationToken()
+        self.state = TaskState.QUEUED
+        self._progress = None
+        self._progress_callbacks = []
+        # Reentrant, done callbacks may finish other handles chained to this one
+        self._finish_lock = threading.RLock()
+
+    def cancel(self):
+        """
+        Cancel a queued task, ask a running one to stop.
+
+        :return: False when the task already finished
+        """
+        if self.done():
+            return False
+        if self.canceller is not None:
+            return self.canceller(self)
+        self.token.cancel()
+        return self.finish_cancelled()
+
+    def running(self):
+        return self.state is TaskState.RUNNING
+
+    def set_running(self):
+        self.state = TaskState.RUNNING
+
+    def finish(self, result):
+        """
+        :return: False when the handle was already done, e.g. cancelled meanwhile
+        """
+        with self._finish_lock:
+            if self.done():
+                return False
+            self.state = TaskState.FINISHED
+            self.set_result(result)
+            return True
+
+    def finish_error(self, err):
+        with self._finish_lock:
+            if self.done():
+                return False
+            self.state = TaskState.REJECTED if isinstance(err, TaskRejected) else TaskState.FINISHED
+            self.set_exception(err)
+            return True
+
+    def finish_cancelled(self):
+        with self._finish_lock:
+            if self.done():
+                return False
+            self.state = TaskState.CANCELLED
+            return super().cancel()
+
+    @property
+    def progress(self):
+        return self._progress
+
+    def set_progress(self, value):
+        self._progress = value
+        for callback in list(self._progress_callbacks):
+            try:
+                callback(value)
+            except Exception as err:
+                logger.error(f'Progress callback failed: {err}')
+
+    def add_progress_callback(self, callback):
+        """Call callback(progress) on every progress update, now if progress was already reported"""
+        self._progress_callbacks.append(callback)
+        if self._progress is not None:
+            callback(self._progress)
+
+
+def wait_all(handles, timeout=None):
+    """
+    :param handles: iterable of futures
+    :param timeout: seconds to wait for all of them, None waits forever
+    :return: list of the results, in the order of handles
+    :raise TimeoutError: not all handles finished in time
+    :raise Exception: the error of the first failed handle
+    """
+    handles = list(handles)
+    _, not_done = wait(handles, timeout)
+    if not_done:
+        raise TimeoutError(f'{len(not_done)} of {len(handles)} tasks not finished')
+    return [handle.result() for handle in handles]
+
+
+def first_success(handles, timeout=None):
+    """
+    :param handles: iterable of futures
+    :param timeout: seconds to wait, None waits forever
+    :return: result of the first handle that finished without error
+    :raise TimeoutError: no handle succeeded in time
+    :raise Exception: every handle failed, the last error is raised
+    """
+    pending = set(handles)
+    last_error = None
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    while pending:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, pending = wait(pending, remaining, return_when=FIRST_COMPLETED)
+        if not done:
+            raise TimeoutError('No task succeeded in time')
+        for handle in done:
+            if handle.cancelled():
+                continue
+            if handle.exception() is None:
+                return handle.result()
+            last_error = handle.exception()
+
+    if last_error is None:
+        raise TaskCancelled()
+    raise last_error
+
+
+def chain(handle, next_step):
+    """
+    Run next_step with the result of handle once it succeeded.
+
+    :param handle: first future
+    :param next_step: callable(result) returning the second future
+    :return: TaskHandle of the result of the second future, cancelling it cancels the current step
+    """
+    chained = TaskHandle(task=next_step)
+    current = [handle]
+
+    def cancel(outer):
+        # Cancelling the current step usually finishes outer through copy_outcome already
+        current[0].cancel()
+        outer.finish_cancelled()
+        return outer.cancelled()
+
+    def copy_outcome(future):
+        if future.cancelled():
+            chained.finish_cancelled()
+        elif future.exception() is not None:
+            chained.finish_error(future.exception())
+        else:
+            chained.finish(future.result())
+
+    def on_first_done(future):
+        if future.cancelled() or future.exception() is not None:
+            copy_outcome(future)
+            return
+        try:
+            second = next_step(future.result())
+        except Exception as err:
+            chained.finish_error(err)
+            return
+        current[0] = second
+        second.add_done_callback(copy_outcome)
+
+    chained.canceller = cancel
+    handle.add_done_callback(on_first_done)
+    return chained
@@ -0,0 +1,184 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateChecker:
+    """
+    Latest release lookup with connection reuse and caching.
+
+    - Every release endpoint (primary plus mirrors) is queried concurrently,
+      the first valid answer wins and the other lookups are abandoned.
+    - One requests.Session is kept per endpoint for the whole run, so repeated
+      checks reuse the pooled TLS connection.
+    - The release metadata is cached in memory and on disk. Within ttl it is
+      returned without any request, after that it is revalidated with
+      If-None-Match / If-Modified-Since so an unchanged release costs a 304.
+    - Connection errors, timeouts and 5xx responses are retried with
+      exponential backoff and full jitter.
+    """
+
+    def __init__(self, urls, cache, ttl=600, timeout=(2, 4), retries=3, backoff=0.5, max_backoff=8,
+                 user_agent=None):
+        """
+        :param urls: release endpoints, a single url is accepted as well
+        :param cache: JsonCache holding the last release metadata
+        :param ttl: seconds the cached release is used without revalidation
+        :param timeout: (connect timeout, read timeout) in seconds
+        :param retries: retries after the first attempt, per endpoint
+        :param backoff: base delay of the exponential backoff (second)
+        :param max_backoff: upper bound of a single backoff delay (second)
+        :param user_agent: User-Agent header sent with every request
+        """
+        self.urls = (urls,) if isinstance(urls, str) else tuple(urls)
+        if not self.urls:
+            raise ValueError("At least one release endpoint is required")
+
+        self.cache = cache
+        self.ttl = ttl
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.user_agent = user_agent
+
+        self.sessions = {}
+        self.entries = None
+        self.closed = threading.Event()
+        self._lock = threading.Lock()
+
+    def get_release(self, force=False):
+        """
+        :param force: skip the ttl and revalidate with the servers
+        :return: release metadata (dictionary)
+        :raise RuntimeError: no endpoint returned valid release metadata
+        """
+        with self._lock:
+            entries = self.load_entries()
+
+            newest = max(entries.values(), key=lambda e: e["fetched_at"], default=None)
+            if newest is not None and not force and time.time() - newest["fetched_at"] < self.ttl:
+                return newest["release"]
+
+            entry = self.query_endpoints(entries)
+
+            self.entries = dict(entries)
+            self.entries[entry["url"]] = entry
+            self.cache.save({"entries": self.entries})
+            return entry["release"]
+
+    def load_entries(self):
+        if self.entries is None:
+            data = self.cache.load()
+            entries = data.get("entries") if isinstance(data, dict) else None
+            # Entries of endpoints that are no longer configured are dropped
+            self.entries = {url: entry for url, entry in (entries or {}).items()
+                            if url in self.urls and isinstance(entry, dict) and "release" in entry}
+        return self.entries
+
+    def query_endpoints(self, entries):
+        done = threading.Event()
+
+        if len(self.urls) == 1:
+            url = self.urls[0]
+            return self.query_endpoint(url, entries.get(url), done)
+
+        executor = ThreadPoolExecutor(max_workers=len(self.urls), thread_name_prefix="UpdateCheck")
+        futures = [executor.submit(self.query_endpoint, url, entries.get(url), done) for url in self.urls]
+        errors = []
+        try:
+            for future in as_completed(futures):
+                try:
+                    return future.result()
+                except Exception as err:
+                    errors.append(err)
+        finally:
+            # Stop pending retries of the losers and do not wait for in-flight requests
+            done.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        raise errors[0]
+
+    def query_endpoint(self, url, entry, done):
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.request(url, headers, done)
+
+        if response.status_code == 304 and entry is not None:
+            return dict(entry, fetched_at=time.time())
+
+        if response.status_code == 200:
+            release = response.json()
+            self.validate_release(release)
+            return {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "release": release,
+            }
+
+        raise RuntimeError("Unable to obtain the latest version information")
+
+    @staticmethod
+    def validate_release(release):
+        from packaging.version import InvalidVersion, Version
+
+        tag = release.get("tag_name") if isinstance(release, dict) else None
+        if not isinstance(tag, str):
+            raise RuntimeError("Release metadata has no tag_name")
+        try:
+            Version(tag.lstrip("v"))
+        except InvalidVersion:
+            raise RuntimeError(f"Invalid release tag: {tag}") from None
+
+    def request(self, url, headers, done):
+        import requests
+
+        session = self.get_session(url)
+        attempt = 0
+        while True:
+            try:
+                response = session.get(url, headers=headers, timeout=self.timeout)
+                if response.status_code < 500:
+                    return response
+                error = RuntimeError(f"Server error {response.status_code}")
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+                error = err
+
+            # Another endpoint already answered, or the checker was closed
+            if attempt >= self.retries or done.is_set() or self.closed.is_set():
+                raise error
+
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            logger.info(f'Update check of {url} failed ({error}), retry in {delay:.2f}s')
+            if done.wait(delay):
+                raise error
+            attempt += 1
+
+    def get_session(self, url):
+        session = self.sessions.get(url)
+        if session is None:
+            import requests
+
+            session = requests.Session()
+            session.headers["Accept"] = "application/vnd.github+json"
+            if self.user_agent:
+                session.headers["User-Agent"] = self.user_agent
+            self.sessions[url] = session
+        return session
+
+    def close(self):
+        self.closed.set()
+        for session in self.sessions.values():
+            session.close()
+        self.sessions.clear()
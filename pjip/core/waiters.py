@@ -0,0 +1,125 @@
+"""
+Waiting for a process or a window to appear without a polling loop.
+
+Both primitives return a TaskHandle whose result is the PID or the window
+handle, fail with TimeoutError, and stop waiting when cancelled. Done
+callbacks run on the thread that completed the wait, a Qt receiver should
+be reached through a signal.
+"""
+import logging
+import os
+import threading
+
+from pjip.core.enums import ProcessEventKind
+from pjip.core.snapshot import canonical_path
+from pjip.core.task import TaskHandle
+
+logger = logging.getLogger(__name__)
+
+
+def wait_for_process(event_source, snapshot_service, target, timeout=None) -> TaskHandle:
+    """
+    Wait until a process is running.
+
+    Subscribes to the STARTED events of the name, then checks one fresh
+    snapshot for a process that is already running, so a start in between
+    is not missed. Launching a program costs one event, not a scan per tick.
+
+    :param event_source: ProcessEventSource, started if it is not running yet
+    :param snapshot_service: ProcessSnapshotService
+    :param target: process name, or executable path which must match as well
+    :param timeout: seconds to wait, None waits until cancelled
+    :return: TaskHandle of the PID
+    """
+    is_path = os.path.dirname(target) != ""
+    target_path = canonical_path(target) if is_path else None
+    process_name = os.path.basename(target_path or target)
+
+    handle = TaskHandle(task=f'wait_for_process({target})')
+
+    def matches(pid):
+        if target_path is None:
+            return True
+        return snapshot_service.exe_path(pid) == target_path
+
+    def on_event(event):
+        if event.kind is ProcessEventKind.STARTED and not handle.done() and matches(event.pid):
+            handle.finish(event.pid)
+
+    subscription = event_source.subscribe(on_event, process_name)
+    timer = start_timeout(handle, timeout, f'{target} did not start in {timeout}s')
+
+    def clean_up(_):
+        event_source.unsubscribe(subscription)
+        if timer is not None:
+            timer.cancel()
+
+    handle.add_done_callback(clean_up)
+    handle.set_running()
+    event_source.start()
+
+    for pid in snapshot_service.pids_by_name(process_name, max_staleness=0):
+        if matches(pid):
+            handle.finish(pid)
+            break
+
+    return handle
+
+
+def wait_for_window(finder, timeout=None, interval=0.05, max_interval=0.5) -> TaskHandle:
+    """
+    Wait until finder returns a window.
+
+    Windows have no creation event without a hook, so a background thread
+    calls finder with a doubling interval, waking up early when cancelled.
+
+    :param finder: callable returning the window handle, None or RuntimeError when not found
+    :param timeout: seconds to wait, None waits until cancelled
+    :param interval: first interval between two tries (second)
+    :param max_interval: upper bound of the interval (second)
+    :return: TaskHandle of the window handle
+    """
+    handle = TaskHandle(task=f'wait_for_window({getattr(finder, "__name__", finder)})')
+    timer = start_timeout(handle, timeout, f'Window not found in {timeout}s')
+
+    def run():
+        delay = interval
+        while not handle.done():
+            try:
+                hwnd = finder()
+            except RuntimeError:
+                hwnd = None
+            except Exception as err:
+                handle.finish_error(err)
+                break
+            if hwnd:
+                handle.finish(hwnd)
+                break
+            if handle.token.wait(delay):
+                break
+            delay = min(delay * 2, max_interval)
+
+        if timer is not None:
+            timer.cancel()
+
+    handle.set_running()
+    threading.Thread(target=run, name="wait_for_window", daemon=True).start()
+    return handle
+
+
+def start_timeout(handle, timeout, message):
+    """
+    :return: started timer failing handle with TimeoutError, None without timeout
+    """
+    if timeout is None:
+        return None
+
+    def expire():
+        if handle.finish_error(TimeoutError(message)):
+            handle.token.cancel()
+            logger.debug(message)
+
+    timer = threading.Timer(timeout, expire)
+    timer.daemon = True
+    timer.start()
+    return timer
@@ -1 +1,2 @@
-from .main_window import MainWindow
\ No newline at end of file
+from .main_window import MainWindow
+from .theme import apply_theme
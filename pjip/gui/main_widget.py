@@ -1,8 +1,14 @@
+import logging
+
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QWidget, QPushButton, QVBoxLayout, QHBoxLayout, \
     QSizePolicy, QStackedWidget, QLayout, QButtonGroup
 
-from .pages import ToolPage, FunctionPage, SettingsPage, UpdatePage, AboutPage
+from .style import set_style_state
+from .pages import ToolPage, FunctionPage, SettingsPage, UpdatePage, AboutPage, LogPage, \
+    DiagnosticsPage, LazyPage
+
+logger = logging.getLogger(__name__)
 
 
 class MainWidget(QWidget):
@@ -22,6 +28,7 @@ class MainWidget(QWidget):
 
         self.pages = self.stack_pages = None
         self.tool_page = self.functions_page = self.about_page = self.settings_page = self.update_page = None
+        self.log_page = self.diagnostics_page = None
 
         self.init_ui()
 
@@ -37,42 +44,29 @@ class MainWidget(QWidget):
         # self.sidebar_layout.setSpacing(self.SPACING)
 
         # Init stack_pages
+        # Only the first page is built before the window is shown, the others
+        # are built on first navigation
         self.tool_page = ToolPage()
-        self.functions_page = FunctionPage()
-        self.settings_page = SettingsPage()
-        self.update_page = UpdatePage()
-        self.about_page = AboutPage()
+        self.functions_page = LazyPage(FunctionPage)
+        self.settings_page = LazyPage(SettingsPage)
+        self.update_page = LazyPage(UpdatePage)
+        self.about_page = LazyPage(AboutPage)
+        self.log_page = LazyPage(LogPage)
+        self.diagnostics_page = LazyPage(DiagnosticsPage)
 
         self.pages = [
             self.tool_page,
             self.functions_page,
             self.settings_page,
             self.update_page,
+            self.log_page,
+            self.diagnostics_page,
             # self.about_page,
         ]
 
         self.sidebar_button_group = QButtonGroup(self)
         self.sidebar_button_group.setExclusive(True)
 
-        base_btn_style = f"""
-            QPushButton {{
-                background-color: #e6e6e6;
-                border-radius: {self.TASKBAR_BTN_HEIGHT // 4}px; 
-                padding: 0px;
-                font-weight: bold; 
-            }}
-            QPushButton:hover {{
-                background-color: #dcdcdc;
-            }}
-            QPushButton:pressed {{
-                background-color: #cbcbcb;
-            }}
-            QPushButton:checked {{
-                background-color: #4a90e2;
-                color: white;
-            }}
-        """
-
         sidebar_container = QWidget()
         sidebar_container_layout = QHBoxLayout(sidebar_container)
         sidebar_container_layout.setContentsMargins(0, 0, 0, 0)
@@ -87,7 +81,6 @@ class MainWidget(QWidget):
             btn.setFixedSize(self.TASKBAR_BTN_WIDTH, self.TASKBAR_BTN_HEIGHT)
             btn.setCheckable(True)
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            btn.setStyleSheet(base_btn_style)
             btn.setToolTip(page_name)
             self.sidebar_button_group.addButton(btn, index)
             sidebar_container_layout.addWidget(btn)
@@ -107,16 +100,6 @@ class MainWidget(QWidget):
         self.live_frame = QWidget()
         self.live_frame.setObjectName("live_frame")
 
-        self.live_frame.setStyleSheet("""
-            #live_frame {
-                background-color: #eeeeee; 
-                border-radius: 10px;
-                font-size: 24px;
-                border: 4px solid #cccccc;
-                color: #455A64;   
-            }
-        """)
-
         live_frame_layout = QVBoxLayout(self.live_frame)
         live_frame_layout.setContentsMargins(5, 5, 5, 5)
         live_frame_layout.setSpacing(5)
@@ -141,9 +124,11 @@ class MainWidget(QWidget):
         self.tool_page.set_adapter(self.adapter)
         self.functions_page.set_adapter(self.adapter)
         self.update_page.set_adapter(self.adapter)
+        self.log_page.set_adapter(self.adapter)
+        self.diagnostics_page.set_adapter(self.adapter)
 
     def signal_handler(self, name, value):
-        print(f'Signal: {name}, {value}')
+        logger.debug(f'Signal: {name}, {value}')
         match name:
             case 'MonitorAdapter':
                 self.tool_page.ui_change.emit(name, value)
@@ -156,24 +141,4 @@ class MainWidget(QWidget):
                 self.functions_page.ui_change.emit(name, value)
 
     def live_frame_change(self, studentmain_running_state):
-        if studentmain_running_state:
-            self.live_frame.setStyleSheet("""
-                #live_frame {
-                    background-color: #eeeeee; 
-                    border-radius: 10px;
-                    font-size: 24px;
-                    /*border: 4px solid #E66926; */
-                    border: 4px solid #E6A56E;
-                    color: #455A64;   
-                }
-            """)
-        else:
-            self.live_frame.setStyleSheet("""
-                #live_frame {
-                    background-color: #eeeeee; 
-                    border-radius: 10px;
-                    font-size: 24px;
-                    border: 4px solid #3DC766;
-                    color: #455A64;   
-                }
-            """)
+        set_style_state(self.live_frame, "running" if studentmain_running_state else "stopped")
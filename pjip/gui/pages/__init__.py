@@ -3,3 +3,6 @@ from .function_page import FunctionPage
 from .settings_page import SettingsPage
 from .update_page import UpdatePage
 from .about_page import AboutPage
+from .log_page import LogPage
+from .diagnostics_page import DiagnosticsPage
+from .lazy_page import LazyPage
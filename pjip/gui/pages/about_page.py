@@ -6,10 +6,10 @@ from .page_updating import PageUpdating
 
 class AboutPage(QWidget):
     ui_change = Signal(str, object)
+    page_name = 'About'
 
     def __init__(self):
         super().__init__()
-        self.page_name = 'About'
 
         self.init_ui()
 
@@ -0,0 +1,114 @@
+import logging
+
+from PySide6.QtCore import Signal, QTimer
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, \
+    QHeaderView, QFileDialog, QAbstractItemView
+
+logger = logging.getLogger(__name__)
+
+
+class DiagnosticsPage(QWidget):
+    ui_change = Signal(str, object)
+    page_name = 'Diag'
+
+    REFRESH_INTERVAL = 1000  # millisecond
+    COLUMNS = ('Task', 'Calls', 'Errors', 'Signals', 'Calls/s', 'Mean ms', 'p95 ms', 'Max ms')
+
+    def __init__(self):
+        super().__init__()
+        self.adapter = None
+        self.metrics_table = None
+        self.export_btn = None
+        self.reset_btn = None
+        self.refresh_timer = None
+
+        self.init_ui()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(3, 3, 3, 3)
+        main_layout.setSpacing(5)
+
+        self.metrics_table = QTableWidget(0, len(self.COLUMNS))
+        self.metrics_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.metrics_table.verticalHeader().setVisible(False)
+        self.metrics_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+        button_layout = QHBoxLayout()
+
+        self.reset_btn = QPushButton('Reset')
+        self.reset_btn.clicked.connect(self.reset)
+
+        self.export_btn = QPushButton('Export JSON')
+        self.export_btn.clicked.connect(self.export)
+
+        button_layout.addStretch(1)
+        button_layout.addWidget(self.reset_btn)
+        button_layout.addWidget(self.export_btn)
+
+        main_layout.addWidget(self.metrics_table, 1)
+        main_layout.addLayout(button_layout)
+
+        self.setLayout(main_layout)
+
+        # Only read the registry while the page is shown
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def set_adapter(self, adapter):
+        self.adapter = adapter
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def refresh(self):
+        if self.adapter is None:
+            return
+
+        metrics = self.adapter.get_metrics()["metrics"]
+        self.metrics_table.setRowCount(len(metrics))
+
+        for row, (name, metric) in enumerate(metrics.items()):
+            duration = metric["duration_ms"]
+            values = (
+                name,
+                str(metric["calls"]),
+                str(metric["errors"]),
+                str(metric["signals"]),
+                f'{metric["rate"]:.2f}',
+                self.format_ms(duration["mean"]),
+                self.format_ms(duration["p95"]),
+                self.format_ms(duration["max"]),
+            )
+            for column, value in enumerate(values):
+                item = self.metrics_table.item(row, column)
+                if item is None:
+                    self.metrics_table.setItem(row, column, QTableWidgetItem(value))
+                elif item.text() != value:
+                    item.setText(value)
+
+    @staticmethod
+    def format_ms(value):
+        return '-' if value is None else f'{value:.2f}'
+
+    def reset(self):
+        self.adapter.reset_metrics()
+        self.refresh()
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export metrics', 'pjip-metrics.json', 'JSON (*.json)')
+        if not path:
+            return
+        try:
+            self.adapter.export_metrics(path)
+        except OSError as err:
+            logger.error(f'Cannot export metrics: {err}')
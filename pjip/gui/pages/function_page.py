@@ -5,10 +5,10 @@ from PySide6.QtWidgets import QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLa
 
 class FunctionPage(QWidget):
     ui_change = Signal(str, object)
+    page_name = 'Function'
 
     def __init__(self):
         super().__init__()
-        self.page_name = 'Function'
         self.adapter = None
         self.custom_terminate_btn = None
         self.custom_process_input = None
@@ -24,35 +24,14 @@ class FunctionPage(QWidget):
         custom_terminate_frame = QWidget()
         custom_terminate_frame.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         custom_terminate_frame.setObjectName("custom_terminate_frame")
-
-        custom_terminate_frame.setStyleSheet("""
-            #custom_terminate_frame {
-                background-color: #eeeeee; 
-                border-radius: 10px;
-                font-size: 24px;
-                border: 2px solid #bbbbbb;
-                color: #455A64;   
-            }
-            QRadioButton {
-                font-size: 16px;
-            }
-            QRadioButton::indicator {
-                width: 24px;
-                height: 24px;
-            }
-        """)
+        custom_terminate_frame.setProperty("role", "card")
 
         custom_terminate_layout = QVBoxLayout(custom_terminate_frame)
         custom_terminate_layout.setContentsMargins(12, 5, 10, 5)
         custom_terminate_layout.setSpacing(3)
 
         custom_terminate_title_label = QLabel("Terminate Process")
-        custom_terminate_title_label.setStyleSheet("""
-            background-color: #eeeeee; 
-            border-radius: 10px;
-            font-size: 20px;
-            color: #455A64;   
-        """)
+        custom_terminate_title_label.setProperty("role", "card_title")
 
         custom_terminate_box_layout = QHBoxLayout()
 
@@ -60,40 +39,10 @@ class FunctionPage(QWidget):
         self.custom_process_input.setPlaceholderText("Enter PID or process name")
         self.custom_process_input.setFixedHeight(42)
         self.custom_process_input.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-        self.custom_process_input.setStyleSheet("""
-            QLineEdit {
-                font: 16px;
-                padding: 2px;
-                border: 2px solid #F8C8DC;
-                border-radius: 8px;
-                background-color: #FFF0F5;
-                color: #C94F7C;
-            }
-            QLineEdit:focus {
-                border: 2px solid #C94F7C;
-                background-color: #FDF6FA;
-            }
-        """)
 
         # self.custom_terminate_btn = QPushButton(" Kill ")
         self.custom_terminate_btn = QPushButton("Kill Process")
         self.custom_terminate_btn.setFixedHeight(42)
-        self.custom_terminate_btn.setStyleSheet("""
-            QPushButton {
-                font-size: 16px;
-                padding: 4px;
-                border: 2px solid #cccccc; 
-                border-radius: 8px;        
-                background-color: #eeeeee; 
-                color: #333;               
-            }
-            QPushButton:hover {
-                background-color: #dedede; 
-            }
-            QPushButton:pressed {
-                background-color: #cdcdcd; 
-            }
-        """)
         self.custom_terminate_btn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
         self.custom_terminate_btn.clicked.connect(self.custom_terminate)
 
@@ -106,35 +55,14 @@ class FunctionPage(QWidget):
         studentmain_pwd_frame = QWidget()
         studentmain_pwd_frame.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         studentmain_pwd_frame.setObjectName("studentmain_pwd_frame")
-
-        studentmain_pwd_frame.setStyleSheet("""
-            #studentmain_pwd_frame {
-                background-color: #eeeeee; 
-                border-radius: 10px;
-                font-size: 24px;
-                border: 2px solid #bbbbbb;
-                color: #455A64;   
-            }
-            QRadioButton {
-                font-size: 16px;
-            }
-            QRadioButton::indicator {
-                width: 24px;
-                height: 24px;
-            }
-        """)
+        studentmain_pwd_frame.setProperty("role", "card")
 
         studentmain_pwd_layout = QVBoxLayout(studentmain_pwd_frame)
         studentmain_pwd_layout.setContentsMargins(12, 5, 10, 5)
         studentmain_pwd_layout.setSpacing(3)
 
         studentmain_pwd_title_label = QLabel("Studentmain Password")
-        studentmain_pwd_title_label.setStyleSheet("""
-            background-color: #eeeeee; 
-            border-radius: 10px;
-            font-size: 20px;
-            color: #455A64;   
-        """)
+        studentmain_pwd_title_label.setProperty("role", "card_title")
 
         studentmain_pwd_box_layout = QHBoxLayout()
 
@@ -142,42 +70,12 @@ class FunctionPage(QWidget):
         self.studentmain_pwd_label.setPlaceholderText("Studentmain passwd not found")
         self.studentmain_pwd_label.setFixedHeight(42)
         self.studentmain_pwd_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-        self.studentmain_pwd_label.setStyleSheet("""
-            QLineEdit {
-                font: 16px;
-                padding: 2px;
-                border: 2px solid #F8C8DC;
-                border-radius: 8px;
-                background-color: #FFF0F5;
-                color: #C94F7C;
-            }
-            QLineEdit:focus {
-                border: 2px solid #C94F7C;
-                background-color: #FDF6FA;
-            }
-        """)
 
         self.studentmain_pwd_label.setReadOnly(True)
 
         # self.studentmain_pwd_btn = QPushButton(" Kill ")
         self.studentmain_pwd_btn = QPushButton(" Copy ")
         self.studentmain_pwd_btn.setFixedHeight(42)
-        self.studentmain_pwd_btn.setStyleSheet("""
-            QPushButton {
-                font-size: 16px;
-                padding: 4px;
-                border: 2px solid #cccccc; 
-                border-radius: 8px;        
-                background-color: #eeeeee; 
-                color: #333;               
-            }
-            QPushButton:hover {
-                background-color: #dedede; 
-            }
-            QPushButton:pressed {
-                background-color: #cdcdcd; 
-            }
-        """)
         self.studentmain_pwd_btn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
         self.studentmain_pwd_btn.clicked.connect(self.copy_studentmain_password_to_clipboard)
 
@@ -0,0 +1,65 @@
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+
+
+class LazyPage(QWidget):
+    """
+    Placeholder that builds its page the first time it is shown.
+
+    Until then ui_change signals are buffered, only the latest value per
+    sender is kept, and replayed to the page once it is built. The adapter
+    is handed over at the same time.
+    """
+    ui_change = Signal(str, object)
+
+    def __init__(self, page_cls):
+        """
+        :param page_cls: page class, constructed without arguments
+        """
+        super().__init__()
+        self.page_cls = page_cls
+        self.page_name = page_cls.page_name
+        self.page = None
+        self.adapter = None
+        self.pending = {}
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.ui_change.connect(self.buffer_signal)
+
+    def buffer_signal(self, name, value):
+        if self.page is None:
+            # Re-insert so the replay keeps the order of the latest signals
+            self.pending.pop(name, None)
+            self.pending[name] = value
+
+    def set_adapter(self, adapter):
+        self.adapter = adapter
+        if self.page is not None and hasattr(self.page, 'set_adapter'):
+            self.page.set_adapter(adapter)
+
+    def showEvent(self, event):
+        self.ensure_page()
+        super().showEvent(event)
+
+    def ensure_page(self):
+        """
+        :return: the page, built now if needed
+        """
+        if self.page is not None:
+            return self.page
+
+        self.page = self.page_cls()
+        self.layout().addWidget(self.page)
+
+        if self.adapter is not None and hasattr(self.page, 'set_adapter'):
+            self.page.set_adapter(self.adapter)
+
+        pending, self.pending = self.pending, {}
+        for name, value in pending.items():
+            self.page.ui_change.emit(name, value)
+
+        self.ui_change.disconnect(self.buffer_signal)
+        self.ui_change.connect(self.page.ui_change)
+        return self.page
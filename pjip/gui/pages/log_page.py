@@ -0,0 +1,105 @@
+import logging
+
+from PySide6.QtCore import Signal, QTimer
+from PySide6.QtGui import QFontDatabase
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QComboBox, QPushButton, QLabel
+
+from pjip.core.log import LOG_FORMAT
+
+
+class LogPage(QWidget):
+    ui_change = Signal(str, object)
+    page_name = 'Logs'
+
+    REFRESH_INTERVAL = 500  # millisecond
+    MAX_LINES = 2000
+    LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+
+    def __init__(self):
+        super().__init__()
+        self.adapter = None
+        self.log_view = None
+        self.level_combo = None
+        self.clear_btn = None
+        self.refresh_timer = None
+        self.formatter = logging.Formatter(LOG_FORMAT)
+        self.last_sequence = 0
+
+        self.init_ui()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(3, 3, 3, 3)
+        main_layout.setSpacing(5)
+
+        toolbar_layout = QHBoxLayout()
+
+        self.level_combo = QComboBox()
+        self.level_combo.addItems(self.LEVELS)
+        self.level_combo.setCurrentText('INFO')
+        self.level_combo.currentTextChanged.connect(self.change_level)
+
+        self.clear_btn = QPushButton('Clear')
+        self.clear_btn.clicked.connect(self.clear)
+
+        toolbar_layout.addWidget(QLabel('Level'))
+        toolbar_layout.addWidget(self.level_combo)
+        toolbar_layout.addStretch(1)
+        toolbar_layout.addWidget(self.clear_btn)
+
+        self.log_view = QPlainTextEdit()
+        self.log_view.setReadOnly(True)
+        self.log_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        # Old blocks are dropped by the document itself
+        self.log_view.setMaximumBlockCount(self.MAX_LINES)
+        self.log_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+
+        main_layout.addLayout(toolbar_layout)
+        main_layout.addWidget(self.log_view, 1)
+
+        self.setLayout(main_layout)
+
+        # Only poll the ring buffer while the page is shown
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def set_adapter(self, adapter):
+        self.adapter = adapter
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def refresh(self):
+        if self.adapter is None:
+            return
+
+        records = self.adapter.get_log_records(self.last_sequence)
+        if not records:
+            return
+
+        self.last_sequence = records[-1][0]
+        level = logging.getLevelName(self.level_combo.currentText())
+        lines = [self.formatter.format(record) for _, record in records if record.levelno >= level]
+        if lines:
+            self.log_view.appendPlainText('\n'.join(lines))
+
+    def change_level(self, level_name):
+        # DEBUG records are only produced while they are shown, a higher level just filters the view
+        if self.adapter is not None:
+            self.adapter.set_log_level(min(logging.getLevelName(level_name), logging.INFO))
+        self.reload()
+
+    def reload(self):
+        self.log_view.clear()
+        self.last_sequence = 0
+        self.refresh()
+
+    def clear(self):
+        self.log_view.clear()
@@ -17,15 +17,7 @@ class PageUpdating(QWidget):
         self.updating_label = QLabel()
         self.updating_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.updating_label.setText('Page Updating')
-        self.updating_label.setStyleSheet("""
-                                        background-color: #efefef; 
-                                        /* border-radius: 10px; */
-                                        font-size: 24px;
-                                        /* border: 3px solid #cccccc; */
-                                        /* border: 1px solid #bbbbbb; */
-                                        color: green; 
-                                        font-weight: bold; 
-                                        """)
+        self.updating_label.setObjectName("page_updating_label")
 
         main_layout.addWidget(self.updating_label)
         self.setLayout(main_layout)
\ No newline at end of file
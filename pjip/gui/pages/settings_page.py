@@ -1,14 +1,21 @@
+import logging
+
 from PySide6.QtCore import Signal
-from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QSizePolicy, QButtonGroup, QRadioButton
+from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QSizePolicy, QButtonGroup, QRadioButton, QApplication
+
+from pjip.gui.theme import THEMES, apply_theme, current_theme
+
+logger = logging.getLogger(__name__)
 
 
 class SettingsPage(QWidget):
     ui_change = Signal(str, object)
+    page_name = 'Settings'
 
     def __init__(self):
         super().__init__()
-        self.page_name = 'Settings'
         self.adapter = None
+        self.theme_group = None
 
         self.init_ui()
 
@@ -20,36 +27,14 @@ class SettingsPage(QWidget):
         terminate_options = QWidget()
         terminate_options.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         terminate_options.setObjectName("terminate_options_frame")
-
-        terminate_options.setStyleSheet("""
-                    #terminate_options_frame {
-                        background-color: #eeeeee; 
-                        border-radius: 10px;
-                        font-size: 24px;
-                        border: 2px solid #bbbbbb;
-                        color: #455A64;   
-                    }
-
-                    QRadioButton {
-                        font-size: 16px;
-                    }
-                    QRadioButton::indicator {
-                        width: 24px;
-                        height: 24px;
-                    }
-                """)
+        terminate_options.setProperty("role", "card")
 
         terminate_options_frame_layout = QVBoxLayout(terminate_options)
         terminate_options_frame_layout.setContentsMargins(12, 5, 10, 5)
         terminate_options_frame_layout.setSpacing(3)
 
         label_terminate_options = QLabel()
-        label_terminate_options.setStyleSheet("""
-                                            background-color: #eeeeee; 
-                                            border-radius: 10px;
-                                            font-size: 20px;
-                                            color: #455A64;   
-                                            """)
+        label_terminate_options.setProperty("role", "card_title")
         label_terminate_options.setText(f'Terminate options')
         label_terminate_options.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
 
@@ -57,11 +42,11 @@ class SettingsPage(QWidget):
         terminate_options_group.setExclusive(True)
 
         opt1 = QRadioButton("TerminateProcess")
-        opt1.toggled.connect(lambda checked: print("Btn 1 State:", checked))
+        opt1.toggled.connect(lambda checked: logger.debug(f"Btn 1 State: {checked}"))
         opt1.setChecked(True)
         opt1.setDisabled(True)
         opt2 = QRadioButton("NtTerminateProcess")
-        opt2.toggled.connect(lambda checked: print("Btn 2 State:", checked))
+        opt2.toggled.connect(lambda checked: logger.debug(f"Btn 2 State: {checked}"))
         opt2.setDisabled(True)
         # opt3 = QRadioButton("Option C")
 
@@ -74,7 +59,37 @@ class SettingsPage(QWidget):
         terminate_options_frame_layout.addWidget(opt2)
         # terminate_options_frame_layout.addWidget(opt3)
 
+        theme_options = QWidget()
+        theme_options.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        theme_options.setObjectName("theme_options_frame")
+        theme_options.setProperty("role", "card")
+
+        theme_options_frame_layout = QVBoxLayout(theme_options)
+        theme_options_frame_layout.setContentsMargins(12, 5, 10, 5)
+        theme_options_frame_layout.setSpacing(3)
+
+        label_theme_options = QLabel()
+        label_theme_options.setProperty("role", "card_title")
+        label_theme_options.setText('Theme')
+        label_theme_options.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        theme_options_frame_layout.addWidget(label_theme_options)
+
+        self.theme_group = QButtonGroup(self)
+        self.theme_group.setExclusive(True)
+        for name in THEMES:
+            opt = QRadioButton(name.capitalize())
+            opt.setChecked(name == current_theme())
+            opt.toggled.connect(lambda checked, theme=name: checked and self.switch_theme(theme))
+            self.theme_group.addButton(opt)
+            theme_options_frame_layout.addWidget(opt)
+
         main_layout.addWidget(terminate_options)
+        main_layout.addWidget(theme_options)
         main_layout.addStretch(1)
 
         self.setLayout(main_layout)
+
+    @staticmethod
+    def switch_theme(name):
+        logger.info(f'Switch theme to {name}')
+        apply_theme(QApplication.instance(), name)
@@ -2,14 +2,15 @@ from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import QWidget, QLabel, QPushButton, QGridLayout, QVBoxLayout
 
 from pjip.core.enums import SuspendState
+from ..style import set_style_state
 
 
 class ToolPage(QWidget):
     ui_change = Signal(str, object)
+    page_name = 'Tools'
 
     def __init__(self):
         super().__init__()
-        self.page_name = 'Tools'
         self.studentmain_state = None
         self.kill_run_btn = self.suspend_resume_btn = self.run_taskmgr_btn = self.clean_ifeo_debuggers_btn = None
         self.label_studentmain_state = None
@@ -23,16 +24,12 @@ class ToolPage(QWidget):
         main_layout.setContentsMargins(3, 3, 3, 3)
         main_layout.setSpacing(5)
 
+        # cec2ff - b3b3f1 - dcb6d5 - cf8ba9 - b15e6c
+
         self.label_studentmain_state = QLabel()
+        self.label_studentmain_state.setObjectName("studentmain_state_label")
 
         self.label_studentmain_state.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.label_studentmain_state.setStyleSheet("""
-                                    background-color: #eeeeee; 
-                                    border-radius: 10px;
-                                    font-size: 24px;
-                                    border: 3px solid #cccccc;
-                                    color: #455A64;   
-                                    """)
         self.label_studentmain_state.setText(f'Not detecting')
         # self.label_studentmain_state.setFixedHeight(100)
 
@@ -56,23 +53,8 @@ class ToolPage(QWidget):
         for i, btn in enumerate(
                 [self.kill_run_btn, self.suspend_resume_btn, self.run_taskmgr_btn, self.clean_ifeo_debuggers_btn]):
             btn.setMinimumHeight(50)
+            btn.setProperty("role", "action")
             button_layout.addWidget(btn, i // 2, i % 2)
-            btn.setStyleSheet("""
-                        QPushButton {
-                            font: 20px;
-                            border: 2px solid #cccccc; 
-                            border-radius: 8px;        
-                            background-color: #eeeeee; 
-                            color: #333;               
-                        }
-                        QPushButton:hover {
-                            background-color: #dedede; 
-                        }
-                        QPushButton:pressed {
-                            background-color: #cdcdcd; 
-                        }
-                    """)
-            # cec2ff - b3b3f1 - dcb6d5 - cf8ba9 - b15e6c
 
         main_layout.addWidget(self.label_studentmain_state)
 
@@ -98,24 +80,10 @@ class ToolPage(QWidget):
         self.label_studentmain_state.setText(f"Studentmain: {status}")
         self.studentmain_state = state
 
+        set_style_state(self.label_studentmain_state, "running" if state else "stopped")
         if state:
-            self.label_studentmain_state.setStyleSheet("""
-                                        background-color: #FFE5E0; 
-                                        border-radius: 10px;
-                                        font-size: 24px;
-                                        border: 3px solid #cccccc;
-                                        color: #E66926;   
-                                        """)
             self.kill_run_btn.setText("Kill studentmain")
         else:
-            self.label_studentmain_state.setStyleSheet("""
-                                        background-color: #D3FDE3; 
-                                        border-radius: 10px;
-                                        font-size: 24px;
-                                        border: 3px solid #cccccc;
-                                        /* color: #16DC2D;   */
-                                        color: green;
-                                        """)
             self.kill_run_btn.setText("Run studentmain")
 
     def handle_studentmain(self):
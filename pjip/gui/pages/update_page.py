@@ -1,19 +1,21 @@
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtWidgets import QWidget, QLabel, QPushButton, QGridLayout, QVBoxLayout
+from PySide6.QtWidgets import QWidget, QLabel, QPushButton, QGridLayout, QVBoxLayout, QProgressBar
 
 from pjip.core.enums import UpdateState
 
 
 class UpdatePage(QWidget):
     ui_change = Signal(str, object)
+    page_name = 'Updates'
 
     def __init__(self):
         super().__init__()
-        self.page_name = 'Updates'
         self.studentmain_state = None
         self.update_state_label = None
         self.current_version_label = None
         self.get_update_btn = None
+        self.download_update_btn = None
+        self.download_progress_bar = None
         self.adapter = None
         self.current_version = None
 
@@ -30,13 +32,7 @@ class UpdatePage(QWidget):
         self.current_version_label.setWordWrap(True)
 
         self.current_version_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.current_version_label.setStyleSheet("""
-                                    background-color: #eeeeee; 
-                                    border-radius: 10px;
-                                    font-size: 24px;
-                                    border: 2px solid #cccccc;
-                                    color: #455A64;   
-                                    """)
+        self.current_version_label.setProperty("role", "status")
         self.current_version_label.setText(f'Current version: N / a')
         self.current_version_label.setFixedHeight(50)
 
@@ -44,13 +40,7 @@ class UpdatePage(QWidget):
         self.update_state_label.setWordWrap(True)
 
         self.update_state_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.update_state_label.setStyleSheet("""
-                                    background-color: #eeeeee; 
-                                    border-radius: 10px;
-                                    font-size: 24px;
-                                    border: 2px solid #cccccc;
-                                    color: #455A64;   
-                                    """)
+        self.update_state_label.setProperty("role", "status")
         self.update_state_label.setText(f'Getting updates')
         # self.update_state_label.setFixedHeight(100)
 
@@ -59,29 +49,24 @@ class UpdatePage(QWidget):
         self.get_update_btn = QPushButton("Get updates")
         self.get_update_btn.clicked.connect(self.get_update)
 
-        for i, btn in enumerate([self.get_update_btn]):
+        self.download_update_btn = QPushButton("Download update")
+        self.download_update_btn.clicked.connect(self.download_update)
+        self.download_update_btn.setDisabled(True)
+
+        self.download_progress_bar = QProgressBar()
+        self.download_progress_bar.setTextVisible(True)
+        self.download_progress_bar.hide()
+
+        for i, btn in enumerate([self.get_update_btn, self.download_update_btn]):
             btn.setMinimumHeight(50)
             button_layout.addWidget(btn, i // 2, i % 2)
-            btn.setStyleSheet("""
-                        QPushButton {
-                            font: 20px;
-                            border: 2px solid #cccccc; 
-                            border-radius: 8px;        
-                            background-color: #eeeeee; 
-                            color: #333;               
-                        }
-                        QPushButton:hover {
-                            background-color: #dedede; 
-                        }
-                        QPushButton:pressed {
-                            background-color: #cdcdcd; 
-                        }
-                    """)
+            btn.setProperty("role", "action")
 
         main_layout.addWidget(self.current_version_label)
         main_layout.addWidget(self.update_state_label)
 
         main_layout.addLayout(button_layout)
+        main_layout.addWidget(self.download_progress_bar)
 
         self.setLayout(main_layout)
 
@@ -101,15 +86,48 @@ class UpdatePage(QWidget):
         self.current_version_label.setText(f'Current version: {self.current_version}')
 
     def get_update(self):
+        if not self.adapter.get_update():
+            self.update_state_label.setText('Another update task is running')
+            return
+
         self.update_state_label.setText(f'Getting updates')
 
-        self.adapter.get_update()
+    def download_update(self):
+        self.download_update_btn.setDisabled(True)
+        self.update_state_label.setText('Downloading update')
+        self.download_progress_bar.setValue(0)
+        self.download_progress_bar.show()
+
+        if not self.adapter.download_update():
+            self.download_progress_bar.hide()
+            self.download_update_btn.setEnabled(True)
+            self.update_state_label.setText('Another update task is running')
+
+    def update_download_progress(self, done, total):
+        if total:
+            self.download_progress_bar.setRange(0, 100)
+            self.download_progress_bar.setValue(done * 100 // total)
+        else:
+            # Unknown size, busy indicator
+            self.download_progress_bar.setRange(0, 0)
 
     def update_update_label(self, state_package):
         state, content = state_package
 
+        if state == UpdateState.DOWNLOADING:
+            self.update_download_progress(*content)
+            return
+
         if state == UpdateState.FIND_LATEST:
             self.update_state_label.setText(f'A new version is available: {content}')
+            self.download_update_btn.setEnabled(True)
+        elif state == UpdateState.DOWNLOADED:
+            self.download_progress_bar.hide()
+            self.update_state_label.setText(f'Update downloaded to {content}')
+        elif state == UpdateState.DOWNLOAD_FAILED:
+            self.download_progress_bar.hide()
+            self.download_update_btn.setEnabled(True)
+            self.update_state_label.setText('An error has occurred while downloading the update.')
         elif state == UpdateState.IS_LATEST:
             self.update_state_label.setText('You are already using the latest version')
         elif state == UpdateState.NOT_FOUND:
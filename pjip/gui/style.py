@@ -0,0 +1,22 @@
+def set_style_state(widget, state, name="state"):
+    """
+    Switch the style of widget by a dynamic property.
+
+    The stylesheet is parsed once and holds a [state="..."] rule per state.
+    Changing the property only re-polishes widget itself, its children and
+    the parsed stylesheet are left alone.
+
+    :param widget: QWidget styled with property selectors
+    :param state: new property value, str or bool
+    :param name: property name used in the selectors
+    :return: True if the state changed
+    """
+    if widget.property(name) == state:
+        return False
+
+    widget.setProperty(name, state)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+    return True
@@ -0,0 +1,224 @@
+from string import Template
+
+# Widgets are matched by object name (unique widgets) or by the "role"
+# dynamic property (repeated widgets), states by the "state" property,
+# see pjip.gui.style.set_style_state
+STYLESHEET = Template("""
+#sidebar QPushButton {
+    background-color: $sidebar_button;
+    border-radius: 8px;
+    padding: 0px;
+    font-weight: bold;
+}
+#sidebar QPushButton:hover {
+    background-color: $sidebar_button_hover;
+}
+#sidebar QPushButton:pressed {
+    background-color: $sidebar_button_pressed;
+}
+#sidebar QPushButton:checked {
+    background-color: $accent;
+    color: $accent_text;
+}
+
+#live_frame {
+    background-color: $surface;
+    border-radius: 10px;
+    font-size: 24px;
+    border: 4px solid $border;
+    color: $text;
+}
+#live_frame[state="running"] {
+    border-color: $running_border;
+}
+#live_frame[state="stopped"] {
+    border-color: $stopped_border;
+}
+
+#studentmain_state_label {
+    background-color: $surface;
+    border-radius: 10px;
+    font-size: 24px;
+    border: 3px solid $border;
+    color: $text;
+}
+#studentmain_state_label[state="running"] {
+    background-color: $running_background;
+    color: $running_text;
+}
+#studentmain_state_label[state="stopped"] {
+    background-color: $stopped_background;
+    color: $stopped_text;
+}
+
+QLabel[role="status"] {
+    background-color: $surface;
+    border-radius: 10px;
+    font-size: 24px;
+    border: 2px solid $border;
+    color: $text;
+}
+
+QPushButton[role="action"] {
+    font: 20px;
+    border: 2px solid $border;
+    border-radius: 8px;
+    background-color: $surface;
+    color: $button_text;
+}
+QPushButton[role="action"]:hover {
+    background-color: $button_hover;
+}
+QPushButton[role="action"]:pressed {
+    background-color: $button_pressed;
+}
+
+QWidget[role="card"] {
+    background-color: $surface;
+    border-radius: 10px;
+    font-size: 24px;
+    border: 2px solid $card_border;
+    color: $text;
+}
+QLabel[role="card_title"] {
+    background-color: $surface;
+    border: none;
+    border-radius: 10px;
+    font-size: 20px;
+    color: $text;
+}
+QWidget[role="card"] QRadioButton {
+    border: none;
+    font-size: 16px;
+    color: $text;
+}
+QWidget[role="card"] QRadioButton::indicator {
+    width: 24px;
+    height: 24px;
+}
+QWidget[role="card"] QLineEdit {
+    font: 16px;
+    padding: 2px;
+    border: 2px solid $field_border;
+    border-radius: 8px;
+    background-color: $field_background;
+    color: $field_text;
+}
+QWidget[role="card"] QLineEdit:focus {
+    border: 2px solid $field_focus_border;
+    background-color: $field_focus_background;
+}
+QWidget[role="card"] QPushButton {
+    font-size: 16px;
+    padding: 4px;
+    border: 2px solid $border;
+    border-radius: 8px;
+    background-color: $surface;
+    color: $button_text;
+}
+QWidget[role="card"] QPushButton:hover {
+    background-color: $button_hover;
+}
+QWidget[role="card"] QPushButton:pressed {
+    background-color: $button_pressed;
+}
+
+#page_updating_label {
+    background-color: $page_updating_background;
+    font-size: 24px;
+    color: $page_updating_text;
+    font-weight: bold;
+}
+""")
+
+THEMES = {
+    "light": {
+        "text": "#455A64",
+        "surface": "#eeeeee",
+        "border": "#cccccc",
+        "card_border": "#bbbbbb",
+        "button_text": "#333",
+        "button_hover": "#dedede",
+        "button_pressed": "#cdcdcd",
+        "sidebar_button": "#e6e6e6",
+        "sidebar_button_hover": "#dcdcdc",
+        "sidebar_button_pressed": "#cbcbcb",
+        "accent": "#4a90e2",
+        "accent_text": "white",
+        "running_border": "#E6A56E",
+        "stopped_border": "#3DC766",
+        "running_background": "#FFE5E0",
+        "running_text": "#E66926",
+        "stopped_background": "#D3FDE3",
+        "stopped_text": "green",
+        "field_border": "#F8C8DC",
+        "field_background": "#FFF0F5",
+        "field_text": "#C94F7C",
+        "field_focus_border": "#C94F7C",
+        "field_focus_background": "#FDF6FA",
+        "page_updating_background": "#efefef",
+        "page_updating_text": "green",
+    },
+    "dark": {
+        "text": "#CFD8DC",
+        "surface": "#2f3136",
+        "border": "#4a4d52",
+        "card_border": "#55585e",
+        "button_text": "#e6e6e6",
+        "button_hover": "#3a3d42",
+        "button_pressed": "#45484e",
+        "sidebar_button": "#3a3d42",
+        "sidebar_button_hover": "#45484e",
+        "sidebar_button_pressed": "#505359",
+        "accent": "#4a90e2",
+        "accent_text": "white",
+        "running_border": "#E6A56E",
+        "stopped_border": "#3DC766",
+        "running_background": "#4a3128",
+        "running_text": "#F0A07A",
+        "stopped_background": "#23402e",
+        "stopped_text": "#7BE0A0",
+        "field_border": "#7a4b5e",
+        "field_background": "#3a2d33",
+        "field_text": "#F2A7C3",
+        "field_focus_border": "#F2A7C3",
+        "field_focus_background": "#43333b",
+        "page_updating_background": "#2f3136",
+        "page_updating_text": "#7BE0A0",
+    },
+}
+
+DEFAULT_THEME = "light"
+
+_compiled = {}
+_current = None
+
+
+def compile_theme(name):
+    """
+    :param name: key of THEMES
+    :return: application stylesheet of the theme, built once per theme
+    """
+    stylesheet = _compiled.get(name)
+    if stylesheet is None:
+        stylesheet = _compiled[name] = STYLESHEET.substitute(THEMES[name])
+    return stylesheet
+
+
+def apply_theme(app, name=DEFAULT_THEME):
+    """
+    Set the theme as the stylesheet of the whole application.
+
+    :param app: QApplication
+    :param name: key of THEMES
+    """
+    global _current
+
+    if name == _current:
+        return
+    app.setStyleSheet(compile_theme(name))
+    _current = name
+
+
+def current_theme():
+    return _current
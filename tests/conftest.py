@@ -0,0 +1,41 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers with what server.respond(headers) returns: (status, headers, body)"""
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        status, headers, body = self.server.respond(self.headers)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """
+    Local HTTP/1.0 server, a test sets server.respond and reads server.requests.
+
+    Without a Content-Length header the body ends when the connection closes.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    server.requests = []
+    server.respond = lambda headers: (404, {}, b"")
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
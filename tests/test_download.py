@@ -0,0 +1,129 @@
+"""
+ReleaseDownloader resumes a part file with Range and If-Range, accepts a
+416 for a complete one and never keeps a file that fails its checks.
+"""
+import hashlib
+import os
+
+import pytest
+
+from pjip.core.cache import JsonCache
+from pjip.core.download import ReleaseDownloader
+
+CONTENT = bytes(range(256)) * 1024
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+ETAG = '"asset-1"'
+
+
+def serve_file(server, content=CONTENT, etag=ETAG, content_length=True):
+    """Serve content with byte ranges, If-Range only matches etag"""
+
+    def respond(headers):
+        range_header = headers.get("Range")
+        if range_header and headers.get("If-Range") in (None, etag):
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+            if start >= len(content):
+                return 416, {"Content-Range": f"bytes */{len(content)}"}, b""
+            body = content[start:]
+            return 206, {"ETag": etag, "Content-Length": str(len(body)),
+                         "Content-Range": f"bytes {start}-{len(content) - 1}/{len(content)}"}, body
+        response_headers = {"ETag": etag}
+        if content_length:
+            response_headers["Content-Length"] = str(len(content))
+        return 200, response_headers, content
+
+    server.respond = respond
+
+
+def write_part(directory, url, data, size=len(CONTENT), etag=ETAG):
+    part_path = os.path.join(directory, "asset.zip.part")
+    with open(part_path, "wb") as f:
+        f.write(data)
+    JsonCache(part_path + ".json").save({"url": url, "size": size, "etag": etag, "last_modified": None})
+    return part_path
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    downloader = ReleaseDownloader(str(tmp_path), retries=0)
+    yield downloader
+    downloader.close()
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_part_file_is_resumed_with_range(http_server, downloader, tmp_path):
+    serve_file(http_server)
+    url = f"{http_server.url}/asset.zip"
+    part_path = write_part(str(tmp_path), url, CONTENT[:1000])
+
+    path = downloader.download(url, "asset.zip", sha256=SHA256, size=len(CONTENT))
+
+    assert read(path) == CONTENT
+    assert http_server.requests[0]["Range"] == "bytes=1000-"
+    assert http_server.requests[0]["If-Range"] == ETAG
+    assert not os.path.exists(part_path) and not os.path.exists(part_path + ".json")
+
+
+def test_changed_file_is_downloaded_whole(http_server, downloader, tmp_path):
+    changed = CONTENT[::-1]
+    serve_file(http_server, content=changed, etag='"asset-2"')
+    url = f"{http_server.url}/asset.zip"
+    write_part(str(tmp_path), url, CONTENT[:1000])
+
+    path = downloader.download(url, "asset.zip", sha256=hashlib.sha256(changed).hexdigest(), size=len(changed))
+
+    assert read(path) == changed
+
+
+def test_complete_part_file_is_accepted_on_416(http_server, downloader, tmp_path):
+    serve_file(http_server)
+    url = f"{http_server.url}/asset.zip"
+    write_part(str(tmp_path), url, CONTENT)
+
+    path = downloader.download(url, "asset.zip", sha256=SHA256, size=len(CONTENT))
+
+    assert read(path) == CONTENT
+    assert len(http_server.requests) == 1
+
+
+def test_part_file_of_another_asset_is_discarded(http_server, downloader, tmp_path):
+    serve_file(http_server)
+    url = f"{http_server.url}/asset.zip"
+    write_part(str(tmp_path), f"{http_server.url}/old.zip", b"old release")
+
+    path = downloader.download(url, "asset.zip", sha256=SHA256, size=len(CONTENT))
+
+    assert read(path) == CONTENT
+    assert "Range" not in http_server.requests[0]
+
+
+def test_digest_mismatch_removes_the_download(http_server, downloader, tmp_path):
+    serve_file(http_server)
+    url = f"{http_server.url}/asset.zip"
+
+    with pytest.raises(RuntimeError, match="SHA-256"):
+        downloader.download(url, "asset.zip", sha256="0" * 64, size=len(CONTENT))
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_unknown_size_without_digest_is_rejected(http_server, downloader, tmp_path):
+    serve_file(http_server, content_length=False)
+    url = f"{http_server.url}/asset.zip"
+
+    with pytest.raises(RuntimeError, match="size unknown"):
+        downloader.download(url, "asset.zip")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_unknown_size_is_verified_by_digest(http_server, downloader):
+    serve_file(http_server, content_length=False)
+
+    path = downloader.download(f"{http_server.url}/asset.zip", "asset.zip", sha256=SHA256)
+
+    assert read(path) == CONTENT
@@ -0,0 +1,25 @@
+"""
+Importing the logic must not pull in the modules that are only needed for
+update checks or Windows-only COM queries, they are imported on first use.
+"""
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED_MODULES = ("requests", "packaging", "urllib3", "win32com")
+
+
+def test_logic_import_defers_heavy_modules():
+    code = (
+        "import json, sys\n"
+        "import pjip.core.logic\n"
+        f"print(json.dumps([name for name in {DEFERRED_MODULES!r} if name in sys.modules]))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
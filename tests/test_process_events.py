@@ -0,0 +1,91 @@
+"""
+SnapshotDiffEventSource turns the difference of two snapshots into start
+and exit events, a reused PID is one exit and one start.
+"""
+import queue
+import time
+
+from pjip.core.enums import ProcessEventKind
+from pjip.core.process_events import SnapshotDiffEventSource
+from pjip.core.snapshot import ProcessEntry, ProcessSnapshot
+
+
+def make_snapshot(*entries):
+    by_name = {}
+    for entry in entries:
+        by_name[entry.name.lower()] = by_name.get(entry.name.lower(), ()) + (entry.pid,)
+    return ProcessSnapshot(time.monotonic(), {entry.pid: entry for entry in entries}, by_name)
+
+
+class ScriptedSnapshotService:
+    """Returns the given snapshots one per get(), then keeps the last one"""
+    max_staleness = 0.01
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+
+    def get(self, max_staleness=None):
+        if len(self.snapshots) > 1:
+            return self.snapshots.pop(0)
+        return self.snapshots[0]
+
+
+def collect(source, count, process_name=None, timeout=2):
+    events = queue.Queue()
+    source.subscribe(events.put, process_name)
+    source.start()
+    try:
+        return [events.get(timeout=timeout) for _ in range(count)]
+    finally:
+        source.stop()
+
+
+def test_started_and_exited_processes_are_published():
+    shell = ProcessEntry(10, 1.0, "shell.exe")
+    editor = ProcessEntry(20, 2.0, "editor.exe")
+    first = make_snapshot(shell, editor)
+    service = ScriptedSnapshotService([
+        first,
+        first.renewed(time.monotonic()),
+        make_snapshot(shell, ProcessEntry(30, 3.0, "Worker.exe")),
+    ])
+
+    events = collect(SnapshotDiffEventSource(service), 2)
+
+    assert events == [
+        (ProcessEventKind.EXITED, 20, "editor.exe", 2.0),
+        (ProcessEventKind.STARTED, 30, "Worker.exe", 3.0),
+    ]
+
+
+def test_reused_pid_is_an_exit_and_a_start():
+    service = ScriptedSnapshotService([
+        make_snapshot(ProcessEntry(10, 1.0, "old.exe")),
+        make_snapshot(ProcessEntry(10, 5.0, "new.exe")),
+    ])
+
+    events = collect(SnapshotDiffEventSource(service), 2)
+
+    assert [(event.kind, event.pid, event.create_time) for event in events] == [
+        (ProcessEventKind.EXITED, 10, 1.0),
+        (ProcessEventKind.STARTED, 10, 5.0),
+    ]
+
+
+def test_subscription_filters_by_name_case_insensitively():
+    service = ScriptedSnapshotService([
+        make_snapshot(),
+        make_snapshot(ProcessEntry(40, 4.0, "other.exe"), ProcessEntry(41, 4.1, "StudentMain.exe")),
+    ])
+
+    events = collect(SnapshotDiffEventSource(service), 1, process_name="studentmain.exe")
+
+    assert events[0].pid == 41
+
+
+def test_interval_is_at_least_max_staleness():
+    service = ScriptedSnapshotService([make_snapshot()])
+    service.max_staleness = 0.4
+
+    assert SnapshotDiffEventSource(service, interval=100).interval == 0.4
+    assert SnapshotDiffEventSource(service, interval=1000).interval == 1.0
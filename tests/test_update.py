@@ -0,0 +1,71 @@
+"""
+UpdateChecker answers from its cache within the ttl and revalidates with
+If-None-Match after it, an unchanged release costs a 304.
+"""
+import json
+import os
+
+from pjip.core.cache import JsonCache
+from pjip.core.update import UpdateChecker
+
+RELEASE = {"tag_name": "v1.2.0", "assets": []}
+ETAG = '"release-1"'
+
+
+def serve_release(server):
+    def respond(headers):
+        if headers.get("If-None-Match") == ETAG:
+            return 304, {"ETag": ETAG}, b""
+        body = json.dumps(RELEASE).encode()
+        return 200, {"ETag": ETAG, "Content-Type": "application/json", "Content-Length": str(len(body))}, body
+
+    server.respond = respond
+
+
+def make_checker(server, tmp_path, ttl):
+    cache = JsonCache(os.path.join(tmp_path, "release.json"))
+    return UpdateChecker(f"{server.url}/releases/latest", cache, ttl=ttl, retries=0)
+
+
+def test_release_is_served_from_cache_within_ttl(http_server, tmp_path):
+    serve_release(http_server)
+    checker = make_checker(http_server, tmp_path, ttl=600)
+
+    assert checker.get_release() == RELEASE
+    assert checker.get_release() == RELEASE
+    assert len(http_server.requests) == 1
+    checker.close()
+
+
+def test_expired_release_is_revalidated_with_etag(http_server, tmp_path):
+    serve_release(http_server)
+    checker = make_checker(http_server, tmp_path, ttl=0)
+
+    assert checker.get_release() == RELEASE
+    assert checker.get_release() == RELEASE
+
+    assert len(http_server.requests) == 2
+    assert "If-None-Match" not in http_server.requests[0]
+    assert http_server.requests[1]["If-None-Match"] == ETAG
+    checker.close()
+
+
+def test_force_revalidates_within_ttl(http_server, tmp_path):
+    serve_release(http_server)
+    checker = make_checker(http_server, tmp_path, ttl=600)
+
+    checker.get_release()
+    assert checker.get_release(force=True) == RELEASE
+    assert http_server.requests[-1]["If-None-Match"] == ETAG
+    checker.close()
+
+
+def test_validator_is_reused_from_disk_cache(http_server, tmp_path):
+    serve_release(http_server)
+    make_checker(http_server, tmp_path, ttl=0).get_release()
+
+    # A new run only has the disk cache
+    checker = make_checker(http_server, tmp_path, ttl=0)
+    assert checker.get_release() == RELEASE
+    assert http_server.requests[-1]["If-None-Match"] == ETAG
+    checker.close()